@@ -1,223 +1,34 @@
+import asyncio
+import threading
+
 import flet as ft
-import numpy as np
-from scipy.stats import mode, linregress, binom, poisson, f_oneway
-from collections import Counter
-import math
-
-
-# --- Funções de Cálculo Estatístico ---
-
-def calcular_estatisticas_descritivas(data_str):
-    """
-    Calcula e retorna estatísticas descritivas para um conjunto de dados.
-    """
-    try:
-        data = [float(x.strip()) for x in data_str.split(',') if x.strip()]
-        if not data:
-            return "Erro: Insira dados numéricos válidos separados por vírgula."
-
-        n = len(data)
-        media = np.mean(data)
-        mediana = np.median(data)
-
-        # Moda (pode haver múltiplas)
-        contagem = Counter(data)
-        max_frequencia = 0
-        modas = []
-        for valor, freq in contagem.items():
-            if freq > max_frequencia:
-                max_frequencia = freq
-                modas = [valor]
-            elif freq == max_frequencia and max_frequencia > 1:
-                modas.append(valor)
-        if not modas and n > 0:
-            modo_str = "Não há moda (todos os elementos são únicos)"
-        elif modas and max_frequencia == 1:
-            modo_str = "Não há moda (todos os elementos são únicos)"
-        else:
-            modo_str = ", ".join(map(str, sorted(modas)))
-
-        amplitude = np.max(data) - np.min(data)
-        variancia = np.var(data)
-        desvio_padrao = np.std(data)
-
-        results = (
-            f"Resultados da Análise Descritiva:\n"
-            f"  Número de Dados (n): {n}\n"
-            f"  Média: {media:.4f}\n"
-            f"  Mediana: {mediana:.4f}\n"
-            f"  Moda: {modo_str}\n"
-            f"  Amplitude: {amplitude:.4f}\n"
-            f"  Variância (Pop.): {variancia:.4f}\n"
-            f"  Desvio Padrão (Pop.): {desvio_padrao:.4f}"
-        )
-        return results
-    except ValueError:
-        return "Erro: Verifique se os dados são numéricos válidos separados por vírgula."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
-
-
-def calcular_regressao_linear(x_str, y_str):
-    """
-    Calcula e retorna os resultados da regressão linear simples.
-    """
-    try:
-        x_data = [float(val.strip()) for val in x_str.split(',') if val.strip()]
-        y_data = [float(val.strip()) for val in y_str.split(',') if val.strip()]
-
-        if not x_data or not y_data or len(x_data) != len(y_data):
-            return "Erro: Insira listas de dados numéricos X e Y válidas e de mesmo tamanho."
-
-        slope, intercept, r_value, p_value, std_err = linregress(x_data, y_data)
-        r_squared = r_value ** 2
-
-        results = (
-            f"Resultados da Regressão Linear Simples:\n"
-            f"  Coeficiente Angular (b): {slope:.4f}\n"
-            f"  Intercepto (a): {intercept:.4f}\n"
-            f"  Coeficiente de Determinação (R²): {r_squared:.4f}\n"
-            f"  Valor-p: {p_value:.4f}\n"
-            f"  Erro Padrão do Coeficiente: {std_err:.4f}"
-        )
-        return results
-    except ValueError:
-        return "Erro: Verifique se os dados são numéricos válidos separados por vírgula."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
-
-
-def calcular_teorema_bayes(pa_str, pb_dado_a_str, pb_dado_nao_a_str):
-    """
-    Calcula e retorna a probabilidade condicional P(A|B) usando o Teorema de Bayes,
-    derivando P(B) através da Lei da Probabilidade Total.
-    """
-    try:
-        PA = float(pa_str)
-        PB_dado_A = float(pb_dado_a_str)
-        PB_dado_NAO_A = float(pb_dado_nao_a_str)
-
-        if not (0 <= PA <= 1 and 0 <= PB_dado_A <= 1 and 0 <= PB_dado_NAO_A <= 1):
-            return "Erro: As probabilidades devem estar entre 0 e 1."
-
-        # Calcula P(não A)
-        P_NAO_A = 1 - PA
-
-        # Calcula P(B) usando a Lei da Probabilidade Total
-        # P(B) = P(B|A) * P(A) + P(B|não A) * P(não A)
-        PB = (PB_dado_A * PA) + (PB_dado_NAO_A * P_NAO_A)
-
-        if PB == 0:
-            return "Erro: O cálculo de P(B) resultou em zero, divisão por zero impossível."
-
-        # Calcula P(A|B)
-        # P(A|B) = (P(B|A) * P(A)) / P(B)
-        PA_dado_B = (PB_dado_A * PA) / PB
-
-        results = (
-            f"Resultados do Teorema de Bayes:\n"
-            f"  P(A) = {PA:.4f}\n"
-            f"  P(B|A) = {PB_dado_A:.4f}\n"
-            f"  P(B|não A) = {PB_dado_NAO_A:.4f}\n"
-            f"  --------------------------\n"
-            f"  P(não A) = 1 - P(A) = {P_NAO_A:.4f}\n"
-            f"  P(B) = P(B|A)P(A) + P(B|não A)P(não A) = {PB:.4f}\n"
-            f"  P(A|B) = (P(B|A) * P(A)) / P(B)\n"
-            f"  P(A|B) = ({PB_dado_A:.4f} * {PA:.4f}) / {PB:.4f}\n"
-            f"  P(A|B) = {PA_dado_B:.4f}"
-        )
-        return results
-    except ValueError:
-        return "Erro: Insira valores numéricos válidos para as probabilidades."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
-
-
-def calcular_distribuicao_binomial(n_str, p_str, k_str):
-    """
-    Calcula e retorna a probabilidade para a Distribuição Binomial.
-    """
-    try:
-        n = int(n_str)
-        p = float(p_str)
-        k = int(k_str)
-
-        if n <= 0 or not (0 <= p <= 1) or k < 0 or k > n:
-            return "Erro: Verifique os valores. n > 0, 0 <= p <= 1, 0 <= k <= n."
-
-        prob = binom.pmf(k, n, p)
-
-        results = (
-            f"Resultados da Distribuição Binomial:\n"
-            f"  Número de Tentativas (n): {n}\n"
-            f"  Probabilidade de Sucesso (p): {p:.4f}\n"
-            f"  Número de Sucessos (k): {k}\n"
-            f"  P(X = {k}) = {prob:.6f}"
-        )
-        return results
-    except ValueError:
-        return "Erro: Insira valores numéricos e inteiros válidos para n e k, e numérico para p."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
-
-
-def calcular_distribuicao_poisson(lam_str, k_str):
-    """
-    Calcula e retorna a probabilidade para a Distribuição de Poisson.
-    """
-    try:
-        lam = float(lam_str)
-        k = int(k_str)
-
-        if lam <= 0 or k < 0:
-            return "Erro: Lambda deve ser > 0 e k deve ser >= 0."
-
-        prob = poisson.pmf(k, lam)
-
-        results = (
-            f"Resultados da Distribuição de Poisson:\n"
-            f"  Taxa Média (λ): {lam:.4f}\n"
-            f"  Número de Eventos (k): {k}\n"
-            f"  P(X = {k}) = {prob:.6f}"
-        )
-        return results
-    except ValueError:
-        return "Erro: Insira valores numéricos válidos para Lambda e k (inteiro)."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
-
-
-def calcular_anova(groups_str):
-    """
-    Realiza a Análise de Variância (ANOVA) para múltiplos grupos de dados.
-    """
-    try:
-        groups_data = []
-        for group_str in groups_str.split(';'):
-            data = [float(x.strip()) for x in group_str.split(',') if x.strip()]
-            if data:
-                groups_data.append(data)
-
-        if len(groups_data) < 2:
-            return "Erro: ANOVA requer pelo menos dois grupos de dados separados por ';'."
-
-        # Realiza a ANOVA usando f_oneway
-        F_statistic, p_value = f_oneway(*groups_data)
-
-        results = (
-            f"Resultados da Análise de Variância (ANOVA):\n"
-            f"  Número de Grupos Analisados: {len(groups_data)}\n"
-            f"  Estatística F: {F_statistic:.4f}\n"
-            f"  Valor-p: {p_value:.4f}\n"
-            f"  Interpretação (regra geral, α=0.05):\n"
-            f"    - Se p-valor < 0.05: Há diferença estatisticamente significativa entre as médias dos grupos.\n"
-            f"    - Se p-valor >= 0.05: Não há diferença estatisticamente significativa entre as médias dos grupos."
-        )
-        return results
-    except ValueError:
-        return "Erro: Verifique o formato dos dados. Use vírgulas para separar valores dentro de um grupo e ponto e vírgula para separar grupos (ex: 1,2,3;4,5,6)."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
+
+from stats_core import (RegressaoIncremental, calcular_anova, calcular_anova_arquivo, calcular_anova_resumos,
+                        calcular_distribuicao_binomial, calcular_distribuicao_poisson,
+                        calcular_estatisticas_descritivas, calcular_estatisticas_descritivas_arquivo,
+                        calcular_regressao_linear, calcular_regressao_multipla_arquivo, calcular_teorema_bayes,
+                        mensagem_de_erro, precarregar)
+from stats_core.parallel import numero_de_processos
+
+# --- Execução dos cálculos ---
+
+# Os cálculos pesados (dados colados e arquivos) rodam em um pool de threads
+# compartilhado por todas as sessões, e o laço de eventos do Flet continua
+# livre. Threads, e não processos: os caches de resultados e de conversão
+# (stats_core.cache) ficam no processo e valem para todas as sessões, e o texto
+# colado não é copiado a cada clique; as operações longas do NumPy liberam o
+# GIL, e as análises de arquivo já usam seus próprios processos. Os leves rodam
+# nas threads padrão do laço, sem esperar atrás dos pesados.
+_executor_calculos = None
+
+
+def executor_calculos():
+    global _executor_calculos
+    if _executor_calculos is None:
+        # Importado aqui para não atrasar a abertura da interface
+        from concurrent.futures import ThreadPoolExecutor
+        _executor_calculos = ThreadPoolExecutor(max_workers=numero_de_processos(None), thread_name_prefix="calculo")
+    return _executor_calculos
 
 
 # --- Componentes da UI Flet ---
@@ -242,6 +53,29 @@ def main(page: ft.Page):
         alignment=ft.alignment.top_left
     )
 
+    # Indica cálculo em andamento; só o painel de resultados é atualizado
+    progress_ring = ft.ProgressRing(width=20, height=20, stroke_width=2, visible=False)
+    results_panel = ft.Column([progress_ring, results_text], horizontal_alignment=ft.CrossAxisAlignment.CENTER)
+    geracao = 0
+
+    async def calcular(funcao, *args, leve=False):
+        # Roda funcao(*args) (uma calcular_*) fora do laço de eventos e mostra o texto
+        nonlocal geracao
+        geracao += 1
+        atual = geracao
+        progress_ring.visible = True
+        results_panel.update()
+        laco = asyncio.get_running_loop()
+        try:
+            texto = await laco.run_in_executor(None if leve else executor_calculos(), funcao, *args)
+        except Exception as e:
+            texto = mensagem_de_erro(e)
+        if atual != geracao:
+            return  # a sessão já pediu um cálculo mais novo; este resultado é descartado
+        progress_ring.visible = False
+        results_text.content.value = texto
+        results_panel.update()
+
     # Área de inputs dinâmicos
     input_area = ft.Column(
         spacing=10,
@@ -263,16 +97,30 @@ def main(page: ft.Page):
         border_radius=ft.border_radius.all(8)
     )
 
-    def on_descriptive_stats_calculate(e):
-        results_text.content.value = calcular_estatisticas_descritivas(data_input_desc.value)
-        page.update()
+    bootstrap_checkbox_desc = ft.Checkbox(label="Intervalos de confiança (bootstrap 95%)", value=False)
+
+    async def on_descriptive_stats_calculate(e):
+        await calcular(calcular_estatisticas_descritivas, data_input_desc.value, bootstrap_checkbox_desc.value)
+
+    # Arquivos grandes são lidos em blocos, sem passar pelo campo de texto
+    async def on_descriptive_file_picked(e: ft.FilePickerResultEvent):
+        if not e.files:
+            return
+        await calcular(calcular_estatisticas_descritivas_arquivo, e.files[0].path)
+
+    desc_file_picker = ft.FilePicker(on_result=on_descriptive_file_picked)
+    page.overlay.append(desc_file_picker)
 
     def show_descriptive_stats_inputs():
         input_area.controls.clear()
         input_area.controls.extend([data_input_desc,
+                                    bootstrap_checkbox_desc,
                                     ft.ElevatedButton("Calcular Estatísticas Descritivas",
-                                                      on_click=on_descriptive_stats_calculate)])
-        page.update()
+                                                      on_click=on_descriptive_stats_calculate),
+                                    ft.ElevatedButton("Analisar Arquivo (CSV/TXT)...",
+                                                      on_click=lambda _: desc_file_picker.pick_files(
+                                                          allowed_extensions=["csv", "txt"]))])
+        input_area.update()
 
     # --- Regressão Linear ---
     x_input_reg = ft.TextField(
@@ -288,16 +136,36 @@ def main(page: ft.Page):
         border_radius=ft.border_radius.all(8)
     )
 
-    def on_linear_regression_calculate(e):
-        results_text.content.value = calcular_regressao_linear(x_input_reg.value, y_input_reg.value)
-        page.update()
+    # O estado incremental é da sessão e fica neste processo: a regressão roda
+    # em uma thread, e a trava impede dois cálculos de alterá-lo ao mesmo tempo
+    regressao = RegressaoIncremental()
+    trava_regressao = threading.Lock()
+
+    def regressao_linear(x_str, y_str):
+        with trava_regressao:
+            return calcular_regressao_linear(x_str, y_str, regressao)
+
+    async def on_linear_regression_calculate(e):
+        await calcular(regressao_linear, x_input_reg.value, y_input_reg.value, leve=True)
+
+    # Regressão múltipla: arquivo com uma observação por linha, última coluna = Y
+    async def on_multiple_regression_file_picked(e: ft.FilePickerResultEvent):
+        if not e.files:
+            return
+        await calcular(calcular_regressao_multipla_arquivo, e.files[0].path)
+
+    reg_file_picker = ft.FilePicker(on_result=on_multiple_regression_file_picked)
+    page.overlay.append(reg_file_picker)
 
     def show_linear_regression_inputs():
         input_area.controls.clear()
         input_area.controls.extend([x_input_reg, y_input_reg,
                                     ft.ElevatedButton("Calcular Regressão Linear",
-                                                      on_click=on_linear_regression_calculate)])
-        page.update()
+                                                      on_click=on_linear_regression_calculate),
+                                    ft.ElevatedButton("Regressão Múltipla de Arquivo (CSV/TXT)...",
+                                                      on_click=lambda _: reg_file_picker.pick_files(
+                                                          allowed_extensions=["csv", "txt"]))])
+        input_area.update()
 
     # --- Teorema de Bayes ---
     pa_input_bayes = ft.TextField(label="P(A) - Probabilidade de A", hint_text="Ex: 0.5", width=500,
@@ -307,13 +175,14 @@ def main(page: ft.Page):
     pb_dado_nao_a_input_bayes = ft.TextField(label="P(B|não A) - Probabilidade de B dado não A", hint_text="Ex: 0.2",
                                              width=500, border_radius=ft.border_radius.all(8))  # Novo campo
 
-    def on_bayes_theorem_calculate(e):
-        results_text.content.value = calcular_teorema_bayes(
+    async def on_bayes_theorem_calculate(e):
+        await calcular(
+            calcular_teorema_bayes,
             pa_input_bayes.value,
             pb_dado_a_input_bayes.value,
-            pb_dado_nao_a_input_bayes.value
+            pb_dado_nao_a_input_bayes.value,
+            leve=True
         )
-        page.update()
 
     def show_bayes_theorem_inputs():
         input_area.controls.clear()
@@ -323,7 +192,7 @@ def main(page: ft.Page):
             pb_dado_nao_a_input_bayes,
             ft.ElevatedButton("Calcular Teorema de Bayes", on_click=on_bayes_theorem_calculate)
         ])
-        page.update()
+        input_area.update()
 
     # --- Distribuição Binomial ---
     n_input_binom = ft.TextField(label="n - Número de tentativas", hint_text="Ex: 10", width=500,
@@ -333,17 +202,16 @@ def main(page: ft.Page):
     k_input_binom = ft.TextField(label="k - Número de sucessos desejados", hint_text="Ex: 3", width=500,
                                  border_radius=ft.border_radius.all(8))
 
-    def on_binomial_distribution_calculate(e):
-        results_text.content.value = calcular_distribuicao_binomial(n_input_binom.value, p_input_binom.value,
-                                                                    k_input_binom.value)
-        page.update()
+    async def on_binomial_distribution_calculate(e):
+        await calcular(calcular_distribuicao_binomial, n_input_binom.value, p_input_binom.value, k_input_binom.value,
+                       leve=True)
 
     def show_binomial_distribution_inputs():
         input_area.controls.clear()
         input_area.controls.extend([n_input_binom, p_input_binom, k_input_binom,
                                     ft.ElevatedButton("Calcular Distribuição Binomial",
                                                       on_click=on_binomial_distribution_calculate)])
-        page.update()
+        input_area.update()
 
     # --- Distribuição de Poisson ---
     lambda_input_poisson = ft.TextField(label="λ (Lambda) - Taxa média de ocorrências", hint_text="Ex: 3.5", width=500,
@@ -351,16 +219,15 @@ def main(page: ft.Page):
     k_input_poisson = ft.TextField(label="k - Número de eventos desejados", hint_text="Ex: 2", width=500,
                                    border_radius=ft.border_radius.all(8))
 
-    def on_poisson_distribution_calculate(e):
-        results_text.content.value = calcular_distribuicao_poisson(lambda_input_poisson.value, k_input_poisson.value)
-        page.update()
+    async def on_poisson_distribution_calculate(e):
+        await calcular(calcular_distribuicao_poisson, lambda_input_poisson.value, k_input_poisson.value, leve=True)
 
     def show_poisson_distribution_inputs():
         input_area.controls.clear()
         input_area.controls.extend([lambda_input_poisson, k_input_poisson,
                                     ft.ElevatedButton("Calcular Distribuição de Poisson",
                                                       on_click=on_poisson_distribution_calculate)])
-        page.update()
+        input_area.update()
 
     # --- ANOVA ---
     groups_input_anova = ft.TextField(
@@ -373,15 +240,32 @@ def main(page: ft.Page):
         border_radius=ft.border_radius.all(8)
     )
 
-    def on_anova_calculate(e):
-        results_text.content.value = calcular_anova(groups_input_anova.value)
-        page.update()
+    async def on_anova_calculate(e):
+        await calcular(calcular_anova, groups_input_anova.value)
+
+    # O mesmo campo aceita resumos por grupo: n, média, desvio padrão
+    async def on_anova_summary_calculate(e):
+        await calcular(calcular_anova_resumos, groups_input_anova.value)
+
+    # Arquivos em formato longo (grupo, valor) são lidos em blocos
+    async def on_anova_file_picked(e: ft.FilePickerResultEvent):
+        if not e.files:
+            return
+        await calcular(calcular_anova_arquivo, e.files[0].path)
+
+    anova_file_picker = ft.FilePicker(on_result=on_anova_file_picked)
+    page.overlay.append(anova_file_picker)
 
     def show_anova_inputs():
         input_area.controls.clear()
         input_area.controls.extend([groups_input_anova,
-                                    ft.ElevatedButton("Calcular ANOVA", on_click=on_anova_calculate)])
-        page.update()
+                                    ft.ElevatedButton("Calcular ANOVA", on_click=on_anova_calculate),
+                                    ft.ElevatedButton("Calcular a partir de Resumos (n, média, dp)",
+                                                      on_click=on_anova_summary_calculate),
+                                    ft.ElevatedButton("ANOVA de Arquivo (grupo, valor)...",
+                                                      on_click=lambda _: anova_file_picker.pick_files(
+                                                          allowed_extensions=["csv", "txt"]))])
+        input_area.update()
 
     # --- Menu de Botões das Funções ---
     menu_buttons = ft.Row(
@@ -413,7 +297,7 @@ def main(page: ft.Page):
                 menu_buttons,
                 ft.Divider(height=20, color=ft.colors.BLUE_GREY_200),
                 input_area,
-                results_text,
+                results_panel,
             ],
             alignment=ft.MainAxisAlignment.START,
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
@@ -421,6 +305,8 @@ def main(page: ft.Page):
             width=800
         )
     )
+    # SciPy é importado em segundo plano, com a página já desenhada
+    precarregar()
 
 
 # --- Iniciar o Aplicativo Flet ---
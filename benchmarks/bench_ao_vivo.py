@@ -0,0 +1,77 @@
+"""
+Benchmark da regressão ao vivo: custo de um quadro (ajuste com os pontos
+novos e, com matplotlib instalado, o desenho com blitting no backend Agg)
+conforme cresce o total de pontos já recebidos. O custo deve depender só dos
+pontos por quadro e da janela visível, não do total.
+
+Uso: python benchmarks/bench_ao_vivo.py [pontos_por_quadro] [total_maximo]
+"""
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats_core import GraficoAoVivo, RegressaoAoVivo
+
+QUADROS_MEDIDOS = 50
+
+
+def criar_grafico():
+    try:
+        import matplotlib
+    except ImportError:
+        return None
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figura = Figure(figsize=(5, 4), dpi=100)
+    canvas = FigureCanvasAgg(figura)
+    grafico = GraficoAoVivo(canvas, figura.add_subplot(111))
+    canvas.draw()
+    return grafico
+
+
+def quadro(regressao, grafico, pontos):
+    regressao.adicionar(pontos)
+    resultado = regressao.resultado()
+    if grafico is not None:
+        grafico.atualizar(regressao.visiveis(), *regressao.reta(resultado), regressao.limites)
+
+
+def main(por_quadro, total_maximo):
+    rng = np.random.default_rng(0)
+    regressao = RegressaoAoVivo()
+    grafico = criar_grafico()
+    if grafico is None:
+        print("matplotlib não instalado: medindo só o ajuste")
+
+    # Aquecimento: o primeiro ajuste importa SciPy
+    quadro(regressao, grafico, rng.uniform(size=(por_quadro, 2)))
+
+    marcos = [m for m in (100_000, 1_000_000, 10_000_000, 100_000_000) if m <= total_maximo]
+    for marco in marcos:
+        # Recebe (sem medir) até o marco, em blocos grandes
+        while regressao.n < marco - QUADROS_MEDIDOS * por_quadro:
+            falta = min(1_000_000, marco - QUADROS_MEDIDOS * por_quadro - regressao.n)
+            x = rng.uniform(0, 100, size=falta)
+            regressao.adicionar(np.column_stack((x, 2 * x + rng.normal(size=falta))))
+        tempos = []
+        for _ in range(QUADROS_MEDIDOS):
+            x = rng.uniform(0, 100, size=por_quadro)
+            pontos = np.column_stack((x, 2 * x + rng.normal(size=por_quadro)))
+            inicio = time.perf_counter()
+            quadro(regressao, grafico, pontos)
+            tempos.append(time.perf_counter() - inicio)
+        print(f"{regressao.n:>11} pontos recebidos: quadro com {por_quadro} novos em "
+              f"{statistics.median(tempos) * 1e3:7.3f} ms (mediana), máximo {max(tempos) * 1e3:7.3f} ms")
+
+
+if __name__ == "__main__":
+    por_quadro = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    total_maximo = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000_000
+    main(por_quadro, total_maximo)
@@ -0,0 +1,45 @@
+"""
+Benchmark da análise descritiva: chamadas separadas de np.mean/np.median/
+np.max/np.min/np.var/np.std (implementação antiga) vs. stats_core.descrever.
+
+Uso: python benchmarks/bench_descritiva.py [n1 n2 ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats_core import descrever
+
+
+def descrever_antigo(data):
+    return (np.mean(data), np.median(data), np.max(data) - np.min(data),
+            np.var(data), np.std(data))
+
+
+def cronometrar(func, *args, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func(*args)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main(tamanhos):
+    rng = np.random.default_rng(0)
+    print(f"{'n':>10} {'lista (s)':>10} {'ndarray (s)':>12} {'novo (s)':>10}")
+    for n in tamanhos:
+        dados = rng.normal(50, 10, n)
+        lista = dados.tolist()
+        t_lista = cronometrar(descrever_antigo, lista, repeticoes=1)
+        t_array = cronometrar(descrever_antigo, dados)
+        t_novo = cronometrar(descrever, dados)
+        print(f"{n:>10} {t_lista:>10.4f} {t_array:>12.4f} {t_novo:>10.4f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 1_000_000, 10_000_000])
@@ -0,0 +1,97 @@
+"""
+Benchmark do redesenho do gráfico de regressão: a implementação antiga
+(axes.clear, scatter de todos os pontos, reta com um ponto por amostra,
+legenda e grade recriadas) vs. GraficoRegressao (artistas persistentes, reta
+por dois pontos, densidade acima do limite de pontos). Usa o backend Agg do
+matplotlib, sem janela; sem matplotlib instalado, o benchmark é ignorado.
+
+A implementação antiga só é medida até `max_antigo` pontos (padrão 1 milhão):
+acima disso ela leva minutos.
+
+Uso: python benchmarks/bench_grafico_regressao.py [max_antigo] [pontos ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats_core import GraficoRegressao, RegressaoIncremental, ResultadoRegressao
+
+
+def dados(n, semente):
+    rng = np.random.default_rng(semente)
+    x = rng.uniform(0, 100, size=n)
+    y = 3 + 2 * x + rng.normal(scale=20, size=n)
+    ajuste = RegressaoIncremental().sincronizar(x, y).resultado()
+    return ResultadoRegressao.de_dict(ajuste, x=x, y=y)
+
+
+def criar_canvas():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figura = Figure(figsize=(5, 4), dpi=100)
+    canvas = FigureCanvasAgg(figura)
+    return canvas, figura.add_subplot(111)
+
+
+def desenho_antigo(canvas, axes, resultado):
+    line_x = resultado.x
+    line_y = resultado.intercepto + resultado.inclinacao * line_x
+    axes.clear()
+    axes.scatter(resultado.x, resultado.y, label='Dados Originais')
+    axes.plot(line_x, line_y, color='red', linewidth=2, label='Reta de Regressão')
+    axes.set_title('Gráfico de Dispersão e Reta de Regressão')
+    axes.set_xlabel('Eixo X')
+    axes.set_ylabel('Eixo Y')
+    axes.legend()
+    axes.grid(True)
+    canvas.draw()
+
+
+def desenho_novo(canvas, grafico, resultado):
+    grafico.atualizar(resultado.x, resultado.y, *resultado.reta())
+    canvas.draw()
+
+
+def cronometrar(func, *args):
+    inicio = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - inicio
+
+
+def main(max_antigo, lista_pontos):
+    try:
+        import matplotlib
+    except ImportError:
+        print("matplotlib não instalado, ignorado")
+        return 0
+    matplotlib.use("Agg")
+
+    for n in lista_pontos:
+        primeiro, segundo = dados(n, 0), dados(n, 1)
+        print(f"{n} pontos:")
+        if n <= max_antigo:
+            canvas, axes = criar_canvas()
+            t_antigo = [cronometrar(desenho_antigo, canvas, axes, r) for r in (primeiro, segundo)]
+            print(f"  antigo:                 primeiro {t_antigo[0] * 1e3:9.1f} ms, redesenho {t_antigo[1] * 1e3:9.1f} ms")
+        else:
+            t_antigo = None
+            print("  antigo:                 omitido (acima de max_antigo)")
+        for modo in ("densidade", "amostra"):
+            canvas, axes = criar_canvas()
+            grafico = GraficoRegressao(axes, modo=modo)
+            t_novo = [cronometrar(desenho_novo, canvas, grafico, r) for r in (primeiro, segundo)]
+            ganho = f"  ({t_antigo[1] / t_novo[1]:.0f}x)" if t_antigo else ""
+            print(f"  GraficoRegressao ({modo + '):':10s} primeiro {t_novo[0] * 1e3:9.1f} ms, "
+                  f"redesenho {t_novo[1] * 1e3:9.1f} ms{ganho}")
+    return 0
+
+
+if __name__ == "__main__":
+    max_antigo = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lista_pontos = [int(v) for v in sys.argv[2:]] or [10_000, 1_000_000, 10_000_000]
+    sys.exit(main(max_antigo, lista_pontos))
@@ -0,0 +1,108 @@
+"""
+Benchmark do tempo de abertura das interfaces, com orçamento.
+
+Para cada ponto de entrada, mede com `python -X importtime` o tempo para
+importar o módulo (tudo o que acontece antes de a janela ser criada) e
+verifica que SciPy e matplotlib não fazem parte do grafo de importação: eles
+devem ser carregados no primeiro uso ou pela pré-carga em segundo plano. Na
+interface PySide6 mede também o tempo até a primeira janela ser exibida
+(plataforma Qt "offscreen"). Pontos de entrada cujas dependências (Flet,
+PySide6) não estão instaladas são ignorados.
+
+Termina com código 1 se alguma mediana passar do orçamento ou se um módulo
+pesado for importado na abertura, para uso em integração contínua.
+
+Uso: python benchmarks/bench_inicializacao.py [orcamento_ms] [repeticoes]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRADAS = ("stats_core", "StatsCalc_2", "stats_calc_pyside")
+MODULOS_PROIBIDOS = ("scipy", "matplotlib")
+
+# Cria a janela principal sem exibi-la na tela e imprime o tempo até ela aparecer
+PRIMEIRA_JANELA = """
+import time
+inicio = time.perf_counter()
+import stats_calc_pyside
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+janela = stats_calc_pyside.StatsCalcWindow()
+janela.show()
+app.processEvents()
+print(time.perf_counter() - inicio)
+"""
+
+_LINHA_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def executar(codigo, *opcoes):
+    ambiente = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    return subprocess.run([sys.executable, *opcoes, "-c", codigo], cwd=RAIZ, env=ambiente,
+                          capture_output=True, text=True)
+
+
+def medir_importacao(modulo):
+    """(tempo total de importação em s, módulos importados, 5 mais lentos) ou None."""
+    processo = executar(f"import {modulo}", "-X", "importtime")
+    if processo.returncode != 0:
+        return None
+    total, modulos, raizes = 0, set(), []
+    for linha in processo.stderr.splitlines():
+        casamento = _LINHA_IMPORTTIME.match(linha)
+        if casamento is None:
+            continue
+        acumulado, recuo, nome = int(casamento[2]), casamento[3], casamento[4]
+        modulos.add(nome)
+        if not recuo:
+            total += acumulado
+            raizes.append((acumulado, nome))
+    return total / 1e6, modulos, sorted(raizes, reverse=True)[:5]
+
+
+def medir_primeira_janela():
+    processo = executar(PRIMEIRA_JANELA)
+    if processo.returncode != 0:
+        return None
+    return float(processo.stdout.split()[-1])
+
+
+def main(orcamento, repeticoes):
+    falhas = []
+    for modulo in ENTRADAS:
+        medidas = [medir_importacao(modulo) for _ in range(repeticoes)]
+        if medidas[0] is None:
+            print(f"{modulo}: dependências ausentes, ignorado")
+            continue
+        mediana = statistics.median(m[0] for m in medidas)
+        _, modulos, mais_lentos = medidas[0]
+        proibidos = sorted({nome.split(".")[0] for nome in modulos} & set(MODULOS_PROIBIDOS))
+        print(f"{modulo}: importação {mediana * 1e3:8.1f} ms (mediana de {repeticoes})")
+        for acumulado, nome in mais_lentos:
+            print(f"    {acumulado / 1e3:8.1f} ms  {nome}")
+        if proibidos:
+            falhas.append(f"{modulo} importa {', '.join(proibidos)} na abertura")
+        if mediana > orcamento:
+            falhas.append(f"{modulo}: {mediana * 1e3:.1f} ms > orçamento de {orcamento * 1e3:.0f} ms")
+
+    janelas = [medir_primeira_janela() for _ in range(repeticoes)]
+    if janelas[0] is not None:
+        mediana = statistics.median(janelas)
+        print(f"stats_calc_pyside: primeira janela em {mediana * 1e3:8.1f} ms (mediana de {repeticoes})")
+        if mediana > orcamento:
+            falhas.append(f"primeira janela: {mediana * 1e3:.1f} ms > orçamento de {orcamento * 1e3:.0f} ms")
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    orcamento = float(sys.argv[1]) / 1e3 if len(sys.argv) > 1 else 0.5
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    sys.exit(main(orcamento, repeticoes))
@@ -0,0 +1,52 @@
+"""
+Benchmark da análise descritiva de arquivos em vários processos.
+
+Gera um arquivo temporário com `n` valores e mede descrever_arquivo com 1, 2,
+4 e 8 processos, conferindo que os resultados coincidem com o modo serial.
+
+Uso: python benchmarks/bench_paralelo.py [n]
+"""
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats_core import descrever_arquivo
+
+
+def gerar_arquivo(n, caminho, bloco=1_000_000):
+    rng = np.random.default_rng(0)
+    with open(caminho, "w") as arquivo:
+        for inicio in range(0, n, bloco):
+            valores = np.round(rng.normal(50, 10, min(bloco, n - inicio)), 4)
+            arquivo.write("\n".join(map(repr, valores.tolist())))
+            arquivo.write("\n")
+
+
+def main(n):
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "dados.txt")
+        gerar_arquivo(n, caminho)
+        print(f"arquivo: {os.path.getsize(caminho) / 1e6:.0f} MB, {n} valores, "
+              f"{os.cpu_count()} núcleos disponíveis")
+        print(f"{'processos':>10} {'tempo (s)':>10} {'ganho':>7}")
+        serial = None
+        for processos in (1, 2, 4, 8):
+            inicio = time.perf_counter()
+            resumo = descrever_arquivo(caminho, processos=processos)
+            tempo = time.perf_counter() - inicio
+            if serial is None:
+                serial, t_serial = resumo, tempo
+            for chave in ("media", "variancia", "minimo", "maximo"):
+                assert math.isclose(resumo[chave], serial[chave], rel_tol=1e-12), chave
+            assert resumo["n"] == serial["n"]
+            print(f"{processos:>10} {tempo:>10.3f} {t_serial / tempo:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000)
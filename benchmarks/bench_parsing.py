@@ -0,0 +1,44 @@
+"""
+Benchmark da conversão de texto em números: list comprehension com float()
+(implementação antiga) vs. stats_core.parse_numeros.
+
+Uso: python benchmarks/bench_parsing.py [n1 n2 ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats_core import parse_numeros
+
+
+def parse_antigo(data_str):
+    return np.asarray([float(x.strip()) for x in data_str.split(',') if x.strip()])
+
+
+def cronometrar(func, *args, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func(*args)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main(tamanhos):
+    rng = np.random.default_rng(0)
+    print(f"{'n':>10} {'antigo (s)':>12} {'novo (s)':>10} {'ganho':>7} {'MB/s novo':>10}")
+    for n in tamanhos:
+        texto = ", ".join(map(repr, np.round(rng.normal(50, 10, n), 3).tolist()))
+        assert np.array_equal(parse_antigo(texto), parse_numeros(texto))
+        t_antigo = cronometrar(parse_antigo, texto)
+        t_novo = cronometrar(parse_numeros, texto)
+        print(f"{n:>10} {t_antigo:>12.4f} {t_novo:>10.4f} {t_antigo / t_novo:>6.1f}x "
+              f"{len(texto) / t_novo / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 1_000_000, 5_000_000])
@@ -0,0 +1,61 @@
+"""
+Benchmark do teste de permutação da ANOVA: laço com um scipy.stats.f_oneway
+por permutação vs. stats_core.permutacao_anova (lotes vetorizados, em um ou
+vários processos).
+
+Uso: python benchmarks/bench_permutacao.py [n_por_grupo] [grupos] [permutacoes]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.stats import f_oneway
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats_core import permutacao_anova
+from stats_core.parallel import numero_de_processos
+
+
+def cronometrar(func, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = func(*args, **kwargs)
+    return time.perf_counter() - inicio, resultado
+
+
+def laco_ingenuo(grupos, permutacoes, semente):
+    rng = np.random.default_rng(semente)
+    dados = np.concatenate(grupos)
+    cortes = np.cumsum([g.size for g in grupos])[:-1]
+    observado = f_oneway(*grupos).statistic
+    extremos = sum(f_oneway(*np.split(rng.permutation(dados), cortes)).statistic >= observado
+                   for _ in range(permutacoes))
+    return (extremos + 1) / (permutacoes + 1)
+
+
+def main(n_por_grupo, n_grupos, permutacoes):
+    rng = np.random.default_rng(0)
+    grupos = [rng.normal(0.05 * i, 1, n_por_grupo) for i in range(n_grupos)]
+
+    # O laço é medido em uma amostra das permutações e extrapolado
+    amostra = min(permutacoes, 2_000)
+    t_laco, p_laco = cronometrar(laco_ingenuo, grupos, amostra, 0)
+    t_laco *= permutacoes / amostra
+    print(f"{n_grupos} grupos x {n_por_grupo} observações, {permutacoes} permutações:")
+    print(f"  laço f_oneway (estimado):      {t_laco:9.3f} s  (p = {p_laco:.4f}, {amostra} permutações)")
+    t_um, um = cronometrar(permutacao_anova, grupos, permutacoes, semente=0)
+    print(f"  permutacao_anova, 1 processo:  {t_um:9.3f} s  (p = {um['p_valor']:.4f}, {t_laco / t_um:.0f}x)")
+    processos = numero_de_processos()
+    if processos > 1:
+        t_n, n = cronometrar(permutacao_anova, grupos, permutacoes, semente=0, processos=processos)
+        assert n["p_valor"] == um["p_valor"]
+        print(f"  permutacao_anova, {processos} processos: {t_n:9.3f} s  ({t_laco / t_n:.0f}x)")
+    t_cedo, cedo = cronometrar(permutacao_anova, grupos, permutacoes, semente=0, precisao=0.005)
+    print(f"  com parada antecipada (±0.005): {t_cedo:8.3f} s  "
+          f"(p = {cedo['p_valor']:.4f}, {cedo['permutacoes']} permutações)")
+
+
+if __name__ == "__main__":
+    argumentos = [int(v) for v in sys.argv[1:4]]
+    main(*(argumentos + [100, 5, 100_000][len(argumentos):]))
@@ -0,0 +1,49 @@
+"""
+Benchmark do motor de Poisson: uma chamada de scipy.stats.poisson.pmf por
+consulta (implementação antiga) vs. consultas em lote ao cache de tabelas,
+para um conjunto pequeno de λ repetidos (caso típico de alertas).
+
+Uso: python benchmarks/bench_poisson.py [consultas]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.stats import poisson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats_core import CachePoisson
+
+
+def main(consultas):
+    rng = np.random.default_rng(0)
+    lambdas = rng.choice([0.5, 2.0, 7.5, 30.0, 250.0], consultas)
+    ks = rng.poisson(lambdas)
+
+    amostra = min(consultas, 20_000)
+    inicio = time.perf_counter()
+    antigo = [poisson.pmf(ks[i], lambdas[i]) for i in range(amostra)]
+    t_laco = (time.perf_counter() - inicio) * consultas / amostra
+
+    cache = CachePoisson()
+    inicio = time.perf_counter()
+    novo = np.empty(consultas)
+    for lam in np.unique(lambdas):
+        selecao = lambdas == lam
+        novo[selecao] = cache.pmf(lam, ks[selecao])
+    cache.cdf(7.5, ks)
+    cache.sf(7.5, ks)
+    cache.ppf(250.0, rng.random(consultas))
+    t_cache = time.perf_counter() - inicio
+    assert np.allclose(antigo, novo[:amostra], rtol=1e-9)
+
+    print(f"{consultas} consultas em {len(np.unique(lambdas))} valores de λ")
+    print(f"  laço poisson.pmf (estimado):       {t_laco:8.3f} s")
+    print(f"  cache (pmf + cdf + sf + ppf):      {t_cache:8.3f} s  ({t_laco / t_cache:.0f}x)")
+    print(f"  estatísticas do cache: {cache.estatisticas()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
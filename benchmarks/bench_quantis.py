@@ -0,0 +1,40 @@
+"""
+Precisão e custo do sketch KLL: erro de rank observado (contra os quantis
+exatos) e estimado para mediana, P90 e P99, variando o parâmetro k.
+
+Uso: python benchmarks/bench_quantis.py [n]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats_core import KLL
+from stats_core.quantiles import erro_rank_observado
+
+TAMANHO_BLOCO = 1 << 20
+
+
+def main(n):
+    dados = np.random.default_rng(0).lognormal(size=n)
+    inicio = time.perf_counter()
+    exatos = np.quantile(dados, [0.5, 0.9, 0.99])
+    t_exato = time.perf_counter() - inicio
+    print(f"n = {n}; quantis exatos (np.quantile): {t_exato:.3f} s")
+    print(f"{'k':>6} {'itens':>7} {'tempo (s)':>10} {'erro obs.':>10} {'erro est.':>10}")
+    for k in (50, 100, 200, 400, 800):
+        inicio = time.perf_counter()
+        sketch = KLL(k, semente=0)
+        for i in range(0, n, TAMANHO_BLOCO):
+            sketch.atualizar(dados[i:i + TAMANHO_BLOCO])
+        tempo = time.perf_counter() - inicio
+        print(f"{k:>6} {sketch.tamanho:>7} {tempo:>10.3f} "
+              f"{erro_rank_observado(sketch, dados):>10.4%} {sketch.erro_rank:>10.4%}")
+    print("quantis exatos:", np.round(exatos, 4))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
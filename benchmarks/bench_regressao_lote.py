@@ -0,0 +1,47 @@
+"""
+Benchmark da regressão em lote: um scipy.stats.linregress por série
+(implementação antiga) vs. stats_core.regressao_lote com todas as séries em
+uma única matriz.
+
+Uso: python benchmarks/bench_regressao_lote.py [amostras] [series ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.stats import linregress
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats_core import regressao_lote
+
+
+def cronometrar(func, *args):
+    inicio = time.perf_counter()
+    resultado = func(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def main(amostras, lista_series):
+    rng = np.random.default_rng(0)
+    x = np.arange(amostras, dtype=np.float64)
+    for series in lista_series:
+        y = rng.normal(size=(series, amostras)) + rng.normal(size=(series, 1)) * x
+
+        # O laço é medido em uma amostra das séries e extrapolado
+        amostra = min(series, 2_000)
+        t_laco, antigo = cronometrar(lambda: [linregress(x, y[i]) for i in range(amostra)])
+        t_laco *= series / amostra
+        t_lote, lote = cronometrar(regressao_lote, x, y)
+        assert np.allclose([r.slope for r in antigo], lote["inclinacao"][:amostra])
+        assert np.allclose([r.pvalue for r in antigo], lote["p_valor"][:amostra])
+        print(f"{series} séries x {amostras} amostras:")
+        print(f"  laço linregress (estimado): {t_laco:9.3f} s")
+        print(f"  regressao_lote:             {t_lote:9.3f} s  ({t_laco / t_lote:.0f}x)")
+
+
+if __name__ == "__main__":
+    amostras = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    lista_series = [int(v) for v in sys.argv[2:]] or [1_000, 100_000]
+    main(amostras, lista_series)
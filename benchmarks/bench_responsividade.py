@@ -0,0 +1,105 @@
+"""
+Benchmark da responsividade da janela PySide6 durante cálculos longos.
+
+Para cada cálculo, mede quanto tempo a janela ficaria parada se ele rodasse
+na thread da interface (como antes) e, rodando em CalculoWorker, os
+intervalos entre os tiques de um QTimer de 1 ms na thread da interface: um
+intervalo longo é um quadro que a janela não conseguiu desenhar. Usa a
+plataforma Qt "offscreen"; sem PySide6 instalado, o benchmark é ignorado.
+
+Termina com código 1 se o p99 dos intervalos passar do orçamento.
+
+Uso: python benchmarks/bench_responsividade.py [orcamento_ms] [escala]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from stats_core import (analisar_anova, analisar_estatisticas_descritivas, analisar_regressao_linear,
+                        limpar_caches)
+
+
+def casos(escala):
+    rng = np.random.default_rng(0)
+
+    def texto(valores):
+        return ", ".join(f"{v:.4f}" for v in valores)
+
+    n = 200_000 * escala
+    yield "descritiva + bootstrap", analisar_estatisticas_descritivas, (texto(rng.normal(size=n)), True)
+    grupos = "; ".join(texto(rng.normal(size=n)) for _ in range(3))
+    yield "anova", analisar_anova, (grupos,)
+    x = np.arange(20_000 * escala)
+    yield "regressao", analisar_regressao_linear, (texto(x), texto(2 * x + rng.normal(size=x.size)))
+
+
+def medir(app, janela, funcao, args):
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    intervalos = []
+    ultimo = time.perf_counter()
+    laco = QEventLoop()
+
+    def tique():
+        nonlocal ultimo
+        agora = time.perf_counter()
+        intervalos.append(agora - ultimo)
+        ultimo = agora
+        if janela.calculo is None:
+            laco.quit()
+
+    timer = QTimer()
+    timer.setInterval(1)
+    timer.timeout.connect(tique)
+    inicio = time.perf_counter()
+    janela.executar_calculo(funcao, *args)
+    timer.start()
+    laco.exec()
+    timer.stop()
+    return time.perf_counter() - inicio, np.array(intervalos)
+
+
+def main(orcamento, escala):
+    try:
+        from PySide6.QtWidgets import QApplication
+    except ImportError:
+        print("PySide6 não instalado, ignorado")
+        return 0
+    import stats_calc_pyside
+
+    app = QApplication([])
+    janela = stats_calc_pyside.StatsCalcWindow()
+    janela.show()
+    app.processEvents()
+
+    falhas = []
+    for nome, funcao, args in casos(escala):
+        limpar_caches()
+        inicio = time.perf_counter()
+        funcao(*args)
+        parada = time.perf_counter() - inicio
+
+        limpar_caches()
+        total, intervalos = medir(app, janela, funcao, args)
+        p99 = np.percentile(intervalos, 99)
+        print(f"{nome}:")
+        print(f"  na thread da interface: janela parada por {parada * 1e3:9.1f} ms")
+        print(f"  em CalculoWorker:       {total * 1e3:9.1f} ms no total; intervalo entre quadros "
+              f"p99 {p99 * 1e3:6.1f} ms, máximo {intervalos.max() * 1e3:6.1f} ms")
+        if p99 > orcamento:
+            falhas.append(f"{nome}: p99 {p99 * 1e3:.1f} ms > orçamento de {orcamento * 1e3:.0f} ms")
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    orcamento = float(sys.argv[1]) / 1e3 if len(sys.argv) > 1 else 0.016
+    escala = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    sys.exit(main(orcamento, escala))
@@ -0,0 +1,135 @@
+"""
+Teste de carga do serviço HTTP (stats_core.servico).
+
+Inicia o serviço em um subprocesso (ou usa um já em execução, com --url) e
+envia requisições por várias conexões keep-alive simultâneas, alternando
+análises leves (Bayes, Poisson, respondidas no laço de eventos) e pesadas
+(ANOVA, regressão e descritiva com dados diferentes a cada requisição, para
+não acertar o cache). Relata requisições por segundo, latência p50/p99 no
+total e por análise, e quantas respostas foram 503 (pool cheio).
+
+Uso: python benchmarks/bench_servico.py [-n 2000] [-c 32] [-p 4] [--url http://127.0.0.1:8765]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def pedidos(total, semente=0):
+    """(análise, corpo JSON) de cada requisição, em ciclo pelas análises."""
+    rng = np.random.default_rng(semente)
+    for i in range(total):
+        tipo = i % 5
+        if tipo == 0:
+            analise, entradas = "teorema_bayes", [0.01, 0.9, round(rng.uniform(0.01, 0.2), 4)]
+        elif tipo == 1:
+            analise, entradas = "distribuicao_poisson", [round(rng.uniform(0.5, 20), 3), int(rng.integers(0, 30))]
+        elif tipo == 2:
+            analise, entradas = "anova", {"groups_str": np.round(rng.normal(size=(3, 200)), 4).tolist()}
+        elif tipo == 3:
+            x = np.arange(500)
+            analise, entradas = "regressao_linear", [x.tolist(), np.round(2 * x + rng.normal(size=500), 4).tolist()]
+        else:
+            analise, entradas = "estatisticas_descritivas", [np.round(rng.normal(size=2000), 4).tolist()]
+        yield analise, json.dumps({"entradas": entradas}).encode("utf-8")
+
+
+async def requisitar(leitor, escritor, host, analise, corpo):
+    escritor.write(f"POST /analisar/{analise} HTTP/1.1\r\nHost: {host}\r\n"
+                   f"Content-Type: application/json\r\nContent-Length: {len(corpo)}\r\n\r\n".encode("latin-1") + corpo)
+    await escritor.drain()
+    cabecalho = (await leitor.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status = int(cabecalho.split(" ", 2)[1])
+    tamanho = 0
+    for linha in cabecalho.split("\r\n")[1:]:
+        nome, _, valor = linha.partition(":")
+        if nome.strip().lower() == "content-length":
+            tamanho = int(valor)
+    await leitor.readexactly(tamanho)
+    return status
+
+
+async def carga(host, porta, lista, conexoes):
+    fila = asyncio.Queue()
+    for pedido in lista:
+        fila.put_nowait(pedido)
+    medidas = []
+
+    async def cliente():
+        leitor, escritor = await asyncio.open_connection(host, porta)
+        try:
+            while not fila.empty():
+                analise, corpo = fila.get_nowait()
+                inicio = time.perf_counter()
+                status = await requisitar(leitor, escritor, host, analise, corpo)
+                medidas.append((analise, status, time.perf_counter() - inicio))
+        finally:
+            escritor.close()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(conexoes)))
+    return medidas, time.perf_counter() - inicio
+
+
+def percentis(tempos):
+    p50, p99 = np.percentile(tempos, [50, 99])
+    return f"p50 {p50 * 1e3:8.2f} ms  p99 {p99 * 1e3:8.2f} ms"
+
+
+def iniciar_servico(processos):
+    comando = [sys.executable, "-m", "stats_core.servico", "--porta", "0"]
+    if processos:
+        comando += ["-p", str(processos)]
+    processo = subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.PIPE, text=True)
+    # Primeira linha: "Servindo em http://host:porta com N processo(s)"
+    url = processo.stdout.readline().split()[2]
+    return processo, url
+
+
+def main(args):
+    processo = None
+    url = args.url
+    if url is None:
+        processo, url = iniciar_servico(args.processos)
+    partes = urlsplit(url)
+    try:
+        # Aquecimento: pool iniciado e SciPy importado nos processos
+        asyncio.run(carga(partes.hostname, partes.port, list(pedidos(50, semente=1)), 5))
+        medidas, segundos = asyncio.run(carga(partes.hostname, partes.port, list(pedidos(args.requisicoes)),
+                                              args.conexoes))
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+    status = Counter(s for _, s, _ in medidas)
+    print(f"{len(medidas)} requisições em {segundos:.2f} s com {args.conexoes} conexões: "
+          f"{len(medidas) / segundos:.1f} req/s")
+    print(f"  status: {', '.join(f'{s}: {n}' for s, n in sorted(status.items()))}")
+    print(f"  {'total':26s} {percentis([t for _, _, t in medidas])}")
+    por_analise = defaultdict(list)
+    for analise, s, t in medidas:
+        if s != 503:
+            por_analise[analise].append(t)
+    for analise, tempos in sorted(por_analise.items()):
+        print(f"  {analise:26s} {percentis(tempos)}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço HTTP da calculadora.")
+    parser.add_argument("-n", "--requisicoes", type=int, default=2000)
+    parser.add_argument("-c", "--conexoes", type=int, default=32)
+    parser.add_argument("-p", "--processos", type=int, help="processos do serviço iniciado pelo benchmark")
+    parser.add_argument("--url", help="usa um serviço já em execução em vez de iniciar um")
+    sys.exit(main(parser.parse_args()))
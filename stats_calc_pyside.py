@@ -1,202 +1,116 @@
+import inspect
 import sys
-import numpy as np
-from scipy.stats import linregress, binom, poisson, f_oneway
-from collections import Counter
-import math
+import threading
+import time
 
-import matplotlib
-
-matplotlib.use('QtAgg')
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from stats_core import (MODULOS_PESADOS, BufferPontos, GraficoAoVivo, GraficoRegressao, ReceberSocket,
+                        RegressaoAoVivo, RegressaoIncremental, SeguirArquivo, analisar_anova, analisar_anova_arquivo,
+                        analisar_anova_resumos, analisar_distribuicao_binomial, analisar_distribuicao_poisson,
+                        analisar_estatisticas_descritivas, analisar_estatisticas_descritivas_arquivo,
+                        analisar_regressao_linear, analisar_regressao_multipla_arquivo, analisar_teorema_bayes,
+                        mensagem_de_erro, precarregar)
+from stats_core.parallel import CalculoCancelado
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QTextEdit, QLineEdit, QStackedWidget, QFrame,
-    QSplitter  # Importar o QSplitter
+    QSplitter, QFileDialog, QCheckBox, QProgressBar
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, Signal
 from PySide6.QtGui import QFont
 
 
 # ===================================================================
-# PARTE 1: FUNÇÕES DE CÁLCULO (Sem alterações)
+# PARTE 1: FUNÇÕES DE CÁLCULO
 # ===================================================================
-# ... (todo o bloco de funções de cálculo permanece o mesmo) ...
-def calcular_estatisticas_descritivas(data_str):
-    try:
-        data = [float(x.strip()) for x in data_str.split(',') if x.strip()]
-        if not data: return "Erro: Insira dados numéricos válidos separados por vírgula."
-        n, media, mediana = len(data), np.mean(data), np.median(data)
-        contagem = Counter(data)
-        max_frequencia = 0
-        modas = []
-        for valor, freq in contagem.items():
-            if freq > max_frequencia:
-                max_frequencia, modas = freq, [valor]
-            elif freq == max_frequencia and max_frequencia > 1:
-                modas.append(valor)
-        if not modas or max_frequencia == 1:
-            modo_str = "Amodal (sem repetições significativas)"
-        else:
-            modo_str = ", ".join(map(str, sorted(modas)))
-        amplitude, variancia, desvio_padrao = np.max(data) - np.min(data), np.var(data), np.std(data)
-        return (f"Resultados da Análise Descritiva:\n"
-                f"  Número de Dados (n): {n}\n"
-                f"  Média: {media:.4f}\n"
-                f"  Mediana: {mediana:.4f}\n"
-                f"  Moda: {modo_str}\n"
-                f"  Amplitude: {amplitude:.4f}\n"
-                f"  Variância (Pop.): {variancia:.4f}\n"
-                f"  Desvio Padrão (Pop.): {desvio_padrao:.4f}")
-    except (ValueError, TypeError):
-        return "Erro: Verifique se os dados são numéricos válidos."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
-
-
-def calcular_regressao_linear(x_str, y_str):
-    try:
-        x_data = [float(val.strip()) for val in x_str.split(',') if val.strip()]
-        y_data = [float(val.strip()) for val in y_str.split(',') if val.strip()]
-        if not x_data or len(x_data) != len(y_data):
-            return {"error": "Erro: Insira listas X e Y válidas e de mesmo tamanho."}
-        slope, intercept, r_value, p_value, std_err = linregress(x_data, y_data)
-        text_result = (
-            f"Resultados da Regressão Linear Simples:\n"
-            f"  Equação: Y = {intercept:.4f} + {slope:.4f}X\n"
-            f"  Coeficiente Angular (b): {slope:.4f}\n"
-            f"  Intercepto (a): {intercept:.4f}\n"
-            f"  Coeficiente de Determinação (R²): {r_value ** 2:.4f}\n"
-            f"  Valor-p: {p_value:.4f}"
-        )
-        plot_data = {
-            'x_data': x_data,
-            'y_data': y_data,
-            'line_x': np.array(x_data),
-            'line_y': intercept + slope * np.array(x_data)
-        }
-        return {"text": text_result, "plot_data": plot_data}
-    except (ValueError, TypeError):
-        return {"error": "Erro: Verifique se os dados são numéricos válidos."}
-    except Exception as e:
-        return {"error": f"Ocorreu um erro: {e}"}
-
-
-def calcular_teorema_bayes(pa_str, pb_dado_a_str, pb_dado_nao_a_str):
-    """
-    Calcula e retorna a probabilidade P(A|B) detalhando os passos do cálculo.
-    """
-    try:
-        PA = float(pa_str)
-        PB_dado_A = float(pb_dado_a_str)
-        PB_dado_NAO_A = float(pb_dado_nao_a_str)
-
-        if not (0 <= PA <= 1 and 0 <= PB_dado_A <= 1 and 0 <= PB_dado_NAO_A <= 1):
-            return "Erro: As probabilidades devem estar entre 0 e 1."
-
-        # Calcula P(não A)
-        P_NAO_A = 1 - PA
-
-        # Calcula P(B) usando a Lei da Probabilidade Total
-        PB = (PB_dado_A * PA) + (PB_dado_NAO_A * P_NAO_A)
-
-        if PB == 0:
-            return "Erro: P(B) resultou em zero, divisão por zero impossível."
-
-        # Calcula P(A|B) usando o Teorema de Bayes
-        PA_dado_B = (PB_dado_A * PA) / PB
-
-        # Constrói a string de resultado detalhada
-        results = (
-            f"Resultados do Teorema de Bayes:\n\n"
-            f"Entradas:\n"
-            f"  P(A) = {PA:.4f}\n"
-            f"  P(B|A) = {PB_dado_A:.4f}\n"
-            f"  P(B|¬A) = {PB_dado_NAO_A:.4f}\n"
-            f"  (Calculado) P(¬A) = 1 - {PA:.4f} = {P_NAO_A:.4f}\n"
-            f"--------------------------------------------------\n"
-            f"1. Cálculo de P(B) pela Lei da Probabilidade Total:\n"
-            f"   Fórmula: P(B) = P(B|A) * P(A) + P(B|¬A) * P(¬A)\n"
-            f"   Cálculo: P(B) = ({PB_dado_A:.4f} * {PA:.4f}) + ({PB_dado_NAO_A:.4f} * {P_NAO_A:.4f})\n"
-            f"   Resultado: P(B) = {PB:.4f}\n"
-            f"--------------------------------------------------\n"
-            f"2. Cálculo de P(A|B) pelo Teorema de Bayes:\n"
-            f"   Fórmula: P(A|B) = [P(B|A) * P(A)] / P(B)\n"
-            f"   Cálculo: P(A|B) = [{PB_dado_A:.4f} * {PA:.4f}] / {PB:.4f}\n\n"
-            f"   Resultado Final: P(A|B) = {PA_dado_B:.4f}"
-        )
-        return results
-
-    except (ValueError, TypeError):
-        return "Erro: Insira valores numéricos válidos para as probabilidades."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
-
-
-def calcular_distribuicao_binomial(n_str, p_str, k_str):
-    try:
-        n, p, k = int(n_str), float(p_str), int(k_str)
-        if not (n > 0 and 0 <= p <= 1 and 0 <= k <= n):
-            return "Erro: Verifique os valores (n>0, 0<=p<=1, 0<=k<=n)."
-        prob = binom.pmf(k, n, p)
-        return (f"Resultados da Distribuição Binomial:\n"
-                f"  Número de Tentativas (n): {n}\n"
-                f"  Probabilidade de Sucesso (p): {p:.4f}\n"
-                f"  Número de Sucessos (k): {k}\n"
-                f"  P(X = {k}) = {prob:.6f}")
-    except (ValueError, TypeError):
-        return "Erro: Insira valores válidos (n, k inteiros)."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
-
-
-def calcular_distribuicao_poisson(lam_str, k_str):
-    try:
-        lam, k = float(lam_str), int(k_str)
-        if not (lam > 0 and k >= 0):
-            return "Erro: Lambda (λ) deve ser > 0 e k deve ser >= 0."
-        prob = poisson.pmf(k, lam)
-        return (f"Resultados da Distribuição de Poisson:\n"
-                f"  Taxa Média (λ): {lam:.4f}\n"
-                f"  Número de Eventos (k): {k}\n"
-                f"  P(X = {k}) = {prob:.6f}")
-    except (ValueError, TypeError):
-        return "Erro: Insira valores válidos (k inteiro)."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
-
-
-def calcular_anova(groups_str):
-    try:
-        groups_data = []
-        for group_str in groups_str.split(';'):
-            data = [float(x.strip()) for x in group_str.split(',') if x.strip()]
-            if data: groups_data.append(data)
-        if len(groups_data) < 2: return "Erro: ANOVA requer pelo menos dois grupos."
-        F_statistic, p_value = f_oneway(*groups_data)
-        return (f"Resultados da ANOVA:\n"
-                f"  Número de Grupos: {len(groups_data)}\n"
-                f"  Estatística F: {F_statistic:.4f}\n"
-                f"  Valor-p: {p_value:.4f}\n\n"
-                f"  Interpretação (α=0.05):\n"
-                f"   - p < 0.05: Há diferença significativa entre as médias.\n"
-                f"   - p >= 0.05: Não há diferença significativa entre as médias.")
-    except (ValueError, TypeError):
-        return "Erro: Verifique o formato dos dados."
-    except Exception as e:
-        return f"Ocorreu um erro: {e}"
+# As funções de cálculo ficam em stats_core.calculadora, compartilhadas com as
+# interfaces Flet (StatsCalc_1.py e StatsCalc_2.py). Aqui elas são chamadas na
+# forma analisar_* por um CalculoWorker, fora da thread da interface, para a
+# janela continuar respondendo durante cálculos longos.
 
 
 # ===================================================================
 # PARTE 2: CLASSE DA APLICAÇÃO PYQT
 # ===================================================================
 
-class MplCanvas(FigureCanvas):
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = fig.add_subplot(111)
-        super(MplCanvas, self).__init__(fig)
+# matplotlib só é importado quando o primeiro gráfico é desenhado (ou pela
+# pré-carga em segundo plano), para não atrasar a abertura da janela
+MODULOS_GRAFICO = ("matplotlib.figure", "matplotlib.backends.backend_qtagg")
+
+
+def criar_mpl_canvas(parent=None, width=5, height=4, dpi=100):
+    import matplotlib
+    matplotlib.use('QtAgg')
+    from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(width, height), dpi=dpi)
+    canvas = FigureCanvas(fig)
+    canvas.setParent(parent)
+    canvas.axes = fig.add_subplot(111)
+    return canvas
+
+
+# Cálculos mais rápidos que isso terminam sem a barra de progresso aparecer
+ATRASO_PROGRESSO_MS = 150
+
+# Limite de quadros por segundo da regressão ao vivo; sem pontos novos, nada é redesenhado
+QUADROS_POR_SEGUNDO = 30
+
+
+class SinaisCalculo(QObject):
+    # QRunnable não é um QObject: os sinais do worker ficam neste objeto, criado
+    # na thread da interface, e chegam à janela pela fila de eventos
+    progresso = Signal(int, str)
+    concluido = Signal(int, object, str)
+    falhou = Signal(int, str)
+
+
+class CalculoWorker(QRunnable):
+    """
+    Executa uma função analisar_* em uma thread do QThreadPool e emite o
+    resultado já formatado. `geracao` identifica o cálculo: a janela ignora os
+    sinais de qualquer cálculo que não seja o atual.
+    """
+
+    def __init__(self, geracao, funcao, *args):
+        super().__init__()
+        self.geracao = geracao
+        self.funcao = funcao
+        self.args = args
+        self.evento_cancelar = threading.Event()
+        self.sinais = SinaisCalculo()
+
+    @property
+    def cancelado(self):
+        return self.evento_cancelar.is_set()
+
+    def cancelar(self):
+        # Python não interrompe uma thread: as análises que aceitam `cancelar`
+        # (arquivos e bootstrap) param no próximo bloco e liberam a thread; as
+        # demais vão até o fim e o resultado é descartado
+        self.evento_cancelar.set()
+
+    def run(self):
+        if self.cancelado:
+            return
+        self.sinais.progresso.emit(self.geracao, "Calculando...")
+        kwargs = {}
+        if "cancelar" in inspect.signature(self.funcao).parameters:
+            kwargs["cancelar"] = self.evento_cancelar
+        try:
+            resultado = self.funcao(*self.args, **kwargs)
+            if self.cancelado:
+                return
+            self.sinais.progresso.emit(self.geracao, "Formatando resultados...")
+            texto = resultado.texto()
+        except CalculoCancelado:
+            return
+        except Exception as e:
+            self.sinais.falhou.emit(self.geracao, mensagem_de_erro(e))
+            return
+        if not self.cancelado:
+            self.sinais.concluido.emit(self.geracao, resultado, texto)
 
 
 class StatsCalcWindow(QMainWindow):
@@ -240,11 +154,34 @@ class StatsCalcWindow(QMainWindow):
         self.results_text.setPlaceholderText("Os resultados aparecerão aqui...")
         # REMOVIDA a linha self.results_text.setFixedHeight(150)
 
-        self.plot_canvas = MplCanvas(self, width=5, height=4, dpi=100)
-        self.plot_canvas.setVisible(False)
+        # O gráfico é criado no primeiro uso (ver get_plot_canvas)
+        self.plot_canvas = None
+        self.grafico = None
+        self.bottom_layout = bottom_layout
 
+        bottom_layout.addWidget(self.create_progress_bar())
         bottom_layout.addWidget(self.results_text)
-        bottom_layout.addWidget(self.plot_canvas)
+
+        # Os cálculos rodam fora da thread da interface (ver executar_calculo).
+        # Duas threads: um cálculo descartado que ainda não terminou não atrasa o novo
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self.calculo = None
+        self.geracao = 0
+        self.ao_concluir = None
+        self.inicio_calculo = 0.0
+        self.etapa = ""
+        self.timer_progresso = QTimer(self)
+        self.timer_progresso.setInterval(100)
+        self.timer_progresso.timeout.connect(self.atualizar_progresso)
+        # Um cálculo descartado e o atual não podem alterar self.regressao ao mesmo tempo
+        self._trava_regressao = threading.Lock()
+
+        # Regressão ao vivo (ver iniciar_ao_vivo)
+        self.ao_vivo = None
+        self.timer_ao_vivo = QTimer(self)
+        self.timer_ao_vivo.setInterval(1000 // QUADROS_POR_SEGUNDO)
+        self.timer_ao_vivo.timeout.connect(self.quadro_ao_vivo)
 
         # 4. Adicionar a área de inputs e o contêiner de baixo ao splitter
         main_splitter.addWidget(self.input_stack)
@@ -269,10 +206,100 @@ class StatsCalcWindow(QMainWindow):
         self.show_page(0)
 
     def show_page(self, index):
+        self.cancelar_calculo(silencioso=True)
+        self.parar_ao_vivo()
         self.input_stack.setCurrentIndex(index)
-        self.plot_canvas.setVisible(False)
+        self.hide_plot()
         self.results_text.clear()
 
+    def get_plot_canvas(self):
+        if self.plot_canvas is None:
+            self.plot_canvas = criar_mpl_canvas(self, width=5, height=4, dpi=100)
+            self.bottom_layout.addWidget(self.plot_canvas)
+        return self.plot_canvas
+
+    def hide_plot(self):
+        if self.plot_canvas is not None:
+            self.plot_canvas.setVisible(False)
+
+    def create_progress_bar(self):
+        self.progress_widget = QWidget()
+        progress_layout = QHBoxLayout(self.progress_widget)
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # indeterminada: os cálculos não informam o percentual
+        self.progress_bar.setTextVisible(False)
+        self.progress_label = QLabel()
+        self.btn_cancelar = QPushButton("Cancelar")
+        self.btn_cancelar.clicked.connect(lambda: self.cancelar_calculo())
+        progress_layout.addWidget(self.progress_bar, 1)
+        progress_layout.addWidget(self.progress_label)
+        progress_layout.addWidget(self.btn_cancelar)
+        self.progress_widget.setVisible(False)
+        return self.progress_widget
+
+    def executar_calculo(self, funcao, *args, ao_concluir=None):
+        """
+        Roda funcao(*args) (uma analisar_*) em um CalculoWorker. O texto vai
+        para a área de resultados e, se houver, ao_concluir(resultado) roda na
+        thread da interface. Um cálculo anterior ainda em andamento é descartado.
+        """
+        self.cancelar_calculo(silencioso=True)
+        self.parar_ao_vivo()
+        self.geracao += 1
+        worker = CalculoWorker(self.geracao, funcao, *args)
+        worker.sinais.progresso.connect(self.on_calculo_progresso)
+        worker.sinais.concluido.connect(self.on_calculo_concluido)
+        worker.sinais.falhou.connect(self.on_calculo_falhou)
+        self.calculo = worker
+        self.ao_concluir = ao_concluir
+        self.inicio_calculo = time.perf_counter()
+        self.etapa = "Calculando..."
+        self.timer_progresso.start()
+        self.pool.start(worker)
+
+    def cancelar_calculo(self, silencioso=False):
+        if self.calculo is None:
+            return
+        self.calculo.cancelar()
+        self.pool.clear()  # remove da fila os cálculos que ainda não começaram
+        self.geracao += 1
+        self.encerrar_calculo()
+        if not silencioso:
+            self.results_text.setText("Cálculo cancelado.")
+
+    def encerrar_calculo(self):
+        self.calculo = None
+        self.ao_concluir = None
+        self.timer_progresso.stop()
+        self.progress_widget.setVisible(False)
+
+    def atualizar_progresso(self):
+        decorrido = time.perf_counter() - self.inicio_calculo
+        if decorrido * 1e3 >= ATRASO_PROGRESSO_MS:
+            self.progress_label.setText(f"{self.etapa} {decorrido:.1f} s")
+            self.progress_widget.setVisible(True)
+
+    def on_calculo_progresso(self, geracao, etapa):
+        if geracao == self.geracao:
+            self.etapa = etapa
+
+    def on_calculo_concluido(self, geracao, resultado, texto):
+        if geracao != self.geracao or self.calculo is None:
+            return  # resultado de um cálculo descartado
+        ao_concluir = self.ao_concluir
+        self.encerrar_calculo()
+        self.results_text.setText(texto)
+        if ao_concluir is not None:
+            ao_concluir(resultado)
+
+    def on_calculo_falhou(self, geracao, mensagem):
+        if geracao != self.geracao or self.calculo is None:
+            return
+        self.encerrar_calculo()
+        self.results_text.setText(mensagem)
+        self.hide_plot()
+
     def create_divider(self):
         divider = QFrame();
         divider.setFrameShape(QFrame.Shape.HLine);
@@ -320,13 +347,25 @@ class StatsCalcWindow(QMainWindow):
         page, layout = self.create_page_layout("<b>Análise Descritiva:</b> Insira os dados separados por vírgula.")
         desc_input = QTextEdit();
         desc_input.setPlaceholderText("Ex: 10, 15, 20, 25, 30")
+        bootstrap_check = QCheckBox("Intervalos de confiança (bootstrap 95%)")
         btn = QPushButton("Calcular Estatísticas")
-        btn.clicked.connect(
-            lambda: self.results_text.setText(calcular_estatisticas_descritivas(desc_input.toPlainText())))
+        btn.clicked.connect(lambda: self.executar_calculo(analisar_estatisticas_descritivas, desc_input.toPlainText(),
+                                                          bootstrap_check.isChecked()))
+        btn_arquivo = QPushButton("Analisar Arquivo (CSV/TXT)...")
+        btn_arquivo.clicked.connect(self.run_desc_stats_file)
         layout.addWidget(desc_input);
+        layout.addWidget(bootstrap_check);
         layout.addWidget(btn);
+        layout.addWidget(btn_arquivo);
         return page
 
+    def run_desc_stats_file(self):
+        # Arquivos grandes são lidos em blocos, sem passar pelo campo de texto
+        caminho, _ = QFileDialog.getOpenFileName(self, "Abrir arquivo de dados", "",
+                                                 "Dados (*.csv *.txt);;Todos os arquivos (*)")
+        if caminho:
+            self.executar_calculo(analisar_estatisticas_descritivas_arquivo, caminho)
+
     def create_regression_page(self):
         page, layout = self.create_page_layout("<b>Regressão Linear:</b> Insira os dados de X e Y.")
         self.reg_x_input = QLineEdit();
@@ -334,35 +373,131 @@ class StatsCalcWindow(QMainWindow):
         self.reg_y_input = QLineEdit();
         self.reg_y_input.setPlaceholderText("Dados de Y, separados por vírgula")
         btn = QPushButton("Calcular Regressão e Gerar Gráfico")
+        self.regressao = RegressaoIncremental()
         btn.clicked.connect(self.run_linear_regression)
         layout.addWidget(QLabel("Valores de X:"));
         layout.addWidget(self.reg_x_input)
+        btn_arquivo = QPushButton("Regressão Múltipla de Arquivo (CSV/TXT)...")
+        btn_arquivo.clicked.connect(self.run_multiple_regression_file)
         layout.addWidget(QLabel("Valores de Y:"));
         layout.addWidget(self.reg_y_input)
         layout.addWidget(btn);
+        layout.addWidget(btn_arquivo);
+        # Ao vivo: pontos "x, y" chegando de um arquivo em crescimento ou de um socket local
+        live_layout = QHBoxLayout()
+        btn_live_file = QPushButton("Ao Vivo: Acompanhar Arquivo...")
+        btn_live_file.clicked.connect(self.run_live_file)
+        btn_live_socket = QPushButton("Ao Vivo: Receber por Socket")
+        btn_live_socket.clicked.connect(self.run_live_socket)
+        btn_live_stop = QPushButton("Parar")
+        btn_live_stop.clicked.connect(self.parar_ao_vivo)
+        live_layout.addWidget(btn_live_file)
+        live_layout.addWidget(btn_live_socket)
+        live_layout.addWidget(btn_live_stop)
+        layout.addLayout(live_layout)
         return page
 
+    def run_live_file(self):
+        caminho, _ = QFileDialog.getOpenFileName(self, "Acompanhar arquivo de dados", "",
+                                                 "Dados (*.csv *.txt);;Todos os arquivos (*)")
+        if caminho:
+            self.iniciar_ao_vivo(SeguirArquivo(caminho))
+
+    def run_live_socket(self):
+        try:
+            fonte = ReceberSocket()
+        except OSError as e:
+            self.results_text.setText(f"Erro ao abrir o socket: {e}")
+            return
+        self.iniciar_ao_vivo(fonte)
+        host, porta = fonte.endereco
+        self.results_text.setText(f"Aguardando pontos em {host}:{porta} (uma linha \"x, y\" por ponto)...")
+
+    def iniciar_ao_vivo(self, fonte):
+        """
+        Lê os pontos de `fonte` em uma thread e, a cada quadro (no máximo
+        QUADROS_POR_SEGUNDO por segundo), atualiza o ajuste e o gráfico só com
+        os pontos novos.
+        """
+        self.cancelar_calculo(silencioso=True)
+        self.parar_ao_vivo()
+        canvas = self.get_plot_canvas()
+        canvas.axes.clear()
+        self.grafico = None
+        canvas.setVisible(True)
+        buffer, parar = BufferPontos(), threading.Event()
+        thread = threading.Thread(target=fonte.executar, args=(buffer, parar), name="ao-vivo", daemon=True)
+        self.ao_vivo = {"fonte": fonte, "buffer": buffer, "parar": parar, "regressao": RegressaoAoVivo(),
+                        "grafico": GraficoAoVivo(canvas, canvas.axes)}
+        thread.start()
+        self.results_text.setText(f"Regressão ao vivo ({fonte.descricao()}): aguardando pontos...")
+        canvas.draw()
+        self.timer_ao_vivo.start()
+
+    def parar_ao_vivo(self):
+        if self.ao_vivo is None:
+            return
+        self.timer_ao_vivo.stop()
+        self.ao_vivo["parar"].set()
+        self.ao_vivo["grafico"].encerrar()
+        self.ao_vivo = None
+
+    def quadro_ao_vivo(self):
+        ao_vivo = self.ao_vivo
+        buffer, regressao = ao_vivo["buffer"], ao_vivo["regressao"]
+        if buffer.erro is not None:
+            self.results_text.setText(mensagem_de_erro(buffer.erro))
+            self.parar_ao_vivo()
+            return
+        pontos = buffer.retirar()
+        if not len(pontos):
+            return
+        regressao.adicionar(pontos)
+        texto = f"Regressão ao vivo ({ao_vivo['fonte'].descricao()}): {regressao.n} pontos recebidos"
+        if buffer.ignoradas:
+            texto += f", {buffer.ignoradas} linhas ignoradas"
+        try:
+            resultado = regressao.resultado()
+        except ValueError as e:
+            self.results_text.setText(f"{texto}\n  Aguardando mais dados: {e}")
+            ao_vivo["grafico"].atualizar(regressao.visiveis(), [], [], regressao.limites)
+            return
+        self.results_text.setText(f"{texto}\n{resultado.texto()}")
+        ao_vivo["grafico"].atualizar(regressao.visiveis(), *regressao.reta(resultado), regressao.limites)
+
+    def closeEvent(self, event):
+        self.parar_ao_vivo()
+        super().closeEvent(event)
+
+    def run_multiple_regression_file(self):
+        # Uma observação por linha; a última coluna é a variável resposta
+        caminho, _ = QFileDialog.getOpenFileName(self, "Abrir arquivo de dados", "",
+                                                 "Dados (*.csv *.txt);;Todos os arquivos (*)")
+        if caminho:
+            self.hide_plot()
+            self.executar_calculo(analisar_regressao_multipla_arquivo, caminho)
+
     def run_linear_regression(self):
-        result = calcular_regressao_linear(self.reg_x_input.text(), self.reg_y_input.text())
-        if "error" in result:
-            self.results_text.setText(result["error"])
-            self.plot_canvas.setVisible(False)
-        else:
-            self.results_text.setText(result["text"])
-            self.update_regression_plot(result["plot_data"])
-            self.plot_canvas.setVisible(True)
-
-    def update_regression_plot(self, plot_data):
-        self.plot_canvas.axes.clear()
-        self.plot_canvas.axes.scatter(plot_data['x_data'], plot_data['y_data'], label='Dados Originais')
-        self.plot_canvas.axes.plot(plot_data['line_x'], plot_data['line_y'], color='red', linewidth=2,
-                                   label='Reta de Regressão')
-        self.plot_canvas.axes.set_title('Gráfico de Dispersão e Reta de Regressão')
-        self.plot_canvas.axes.set_xlabel('Eixo X')
-        self.plot_canvas.axes.set_ylabel('Eixo Y')
-        self.plot_canvas.axes.legend()
-        self.plot_canvas.axes.grid(True)
-        self.plot_canvas.draw()
+        self.executar_calculo(self.regressao_linear, self.reg_x_input.text(), self.reg_y_input.text(),
+                              ao_concluir=self.show_regression_plot)
+
+    def regressao_linear(self, x_str, y_str):
+        # Roda na thread do cálculo
+        with self._trava_regressao:
+            return analisar_regressao_linear(x_str, y_str, self.regressao)
+
+    def show_regression_plot(self, resultado):
+        self.update_regression_plot(resultado)
+        self.get_plot_canvas().setVisible(True)
+
+    def update_regression_plot(self, resultado):
+        # Os artistas são criados uma vez; depois só os dados mudam (ver stats_core.grafico)
+        canvas = self.get_plot_canvas()
+        if self.grafico is None:
+            canvas.axes.clear()  # pode ter sido usado pela regressão ao vivo
+            self.grafico = GraficoRegressao(canvas.axes)
+        self.grafico.atualizar(resultado.x, resultado.y, *resultado.reta())
+        canvas.draw_idle()
 
     def create_bayes_page(self):
         page, layout = self.create_page_layout("<b>Teorema de Bayes:</b> Insira as probabilidades (0 a 1).")
@@ -373,8 +508,8 @@ class StatsCalcWindow(QMainWindow):
         bayes_pbna_input = QLineEdit();
         bayes_pbna_input.setPlaceholderText("Ex: 0.05")
         btn = QPushButton("Calcular P(A|B)")
-        btn.clicked.connect(lambda: self.results_text.setText(
-            calcular_teorema_bayes(bayes_pa_input.text(), bayes_pba_input.text(), bayes_pbna_input.text())))
+        btn.clicked.connect(lambda: self.executar_calculo(
+            analisar_teorema_bayes, bayes_pa_input.text(), bayes_pba_input.text(), bayes_pbna_input.text()))
         layout.addWidget(QLabel("Probabilidade de A  - P(A):"));
         layout.addWidget(bayes_pa_input)
         layout.addWidget(QLabel("Probabilidade de B dado A  - P(B|A):"));
@@ -393,8 +528,8 @@ class StatsCalcWindow(QMainWindow):
         binom_k = QLineEdit();
         binom_k.setPlaceholderText("Número inteiro de sucessos desejados")
         btn = QPushButton("Calcular Probabilidade Binomial")
-        btn.clicked.connect(lambda: self.results_text.setText(
-            calcular_distribuicao_binomial(binom_n.text(), binom_p.text(), binom_k.text())))
+        btn.clicked.connect(lambda: self.executar_calculo(
+            analisar_distribuicao_binomial, binom_n.text(), binom_p.text(), binom_k.text()))
         layout.addWidget(QLabel("n (tentativas):"));
         layout.addWidget(binom_n)
         layout.addWidget(QLabel("p (probabilidade):"));
@@ -412,7 +547,7 @@ class StatsCalcWindow(QMainWindow):
         poisson_k.setPlaceholderText("Número de eventos desejados")
         btn = QPushButton("Calcular Probabilidade de Poisson")
         btn.clicked.connect(
-            lambda: self.results_text.setText(calcular_distribuicao_poisson(poisson_lambda.text(), poisson_k.text())))
+            lambda: self.executar_calculo(analisar_distribuicao_poisson, poisson_lambda.text(), poisson_k.text()))
         layout.addWidget(QLabel("Lambda (λ) - Taxa Média:"));
         layout.addWidget(poisson_lambda)
         layout.addWidget(QLabel("k - Número de Eventos:"));
@@ -426,11 +561,24 @@ class StatsCalcWindow(QMainWindow):
         anova_input = QTextEdit();
         anova_input.setPlaceholderText("Ex: 10,12,11; 15,14,16; 9,10,8")
         btn = QPushButton("Calcular ANOVA")
-        btn.clicked.connect(lambda: self.results_text.setText(calcular_anova(anova_input.toPlainText())))
+        btn.clicked.connect(lambda: self.executar_calculo(analisar_anova, anova_input.toPlainText()))
+        # O mesmo campo aceita resumos por grupo: n, média, desvio padrão
+        btn_resumos = QPushButton("Calcular a partir de Resumos (n, média, dp)")
+        btn_resumos.clicked.connect(lambda: self.executar_calculo(analisar_anova_resumos, anova_input.toPlainText()))
+        btn_arquivo = QPushButton("ANOVA de Arquivo (grupo, valor)...")
+        btn_arquivo.clicked.connect(self.run_anova_file)
         layout.addWidget(anova_input);
         layout.addWidget(btn);
+        layout.addWidget(btn_resumos);
+        layout.addWidget(btn_arquivo);
         return page
 
+    def run_anova_file(self):
+        caminho, _ = QFileDialog.getOpenFileName(self, "Abrir arquivo de dados", "",
+                                                 "Dados (*.csv *.txt);;Todos os arquivos (*)")
+        if caminho:
+            self.executar_calculo(analisar_anova_arquivo, caminho)
+
 
 # ===================================================================
 # PARTE 3: INICIALIZAÇÃO DA APLICAÇÃO
@@ -458,4 +606,6 @@ if __name__ == "__main__":
 
     window = StatsCalcWindow()
     window.show()
+    # SciPy e matplotlib são importados em segundo plano com a janela já visível
+    precarregar(MODULOS_PESADOS + MODULOS_GRAFICO)
     sys.exit(app.exec())
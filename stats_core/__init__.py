@@ -0,0 +1,43 @@
+"""
+Núcleo de cálculo da Calculadora Estatística e Probabilística.
+
+Este pacote não depende de Flet nem de Qt e pode ser usado diretamente por
+scripts e processos em lote. As análises das interfaces ficam em
+`stats_core.calculadora`: analisar_* devolve resultados estruturados
+(`stats_core.resultados`) e calcular_*, o texto formatado. SciPy só é
+importado no primeiro cálculo que o usa (ou por `precarregar`), o que mantém
+rápida a abertura das interfaces.
+"""
+from stats_core.parsing import ParseError, parse_numeros, parse_grupos
+from stats_core.descriptive import Momentos, descrever
+from stats_core.mode import MisraGries, modas
+from stats_core.quantiles import KLL
+from stats_core.binomial import binom_cdf, binom_logpmf, binom_pmf, binom_sf, tabela_binomial
+from stats_core.poisson import CachePoisson, cache_poisson, poisson_cdf, poisson_pmf, poisson_ppf, poisson_sf
+from stats_core.bayes import atualizar_bayes, bayes_binario
+from stats_core.anova import AcumuladorAnova, anova, anova_arquivo, anova_resumos
+from stats_core.resampling import bootstrap_descritivo, intervalo_p_valor, permutacao_anova, permutacao_regressao
+from stats_core.precarga import MODULOS_PESADOS, precarregar
+from stats_core.cache import (CacheLRU, cache_parse, cache_resultados, estatisticas_cache, limpar_caches, memoizar,
+                              parse_grupos_cache, parse_numeros_cache)
+from stats_core.regression import (AcumuladorMultiplo, AcumuladorRegressao, RegressaoIncremental,
+                                  regressao_arquivo, regressao_lote, regressao_multipla)
+from stats_core.streaming import (ResumoFluxo, contar_colunas, descrever_arquivo, detectar_cabecalho, ler_blocos,
+                                  ler_linhas, ler_trechos, resumir_arquivo)
+from stats_core.resultados import (Resultado, ResultadoAnova, ResultadoBayes, ResultadoBayesDireto, ResultadoBinomial,
+                                   ResultadoDescritivo, ResultadoDescritivoArquivo, ResultadoPoisson,
+                                   ResultadoRegressao, ResultadoRegressaoMultipla, json_finito)
+from stats_core.formatacao import formatar
+from stats_core.grafico import (MAX_PONTOS_GRAFICO, GraficoAoVivo, GraficoRegressao, amostrar_pontos, densidade_2d,
+                               pontos_finitos)
+from stats_core.ao_vivo import BufferPontos, ReceberSocket, RegressaoAoVivo, SeguirArquivo, pontos_de_linhas
+from stats_core.calculadora import (analisar_anova, analisar_anova_arquivo, analisar_anova_resumos,
+                                    analisar_distribuicao_binomial, analisar_distribuicao_poisson,
+                                    analisar_estatisticas_descritivas, analisar_estatisticas_descritivas_arquivo,
+                                    analisar_regressao_linear, analisar_regressao_multipla_arquivo,
+                                    analisar_teorema_bayes, analisar_teorema_bayes_pb, calcular_anova,
+                                    calcular_anova_arquivo, calcular_anova_resumos, calcular_distribuicao_binomial,
+                                    calcular_distribuicao_poisson, calcular_estatisticas_descritivas,
+                                    calcular_estatisticas_descritivas_arquivo, calcular_regressao_linear,
+                                    calcular_regressao_multipla_arquivo, calcular_teorema_bayes,
+                                    calcular_teorema_bayes_pb, mensagem_de_erro)
@@ -0,0 +1,285 @@
+"""
+ANOVA de um fator a partir de estatísticas suficientes.
+
+Para cada grupo bastam n, média e M2 (soma dos quadrados dos desvios em torno
+da média, a forma centrada de Σx e Σx²); a memória cresce com o número de
+grupos e não com o número de observações. Os grupos de um bloco são
+agregados (rótulos fatorados e np.bincount) e unidos aos acumulados pela
+fórmula de Chan et al., o que permite ler arquivos em formato longo (grupo,
+valor) em blocos e em vários processos. Resumos já prontos (n, média, desvio padrão)
+também podem ser usados diretamente. F e valor-p coincidem com os de
+scipy.stats.f_oneway.
+"""
+import math
+import os
+
+import numpy as np
+
+from stats_core.parallel import FIM_DE_LINHA, dividir_arquivo, mapear, numero_de_processos, verificar_cancelamento
+from stats_core.parsing import ParseError, valores_por_linha
+from stats_core.streaming import LIMIAR_PARALELO_BYTES, TAMANHO_BLOCO_BYTES, ler_trechos
+
+
+class AcumuladorAnova:
+    """Contagem, média e M2 de cada grupo, indexados pelo rótulo do grupo."""
+
+    __slots__ = ("rotulos", "_indices", "n", "media", "m2")
+
+    def __init__(self):
+        self.rotulos = []
+        self._indices = {}
+        self.n = np.zeros(0, dtype=np.int64)
+        self.media = np.zeros(0)
+        self.m2 = np.zeros(0)
+
+    def _indices_de(self, rotulos):
+        novos = [r for r in rotulos if r not in self._indices]
+        if novos:
+            for r in novos:
+                self._indices[r] = len(self.rotulos)
+                self.rotulos.append(r)
+            extra = len(novos)
+            self.n = np.concatenate((self.n, np.zeros(extra, dtype=np.int64)))
+            self.media = np.concatenate((self.media, np.zeros(extra)))
+            self.m2 = np.concatenate((self.m2, np.zeros(extra)))
+        return np.fromiter((self._indices[r] for r in rotulos), dtype=np.int64, count=len(rotulos))
+
+    def _incorporar(self, rotulos, n, media, m2):
+        # Chan et al. para vários grupos de uma vez; rótulos sem repetição
+        indices = self._indices_de(rotulos)
+        n_atual = self.n[indices]
+        total = n_atual + n
+        delta = media - self.media[indices]
+        self.media[indices] += delta * n / total
+        self.m2[indices] += m2 + delta * delta * n_atual * n / total
+        self.n[indices] = total
+        return self
+
+    def atualizar(self, rotulos, valores):
+        """Acumula observações em formato longo: `rotulos[i]` é o grupo de `valores[i]`."""
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        if len(rotulos) != valores.size:
+            raise ValueError("Rótulos e valores devem ter o mesmo tamanho.")
+        if valores.size == 0:
+            return self
+        if isinstance(rotulos, np.ndarray) and rotulos.dtype != object:
+            unicos, inverso = np.unique(rotulos, return_inverse=True)
+            unicos, inverso = unicos.tolist(), inverso.ravel()
+        else:
+            # Listas de strings (leitura de arquivos): fatorar com um dicionário
+            # é mais rápido que converter para array e ordenar
+            codigos = {}
+            inverso = np.fromiter((codigos.setdefault(r, len(codigos)) for r in rotulos),
+                                  dtype=np.int64, count=valores.size)
+            unicos = list(codigos)
+        n = np.bincount(inverso, minlength=len(unicos))
+        media = np.bincount(inverso, weights=valores, minlength=len(unicos)) / n
+        desvios = valores - media[inverso]
+        m2 = np.bincount(inverso, weights=desvios * desvios, minlength=len(unicos))
+        return self._incorporar(unicos, n, media, m2)
+
+    def adicionar_grupo(self, rotulo, valores):
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        if valores.size == 0:
+            return self
+        media = valores.mean()
+        desvios = valores - media
+        return self._incorporar([rotulo], np.array([valores.size]), np.array([media]),
+                                np.array([desvios @ desvios]))
+
+    def adicionar_resumos(self, rotulos, n, medias, desvios, ddof=1):
+        """Acumula grupos dados por (n, média, desvio padrão com `ddof` graus de liberdade)."""
+        n = np.asarray(n, dtype=np.int64).ravel()
+        medias = np.asarray(medias, dtype=np.float64).ravel()
+        desvios = np.asarray(desvios, dtype=np.float64).ravel()
+        if not n.size == medias.size == desvios.size == len(rotulos):
+            raise ValueError("Informe n, média e desvio padrão para cada grupo.")
+        if np.any(n <= ddof) or np.any(desvios < 0):
+            raise ValueError(f"Cada grupo deve ter n > {ddof} e desvio padrão >= 0.")
+        return self._incorporar(list(rotulos), n, medias, desvios ** 2 * (n - ddof))
+
+    def combinar(self, outro):
+        if outro.rotulos:
+            self._incorporar(outro.rotulos, outro.n, outro.media, outro.m2)
+        return self
+
+    def resultado(self):
+        """
+        Tabela da ANOVA: somas de quadrados, graus de liberdade, quadrados
+        médios, F e valor-p, além de n, média e desvio padrão (ddof=1) por grupo.
+        """
+        from scipy.special import fdtrc
+        k = len(self.rotulos)
+        if k < 2:
+            raise ValueError("ANOVA requer pelo menos dois grupos.")
+        total = int(self.n.sum())
+        media_geral = float(self.n @ self.media) / total
+        sq_entre = float(self.n @ (self.media - media_geral) ** 2)
+        sq_dentro = float(self.m2.sum())
+        gl_entre, gl_dentro = k - 1, total - k
+        with np.errstate(divide="ignore", invalid="ignore"):
+            qm_entre = np.float64(sq_entre) / gl_entre
+            qm_dentro = np.float64(sq_dentro) / gl_dentro if gl_dentro > 0 else np.float64(math.nan)
+            f = qm_entre / qm_dentro
+            desvios = np.sqrt(self.m2 / (self.n - 1))
+        return {
+            "grupos": k,
+            "n": total,
+            "f": float(f),
+            "p_valor": float(fdtrc(gl_entre, gl_dentro, f)) if gl_dentro > 0 else math.nan,
+            "gl_entre": gl_entre,
+            "gl_dentro": gl_dentro,
+            "sq_entre": sq_entre,
+            "sq_dentro": sq_dentro,
+            "qm_entre": float(qm_entre),
+            "qm_dentro": float(qm_dentro),
+            "rotulos": list(self.rotulos),
+            "n_grupos": self.n.copy(),
+            "medias": self.media.copy(),
+            "desvios": desvios,
+        }
+
+
+def anova(grupos):
+    """ANOVA de uma lista de vetores, um por grupo (mesmo resultado de f_oneway(*grupos))."""
+    acumulador = AcumuladorAnova()
+    for i, valores in enumerate(grupos):
+        acumulador.adicionar_grupo(f"Grupo {i + 1}", valores)
+    return acumulador.resultado()
+
+
+def anova_resumos(n, medias, desvios, rotulos=None, ddof=1):
+    """ANOVA a partir do tamanho, da média e do desvio padrão de cada grupo."""
+    if rotulos is None:
+        rotulos = [f"Grupo {i + 1}" for i in range(np.size(n))]
+    return AcumuladorAnova().adicionar_resumos(rotulos, n, medias, desvios, ddof).resultado()
+
+
+def _delimitador(linha):
+    for candidato in (";", "\t", ","):
+        if candidato in linha:
+            return candidato
+    return None
+
+
+def _campos(linha, delimitador):
+    return [c.strip().strip('"') for c in linha.split(delimitador)] if delimitador else linha.split()
+
+
+def _ler_pares_linha_a_linha(texto, delimitador, colunas, coluna_grupo, coluna_valor, n_obs, deslocamento):
+    # Caminho lento: linhas vazias, número de campos irregular ou valor inválido
+    rotulos, valores = [], []
+    posicao = deslocamento
+    for linha in texto.splitlines(keepends=True):
+        campos = _campos(linha, delimitador)
+        if campos and any(campos):
+            if len(campos) != colunas:
+                raise ValueError(f"A linha '{linha.strip()[:60]}' tem {len(campos)} campos; esperados {colunas}.")
+            token = campos[coluna_valor]
+            try:
+                valores.append(float(token))
+            except ValueError:
+                raise ParseError(token, n_obs + len(valores), posicao + max(linha.find(token), 0)) from None
+            rotulos.append(campos[coluna_grupo])
+        posicao += len(linha)
+    return rotulos, np.array(valores, dtype=np.float64)
+
+
+def _delimitadores_por_linha(texto, delimitador):
+    # Ocorrências de `delimitador` (um caractere ASCII) em cada linha, de uma vez com o NumPy
+    dados = np.frombuffer(texto.encode("utf-8"), dtype=np.uint8)
+    fins_de_linha = np.append(np.flatnonzero(dados == 10), dados.size)
+    return np.diff(np.searchsorted(np.flatnonzero(dados == ord(delimitador)), fins_de_linha), prepend=0)
+
+
+def _ler_pares(texto, delimitador, colunas, coluna_grupo, coluna_valor, n_obs, deslocamento):
+    # Caminho rápido: o bloco inteiro vira uma lista de campos com um único
+    # split. O número de campos é conferido linha a linha: só o total poderia
+    # fechar com linhas irregulares ("A,1", "B,2,C" e "3")
+    if delimitador:
+        texto_sem_fim = texto.rstrip("\r\n")
+        campos = texto_sem_fim.replace("\r", "").replace(delimitador, "\n").split("\n")
+        regular = ("" not in campos
+                   and bool(np.all(_delimitadores_por_linha(texto_sem_fim, delimitador) == colunas - 1)))
+    else:
+        campos = texto.split()
+        por_linha = valores_por_linha(texto)
+        # Sem "," e ";", os separadores de valores_por_linha são espaços em branco, como em split()
+        regular = (len(campos) == colunas * np.count_nonzero(por_linha) and "," not in texto and ";" not in texto
+                   and bool(np.all((por_linha == colunas) | (por_linha == 0))))
+    if regular:
+        try:
+            valores = np.array(campos[coluna_valor::colunas], dtype=np.float64)
+            rotulos = campos[coluna_grupo::colunas]
+            if delimitador and ('"' in texto or " " in texto):
+                rotulos = [r.strip().strip('"') for r in rotulos]
+            return rotulos, valores
+        except ValueError:
+            pass
+    return _ler_pares_linha_a_linha(texto, delimitador, colunas, coluna_grupo, coluna_valor, n_obs, deslocamento)
+
+
+def _acumular_intervalo(caminho, inicio, fim, tamanho_bloco, delimitador, colunas, coluna_grupo, coluna_valor,
+                        cancelar=None):
+    acumulador = AcumuladorAnova()
+    n_obs = 0
+    try:
+        for texto, deslocamento in ler_trechos(caminho, tamanho_bloco, 0, inicio, fim,
+                                               lambda dados: dados.rfind(b"\n")):
+            verificar_cancelamento(cancelar)
+            rotulos, valores = _ler_pares(texto, delimitador, colunas, coluna_grupo, coluna_valor,
+                                          n_obs, deslocamento)
+            acumulador.atualizar(rotulos, valores)
+            n_obs += valores.size
+    except (ParseError, ValueError) as e:
+        # Devolvido, e não lançado, como em streaming._resumir_intervalo_ou_erro
+        return e
+    return acumulador
+
+
+def anova_arquivo(caminho, coluna_grupo=0, coluna_valor=1, tamanho_bloco=TAMANHO_BLOCO_BYTES,
+                  pular_linhas=None, processos=1, cancelar=None):
+    """
+    ANOVA de um arquivo em formato longo, com uma observação por linha
+    (rótulo do grupo e valor), lido em blocos. O delimitador (';', tabulação,
+    ',' ou espaços) é detectado na primeira linha; com `pular_linhas=None` a
+    primeira linha é tratada como cabeçalho se o campo de valor não for
+    numérico. `processos` e `cancelar` seguem `descrever_arquivo`.
+    """
+    with open(caminho, "rb") as arquivo:
+        primeira = arquivo.readline().decode("utf-8")
+    delimitador = _delimitador(primeira)
+    campos = _campos(primeira, delimitador)
+    colunas = len(campos)
+    if colunas < 2:
+        raise ValueError("O arquivo deve ter pelo menos duas colunas (grupo e valor).")
+    if pular_linhas is None:
+        try:
+            float(campos[coluna_valor])
+            pular_linhas = 0
+        except ValueError:
+            pular_linhas = 1
+
+    if processos is None:
+        processos = 1 if os.path.getsize(caminho) < LIMIAR_PARALELO_BYTES else numero_de_processos()
+    with open(caminho, "rb") as arquivo:
+        for _ in range(pular_linhas):
+            arquivo.readline()
+        inicio = arquivo.tell()
+    if processos == 1:
+        # No próprio processo o evento vai até o laço de blocos (entre processos, mapear o verifica)
+        parciais = [_acumular_intervalo(caminho, inicio, None, tamanho_bloco, delimitador, colunas, coluna_grupo,
+                                        coluna_valor, cancelar)]
+    else:
+        intervalos = dividir_arquivo(caminho, 4 * processos, inicio, separadores=FIM_DE_LINHA)
+        parciais = mapear(_acumular_intervalo,
+                          [(caminho, a, b, tamanho_bloco, delimitador, colunas, coluna_grupo, coluna_valor)
+                           for a, b in intervalos], processos, cancelar)
+    acumulador = AcumuladorAnova()
+    for parcial in parciais:
+        if isinstance(parcial, ParseError):
+            raise ParseError(parcial.token, parcial.indice + int(acumulador.n.sum()), parcial.posicao)
+        if isinstance(parcial, Exception):
+            raise parcial
+        acumulador.combinar(parcial)
+    return acumulador.resultado()
@@ -0,0 +1,244 @@
+"""
+Regressão ao vivo: pontos (x, y) que chegam enquanto os dados são gerados.
+
+As fontes (SeguirArquivo, que acompanha um arquivo em crescimento como
+`tail -f`, e ReceberSocket, que aceita conexões TCP locais) rodam em uma
+thread e colocam os pontos de cada linha "x, y" completa em um BufferPontos.
+Quem desenha retira de tempos em tempos o que chegou e passa a
+RegressaoAoVivo, que atualiza o ajuste pelas somas acumuladas
+(AcumuladorRegressao) e guarda só os últimos `pontos_visiveis` pontos para o
+gráfico. O custo de cada atualização depende dos pontos novos e do tamanho da
+janela visível, não do total recebido.
+"""
+import os
+import threading
+
+import numpy as np
+
+from stats_core.parsing import ParseError, parse_numeros, valores_por_linha
+from stats_core.regression import AcumuladorRegressao
+from stats_core.resultados import ResultadoRegressao
+
+PONTOS_VISIVEIS = 5_000
+TAMANHO_LEITURA = 1 << 20
+# Espera entre leituras quando não há dados novos (e para notar o pedido de parada)
+INTERVALO_LEITURA = 0.05
+
+
+def pontos_de_linhas(dados):
+    """
+    Pontos (n × 2) das linhas "x, y" em `dados` (bytes com linhas completas)
+    e o número de linhas ignoradas (cabeçalho, linhas inválidas ou com outro
+    número de valores).
+    """
+    texto = dados.decode("utf-8", errors="replace")
+    linhas = [linha for linha in texto.splitlines() if linha.strip()]
+    if not linhas:
+        return np.empty((0, 2)), 0
+    # Todas as linhas com exatamente dois valores (conferido linha a linha: só o
+    # total poderia fechar com "1 2 3" e "4")
+    if np.count_nonzero(valores_por_linha(dados) == 2) == len(linhas):
+        try:
+            valores = parse_numeros(texto)
+            if valores.size == 2 * len(linhas):
+                return valores.reshape(-1, 2), 0
+        except ParseError:
+            pass
+    # Caminho lento, linha a linha, só quando há linhas fora do formato
+    pontos = []
+    for linha in linhas:
+        try:
+            valores = parse_numeros(linha)
+        except ParseError:
+            continue
+        if valores.size == 2:
+            pontos.append(valores)
+    return (np.array(pontos) if pontos else np.empty((0, 2))), len(linhas) - len(pontos)
+
+
+class _Linhas:
+    # Junta os pedaços lidos e entrega apenas linhas completas
+    __slots__ = ("resto",)
+
+    def __init__(self):
+        self.resto = b""
+
+    def completar(self, dados):
+        dados = self.resto + dados
+        corte = dados.rfind(b"\n") + 1
+        self.resto = dados[corte:]
+        return dados[:corte]
+
+    def final(self):
+        resto, self.resto = self.resto, b""
+        return resto
+
+
+class BufferPontos:
+    """Pontos recebidos por uma fonte e ainda não retirados, protegidos por uma trava."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._partes = []
+        self.ignoradas = 0
+        # Exceção que encerrou a fonte, se houver
+        self.erro = None
+
+    def adicionar_texto(self, dados):
+        pontos, ignoradas = pontos_de_linhas(dados)
+        with self._trava:
+            if len(pontos):
+                self._partes.append(pontos)
+            self.ignoradas += ignoradas
+
+    def retirar(self):
+        """Todos os pontos que chegaram desde a última chamada (n × 2)."""
+        with self._trava:
+            partes, self._partes = self._partes, []
+        if not partes:
+            return np.empty((0, 2))
+        return partes[0] if len(partes) == 1 else np.concatenate(partes)
+
+
+class SeguirArquivo:
+    """
+    Acompanha um arquivo de texto/CSV com um ponto "x, y" por linha, lendo as
+    linhas acrescentadas. Se o arquivo for truncado (reescrito do zero), a
+    leitura volta ao início.
+    """
+
+    def __init__(self, caminho, do_inicio=True):
+        self.caminho = caminho
+        self.do_inicio = do_inicio
+
+    def descricao(self):
+        return f"arquivo {os.path.basename(self.caminho)}"
+
+    def executar(self, buffer, parar):
+        """Lê até `parar` (threading.Event) ser sinalizado; roda em uma thread própria."""
+        linhas = _Linhas()
+        try:
+            with open(self.caminho, "rb") as arquivo:
+                if not self.do_inicio:
+                    arquivo.seek(0, os.SEEK_END)
+                while not parar.is_set():
+                    dados = arquivo.read(TAMANHO_LEITURA)
+                    if dados:
+                        buffer.adicionar_texto(linhas.completar(dados))
+                        continue
+                    if os.path.getsize(self.caminho) < arquivo.tell():
+                        arquivo.seek(0)
+                        linhas = _Linhas()
+                    parar.wait(INTERVALO_LEITURA)
+        except Exception as e:
+            buffer.erro = e
+
+
+class ReceberSocket:
+    """
+    Recebe pontos por TCP: cada cliente envia linhas "x, y". O servidor é
+    aberto na criação (com `porta=0`, em uma porta livre, informada em
+    `endereco`) e fechado quando `executar` termina.
+    """
+
+    def __init__(self, host="127.0.0.1", porta=0):
+        import socket
+        self.servidor = socket.create_server((host, porta))
+        self.servidor.setblocking(False)
+        self.endereco = self.servidor.getsockname()[:2]
+
+    def descricao(self):
+        return f"socket {self.endereco[0]}:{self.endereco[1]}"
+
+    def executar(self, buffer, parar):
+        """Atende os clientes até `parar` (threading.Event) ser sinalizado."""
+        import selectors
+        seletor = selectors.DefaultSelector()
+        seletor.register(self.servidor, selectors.EVENT_READ)
+        clientes = {}
+        try:
+            while not parar.is_set():
+                for chave, _ in seletor.select(timeout=INTERVALO_LEITURA):
+                    conexao = chave.fileobj
+                    if conexao is self.servidor:
+                        cliente, _ = self.servidor.accept()
+                        cliente.setblocking(False)
+                        seletor.register(cliente, selectors.EVENT_READ)
+                        clientes[cliente] = _Linhas()
+                        continue
+                    try:
+                        dados = conexao.recv(TAMANHO_LEITURA)
+                    except ConnectionError:
+                        dados = b""
+                    if dados:
+                        buffer.adicionar_texto(clientes[conexao].completar(dados))
+                    else:
+                        # Cliente desconectou: a última linha pode não ter "\n"
+                        buffer.adicionar_texto(clientes.pop(conexao).final())
+                        seletor.unregister(conexao)
+                        conexao.close()
+        except Exception as e:
+            buffer.erro = e
+        finally:
+            for cliente in clientes:
+                cliente.close()
+            seletor.close()
+            self.servidor.close()
+
+
+class RegressaoAoVivo:
+    """
+    Ajuste de uma regressão que recebe pontos aos poucos: somas acumuladas de
+    todos os pontos, limites (mínimo e máximo de x e y) e uma janela circular
+    com os últimos `pontos_visiveis` pontos, para o gráfico.
+    """
+
+    def __init__(self, pontos_visiveis=PONTOS_VISIVEIS):
+        self.acumulador = AcumuladorRegressao()
+        self._janela = np.empty((pontos_visiveis, 2))
+        self._proximo = 0
+        self._cheia = False
+        # (x0, x1, y0, y1) de todos os pontos recebidos
+        self.limites = None
+
+    @property
+    def n(self):
+        return self.acumulador.n
+
+    def adicionar(self, pontos):
+        """Adiciona pontos (n × 2) em O(n), independente do total já recebido."""
+        pontos = np.asarray(pontos, dtype=np.float64).reshape(-1, 2)
+        if not len(pontos):
+            return self
+        self.acumulador.adicionar(pontos[:, 0], pontos[:, 1])
+        (x0, y0), (x1, y1) = pontos.min(axis=0), pontos.max(axis=0)
+        if self.limites is not None:
+            x0, x1 = min(x0, self.limites[0]), max(x1, self.limites[1])
+            y0, y1 = min(y0, self.limites[2]), max(y1, self.limites[3])
+        self.limites = (float(x0), float(x1), float(y0), float(y1))
+
+        capacidade = len(self._janela)
+        pontos = pontos[-capacidade:]
+        fim = self._proximo + len(pontos)
+        if fim <= capacidade:
+            self._janela[self._proximo:fim] = pontos
+        else:
+            primeira = capacidade - self._proximo
+            self._janela[self._proximo:] = pontos[:primeira]
+            self._janela[:fim - capacidade] = pontos[primeira:]
+        self._cheia = self._cheia or fim >= capacidade
+        self._proximo = fim % capacidade
+        return self
+
+    def visiveis(self):
+        """Últimos pontos recebidos (no máximo `pontos_visiveis`, fora de ordem)."""
+        return self._janela if self._cheia else self._janela[:self._proximo]
+
+    def resultado(self):
+        """ResultadoRegressao de todos os pontos (ValueError com menos de dois ou x constante)."""
+        return ResultadoRegressao.de_dict(self.acumulador.resultado())
+
+    def reta(self, resultado):
+        """Extremos da reta ajustada no intervalo de x de todos os pontos recebidos."""
+        xs = np.array(self.limites[:2])
+        return xs, resultado.intercepto + resultado.inclinacao * xs
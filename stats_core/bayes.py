@@ -0,0 +1,68 @@
+"""
+Teorema de Bayes vetorizado, em escala logarítmica.
+
+O caso geral tem N hipóteses e M observações sequenciais (independentes
+dadas as hipóteses), e pode ser avaliado para B problemas independentes de
+uma só vez:
+
+    prioris           shape (B..., N)      P(H_n)
+    verossimilhancas  shape (B..., M, N)   P(obs_m | H_n)
+
+A posteriori é log P(H_n) + Σ_m log P(obs_m | H_n), normalizada com
+logsumexp; somar logaritmos evita o underflow que o produto de muitas
+verossimilhanças pequenas causaria.
+"""
+import numpy as np
+
+
+def _validar(nome, valores):
+    if np.any((valores < 0) | (valores > 1) | np.isnan(valores)):
+        raise ValueError(f"As probabilidades em '{nome}' devem estar entre 0 e 1.")
+
+
+def atualizar_bayes(prioris, verossimilhancas, trajetoria=False):
+    """
+    Calcula as probabilidades a posteriori.
+
+    Retorna (posteriores, log_evidencia). `posteriores` tem shape (B..., N), ou
+    (B..., M + 1, N) com `trajetoria=True` (a posteriori após cada observação,
+    começando pela priori normalizada). `log_evidencia` é log P(obs_1..obs_M),
+    com shape (B...) ou (B..., M + 1). Problemas com evidência zero produzem NaN.
+    """
+    from scipy.special import logsumexp
+    prioris = np.asarray(prioris, dtype=np.float64)
+    verossimilhancas = np.asarray(verossimilhancas, dtype=np.float64)
+    _validar("verossimilhancas", verossimilhancas)
+    if np.any(prioris < 0) or np.any(np.isnan(prioris)):
+        raise ValueError("As probabilidades a priori devem ser não negativas.")
+
+    with np.errstate(divide="ignore"):
+        log_priori = np.log(prioris) - np.log(prioris.sum(axis=-1, keepdims=True))
+        log_veross = np.log(verossimilhancas)
+    if trajetoria:
+        log_conjunta = np.concatenate(
+            (log_priori[..., np.newaxis, :],
+             log_priori[..., np.newaxis, :] + np.cumsum(log_veross, axis=-2)), axis=-2)
+    else:
+        log_conjunta = log_priori + log_veross.sum(axis=-2)
+
+    with np.errstate(invalid="ignore"):
+        log_evidencia = logsumexp(log_conjunta, axis=-1)
+        posteriores = np.exp(log_conjunta - log_evidencia[..., np.newaxis])
+    return posteriores, log_evidencia
+
+
+def bayes_binario(pa, pb_dado_a, pb_dado_nao_a):
+    """
+    Caso de uma hipótese binária e uma observação, vetorizado sobre arrays.
+
+    Retorna (P(¬A), P(B), P(A|B)), com P(B) pela Lei da Probabilidade Total.
+    Onde P(B) = 0, P(A|B) é NaN.
+    """
+    pa, pb_dado_a, pb_dado_nao_a = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (pa, pb_dado_a, pb_dado_nao_a)))
+    _validar("P(A)", pa)
+    prioris = np.stack((pa, 1 - pa), axis=-1)
+    verossimilhancas = np.stack((pb_dado_a, pb_dado_nao_a), axis=-1)[..., np.newaxis, :]
+    posteriores, log_evidencia = atualizar_bayes(prioris, verossimilhancas)
+    return (1 - pa)[()], np.exp(log_evidencia)[()], posteriores[..., 0][()]
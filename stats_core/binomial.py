@@ -0,0 +1,74 @@
+"""
+Distribuição binomial vetorizada.
+
+As funções aceitam escalares ou arrays para k, n e p e seguem as regras de
+broadcasting do NumPy, de modo que milhões de triplas (n, p, k) são avaliadas
+em uma única chamada. A PMF é calculada em escala logarítmica; CDF e função
+de sobrevivência usam a beta incompleta regularizada (scipy.special.bdtr).
+Para uma tabela completa de um mesmo (n, p), `tabela_binomial` calcula a
+linha inteira de uma vez e obtém CDF e sobrevivência por somas acumuladas.
+"""
+import numpy as np
+
+
+def _parametros_invalidos(n, p):
+    return (n < 0) | (n != np.floor(n)) | ~((p >= 0) & (p <= 1))
+
+
+def binom_logpmf(k, n, p):
+    """log P(X = k) para X ~ Binomial(n, p), com broadcasting."""
+    from scipy.special import gammaln, xlog1py, xlogy
+    k, n, p = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (k, n, p)))
+    with np.errstate(invalid="ignore"):
+        log = (gammaln(n + 1) - gammaln(k + 1) - gammaln(n - k + 1)
+               + xlogy(k, p) + xlog1py(n - k, -p))
+    fora = (k < 0) | (k > n) | (k != np.floor(k))
+    log = np.where(fora, -np.inf, log)
+    return np.where(_parametros_invalidos(n, p), np.nan, log)[()]
+
+
+def binom_pmf(k, n, p):
+    """P(X = k) para X ~ Binomial(n, p), com broadcasting."""
+    return np.exp(binom_logpmf(k, n, p))
+
+
+def binom_cdf(k, n, p):
+    """P(X <= k) para X ~ Binomial(n, p), com broadcasting."""
+    from scipy.special import bdtr
+    k, n, p = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (k, n, p)))
+    k = np.floor(k)
+    with np.errstate(invalid="ignore"):
+        cdf = bdtr(np.clip(k, 0, n), n, p)
+    cdf = np.where(k < 0, 0.0, np.where(k >= n, 1.0, cdf))
+    return np.where(_parametros_invalidos(n, p), np.nan, cdf)[()]
+
+
+def binom_sf(k, n, p):
+    """P(X > k) para X ~ Binomial(n, p), com broadcasting (mesma convenção de scipy.stats)."""
+    from scipy.special import bdtrc
+    k, n, p = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (k, n, p)))
+    k = np.floor(k)
+    with np.errstate(invalid="ignore"):
+        sf = bdtrc(np.clip(k, 0, n), n, p)
+    sf = np.where(k < 0, 1.0, np.where(k >= n, 0.0, sf))
+    return np.where(_parametros_invalidos(n, p), np.nan, sf)[()]
+
+
+def tabela_binomial(n, p):
+    """
+    Tabela completa de Binomial(n, p) para k = 0..n.
+
+    Retorna (k, pmf, cdf, sf), com cdf[k] = P(X <= k) e sf[k] = P(X > k). A CDF
+    é a soma acumulada da PMF a partir da cauda inferior e a sobrevivência a
+    partir da cauda superior, o que preserva a precisão nas duas caudas.
+    """
+    n = int(n)
+    if n < 0 or not 0 <= p <= 1:
+        raise ValueError("Parâmetros inválidos: n >= 0 e 0 <= p <= 1.")
+    k = np.arange(n + 1)
+    pmf = binom_pmf(k, n, p)
+    cdf = np.minimum(np.cumsum(pmf), 1.0)
+    sf = np.empty_like(pmf)
+    sf[:-1] = np.cumsum(pmf[:0:-1])[::-1]
+    sf[-1] = 0.0
+    return k, pmf, cdf, np.minimum(sf, 1.0)
@@ -0,0 +1,249 @@
+"""
+Caches LRU para resultados de cálculos e para a conversão de texto em números.
+
+`memoizar` guarda o resultado de uma função de análise indexado pelo nome da
+função e pela forma normalizada dos argumentos: um texto de dados (acima de
+LIMITE_TEXTO_CURTO caracteres) entra na chave como o resumo (hash) dos
+números já convertidos, de modo que a mesma série colada com outra
+formatação compartilha a entrada, e um caminho de arquivo
+entra com a data de modificação e o tamanho, de modo que um arquivo alterado
+não devolve um resultado antigo.
+
+A conversão de texto tem um cache próprio (`parse_numeros_cache` e
+`parse_grupos_cache`): rodar análises diferentes sobre os mesmos dados colados
+não converte o texto de novo. Os dois caches são limitados por número de
+entradas e por memória e expõem acertos, falhas e invalidação explícita.
+"""
+import functools
+import hashlib
+import inspect
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from stats_core.parsing import ParseError, parse_grupos, parse_numeros
+
+_AUSENTE = object()
+
+
+def tamanho_aproximado(valor):
+    """Memória aproximada, em bytes, ocupada por um valor guardado no cache."""
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes + 112
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamanho_aproximado(v) for v in valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_aproximado(v) for v in valor.values())
+    # Objetos com __slots__ (os resultados) incluem seus campos, como os vetores de entrada
+    slots = [nome for classe in type(valor).__mro__ for nome in classe.__dict__.get("__slots__", ())]
+    return sys.getsizeof(valor) + sum(tamanho_aproximado(getattr(valor, nome, None)) for nome in slots)
+
+
+class CacheLRU:
+    """
+    Cache LRU limitado a `max_itens` entradas e `max_bytes` bytes (estimados
+    por `tamanho_aproximado`). Seguro para uso a partir de várias threads.
+    """
+
+    def __init__(self, max_itens=256, max_bytes=64 << 20):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+        self.memoria = 0
+        self.acertos = 0
+        self.falhas = 0
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave, padrao=None):
+        with self._trava:
+            item = self._itens.get(chave, _AUSENTE)
+            if item is _AUSENTE:
+                self.falhas += 1
+                return padrao
+            self.acertos += 1
+            self._itens.move_to_end(chave)
+            return item[0]
+
+    def guardar(self, chave, valor):
+        tamanho = tamanho_aproximado(valor)
+        with self._trava:
+            if tamanho > self.max_bytes:
+                return valor
+            antigo = self._itens.pop(chave, None)
+            if antigo is not None:
+                self.memoria -= antigo[1]
+            self._itens[chave] = (valor, tamanho)
+            self.memoria += tamanho
+            while len(self._itens) > self.max_itens or self.memoria > self.max_bytes:
+                _, (_, liberado) = self._itens.popitem(last=False)
+                self.memoria -= liberado
+        return valor
+
+    def invalidar(self, predicado=None):
+        """Remove as entradas cuja chave satisfaz `predicado` (todas, se None)."""
+        with self._trava:
+            if predicado is None:
+                self._itens.clear()
+                self.memoria = 0
+                return
+            for chave in [c for c in self._itens if predicado(c)]:
+                self.memoria -= self._itens.pop(chave)[1]
+
+    @property
+    def taxa_acerto(self):
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def estatisticas(self):
+        return {
+            "itens": len(self._itens),
+            "memoria_bytes": self.memoria,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": self.taxa_acerto,
+        }
+
+
+cache_parse = CacheLRU(max_itens=64, max_bytes=256 << 20)
+cache_resultados = CacheLRU(max_itens=512, max_bytes=64 << 20)
+
+
+def _resumo(*partes):
+    h = hashlib.blake2b(digest_size=16)
+    for parte in partes:
+        h.update(parte)
+    return h.digest()
+
+
+# Textos menores que isto (parâmetros como "0.5" ou "10") entram na chave como
+# estão: não ocupam o cache de conversão, que fica para os conjuntos de dados, e
+# "10" e "10.0" não se confundem em funções que exigem um inteiro
+LIMITE_TEXTO_CURTO = 256
+
+
+def _converter_grupos(texto):
+    # (grupos somente leitura, resumo dos números) ou o ParseError do texto
+    try:
+        grupos = tuple(parse_grupos(texto))
+    except ParseError as e:
+        # Sem o traceback, que prenderia os quadros (e o texto) da conversão
+        return e.with_traceback(None)
+    for g in grupos:
+        g.flags.writeable = False
+    tamanhos = np.array([g.size for g in grupos], dtype=np.int64)
+    return grupos, _resumo(tamanhos.tobytes(), *(g.tobytes() for g in grupos))
+
+
+def _grupos_em_cache(texto):
+    chave = ("grupos", _resumo(texto.encode("utf-8", "surrogatepass")))
+    entrada = cache_parse.obter(chave, _AUSENTE)
+    if entrada is _AUSENTE:
+        entrada = cache_parse.guardar(chave, _converter_grupos(texto))
+    return chave, entrada
+
+
+def parse_grupos_cache(texto):
+    """Como `parse_grupos` (com ';'), mas guardando o resultado em `cache_parse`."""
+    _, entrada = _grupos_em_cache(texto)
+    if isinstance(entrada, ParseError):
+        # Um erro novo a cada chamada: relançar o do cache acumularia tracebacks
+        raise ParseError(entrada.token, entrada.indice, entrada.posicao)
+    return list(entrada[0])
+
+
+def parse_numeros_cache(texto):
+    """
+    Como `parse_numeros`, mas guardando o resultado em `cache_parse`. O vetor
+    devolvido é somente leitura, pois é compartilhado entre as chamadas.
+    """
+    chave, entrada = _grupos_em_cache(texto)
+    if isinstance(entrada, ParseError):
+        # A posição do erro no texto é a mesma, mas o índice do item deve
+        # contar todos os grupos: o caminho lento de parse_numeros o recalcula
+        return parse_numeros(texto)
+    grupos = entrada[0]
+    if len(grupos) == 1:
+        return grupos[0]
+    chave_numeros = ("numeros",) + chave[1:]
+    dados = cache_parse.obter(chave_numeros)
+    if dados is None:
+        dados = np.concatenate(grupos) if grupos else np.empty(0, dtype=np.float64)
+        dados.flags.writeable = False
+        cache_parse.guardar(chave_numeros, dados)
+    return dados
+
+
+def _chave_texto(texto):
+    if len(texto) < LIMITE_TEXTO_CURTO:
+        return ("texto", texto)
+    _, entrada = _grupos_em_cache(texto)
+    if isinstance(entrada, ParseError):
+        return ("invalido", _resumo(texto.encode("utf-8", "surrogatepass")))
+    return ("dados", entrada[1])
+
+
+def memoizar(cache=None, ignorar=(), arquivos=()):
+    """
+    Decorador que guarda os resultados de uma função de análise em `cache`
+    (por padrão `cache_resultados`).
+
+    Textos entram na chave pelos números convertidos, caminhos listados em
+    `arquivos` pelo caminho, data de modificação e tamanho, e os demais
+    argumentos pelo próprio valor. Argumentos em `ignorar` (por exemplo, um
+    acumulador que só acelera o cálculo) ficam fora da chave. Se algum
+    argumento não puder entrar na chave, a função é chamada sem cache.
+    """
+    def decorador(func):
+        assinatura = inspect.signature(func)
+        nome = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def envoltorio(*args, **kwargs):
+            alvo = cache if cache is not None else cache_resultados
+            argumentos = assinatura.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            partes = [nome]
+            for parametro, valor in argumentos.arguments.items():
+                if parametro in ignorar:
+                    continue
+                if parametro in arquivos:
+                    try:
+                        estado = os.stat(valor)
+                    except (OSError, TypeError):
+                        return func(*args, **kwargs)
+                    partes.append((os.path.abspath(valor), estado.st_mtime_ns, estado.st_size))
+                elif isinstance(valor, str):
+                    partes.append(_chave_texto(valor))
+                elif valor is None or isinstance(valor, (bool, int, float)):
+                    partes.append(valor)
+                else:
+                    return func(*args, **kwargs)
+            chave = tuple(partes)
+            resultado = alvo.obter(chave, _AUSENTE)
+            if resultado is _AUSENTE:
+                resultado = alvo.guardar(chave, func(*args, **kwargs))
+            return resultado
+
+        def invalidar():
+            """Remove do cache os resultados desta função."""
+            (cache if cache is not None else cache_resultados).invalidar(lambda chave: chave[0] == nome)
+
+        envoltorio.invalidar = invalidar
+        return envoltorio
+    return decorador
+
+
+def limpar_caches():
+    """Esvazia o cache de resultados e o de conversão de texto."""
+    cache_resultados.invalidar()
+    cache_parse.invalidar()
+
+
+def estatisticas_cache():
+    return {"resultados": cache_resultados.estatisticas(), "parse": cache_parse.estatisticas()}
@@ -0,0 +1,214 @@
+"""
+Análises da calculadora, usadas pelas interfaces (Flet e PySide6) e por lotes.
+
+As funções analisar_* recebem os textos digitados (ou o caminho de um
+arquivo), chamam os núcleos de cálculo do pacote e devolvem um resultado
+estruturado (stats_core.resultados), sem montar texto; entradas inválidas
+lançam ValueError (ParseError) ou OSError com a mensagem para o usuário. Os
+resultados ficam em `cache_resultados` (ver stats_core.cache) e não devem ser
+alterados por quem os recebe.
+
+As funções calcular_* são a forma usada pelas interfaces: o texto formatado
+do resultado ou, em caso de erro, a mensagem "Erro: ...". Este módulo não
+importa Flet, Qt nem matplotlib.
+"""
+import numpy as np
+
+from stats_core.anova import anova, anova_arquivo, anova_resumos
+from stats_core.bayes import bayes_binario
+from stats_core.binomial import binom_pmf
+from stats_core.cache import memoizar, parse_grupos_cache, parse_numeros_cache
+from stats_core.descriptive import descrever
+from stats_core.formatacao import formatar
+from stats_core.poisson import poisson_pmf
+from stats_core.regression import RegressaoIncremental, regressao_arquivo
+from stats_core.resampling import bootstrap_descritivo
+from stats_core.resultados import (ResultadoAnova, ResultadoBayes, ResultadoBayesDireto, ResultadoBinomial,
+                                   ResultadoDescritivo, ResultadoDescritivoArquivo, ResultadoPoisson,
+                                   ResultadoRegressao, ResultadoRegressaoMultipla)
+from stats_core.streaming import descrever_arquivo
+
+
+def mensagem_de_erro(erro):
+    """Mensagem exibida pelas interfaces para uma exceção de analisar_*."""
+    if isinstance(erro, OSError):
+        return f"Erro ao ler o arquivo: {erro}"
+    if isinstance(erro, ValueError):
+        return f"Erro: {erro}"
+    return f"Ocorreu um erro: {erro}"
+
+
+def _converter(textos, tipos, mensagem):
+    try:
+        return [tipo(texto) for texto, tipo in zip(textos, tipos)]
+    except (ValueError, TypeError):
+        raise ValueError(mensagem) from None
+
+
+@memoizar(ignorar=("cancelar",))
+def analisar_estatisticas_descritivas(data_str, bootstrap=False, cancelar=None):
+    """
+    Estatísticas descritivas de um conjunto de dados. Com `bootstrap=True`,
+    inclui intervalos de confiança (percentil e BCa) para média, mediana,
+    variância e desvio padrão. `cancelar` (threading.Event) interrompe o
+    bootstrap com CalculoCancelado.
+    """
+    data = parse_numeros_cache(data_str)
+    if data.size == 0:
+        raise ValueError("Insira dados numéricos válidos separados por vírgula.")
+    resumo = descrever(data)
+    # Semente fixa: o mesmo conjunto de dados gera sempre os mesmos intervalos
+    intervalos = None
+    if bootstrap and resumo["n"] >= 2:
+        intervalos = bootstrap_descritivo(data, semente=0, processos=None, cancelar=cancelar)
+    return ResultadoDescritivo.de_dict(resumo, bootstrap=bootstrap, intervalos=intervalos)
+
+
+@memoizar(ignorar=("cancelar",), arquivos=("caminho",))
+def analisar_estatisticas_descritivas_arquivo(caminho, cancelar=None):
+    """
+    Estatísticas descritivas de um arquivo de texto/CSV lido em blocos, sem
+    carregar o arquivo inteiro na memória.
+    """
+    resumo = descrever_arquivo(caminho, processos=None, cancelar=cancelar)
+    if resumo["n"] == 0:
+        raise ValueError("O arquivo não contém dados numéricos.")
+    return ResultadoDescritivoArquivo.de_dict(resumo)
+
+
+@memoizar(ignorar=("regressao",))
+def analisar_regressao_linear(x_str, y_str, regressao=None):
+    """
+    Regressão linear simples. Com um RegressaoIncremental da interface em
+    `regressao`, só os pontos alterados desde o último cálculo são reprocessados.
+    """
+    x_data = parse_numeros_cache(x_str)
+    y_data = parse_numeros_cache(y_str)
+    if x_data.size == 0 or y_data.size == 0 or x_data.size != y_data.size:
+        raise ValueError("Insira listas de dados numéricos X e Y válidas e de mesmo tamanho.")
+    if regressao is None:
+        regressao = RegressaoIncremental()
+    ajuste = regressao.sincronizar(x_data, y_data).resultado()
+    return ResultadoRegressao.de_dict(ajuste, x=x_data, y=y_data)
+
+
+@memoizar(ignorar=("cancelar",), arquivos=("caminho",))
+def analisar_regressao_multipla_arquivo(caminho, cancelar=None):
+    """
+    Regressão linear múltipla de um arquivo de texto/CSV com uma observação
+    por linha (a última coluna é Y), lido em blocos.
+    """
+    return ResultadoRegressaoMultipla.de_dict(regressao_arquivo(caminho, processos=None, cancelar=cancelar))
+
+
+@memoizar()
+def analisar_teorema_bayes(pa_str, pb_dado_a_str, pb_dado_nao_a_str):
+    """P(A|B) pelo Teorema de Bayes, com P(B) pela Lei da Probabilidade Total."""
+    PA, PB_dado_A, PB_dado_NAO_A = _converter(
+        (pa_str, pb_dado_a_str, pb_dado_nao_a_str), (float, float, float),
+        "Insira valores numéricos válidos para as probabilidades.")
+    if not (0 <= PA <= 1 and 0 <= PB_dado_A <= 1 and 0 <= PB_dado_NAO_A <= 1):
+        raise ValueError("As probabilidades devem estar entre 0 e 1.")
+
+    # P(B) = P(B|A) * P(A) + P(B|não A) * P(não A)
+    # P(A|B) = (P(B|A) * P(A)) / P(B)
+    P_NAO_A, PB, PA_dado_B = (float(v) for v in bayes_binario(PA, PB_dado_A, PB_dado_NAO_A))
+    if PB == 0:
+        raise ValueError("O cálculo de P(B) resultou em zero, divisão por zero impossível.")
+    return ResultadoBayes(PA, PB_dado_A, PB_dado_NAO_A, P_NAO_A, PB, PA_dado_B)
+
+
+@memoizar()
+def analisar_teorema_bayes_pb(pa_str, pb_dado_a_str, pb_str):
+    """
+    P(A|B) pelo Teorema de Bayes quando P(B) é conhecido diretamente (entrada
+    da interface antiga, StatsCalc_1).
+    """
+    PA, PB_dado_A, PB = _converter((pa_str, pb_dado_a_str, pb_str), (float, float, float),
+                                   "Insira valores numéricos válidos para as probabilidades.")
+    if not (0 <= PA <= 1 and 0 <= PB_dado_A <= 1 and 0 <= PB <= 1):
+        raise ValueError("As probabilidades devem estar entre 0 e 1.")
+    if PB == 0:
+        raise ValueError("P(B) não pode ser zero para o cálculo.")
+    return ResultadoBayesDireto(PA, PB_dado_A, PB, (PB_dado_A * PA) / PB)
+
+
+@memoizar()
+def analisar_distribuicao_binomial(n_str, p_str, k_str):
+    """P(X = k) para X ~ Binomial(n, p)."""
+    n, p, k = _converter((n_str, p_str, k_str), (int, float, int),
+                         "Insira valores numéricos e inteiros válidos para n e k, e numérico para p.")
+    if n <= 0 or not (0 <= p <= 1) or k < 0 or k > n:
+        raise ValueError("Verifique os valores. n > 0, 0 <= p <= 1, 0 <= k <= n.")
+    return ResultadoBinomial(n, p, k, float(binom_pmf(k, n, p)))
+
+
+@memoizar()
+def analisar_distribuicao_poisson(lam_str, k_str):
+    """P(X = k) para X ~ Poisson(λ)."""
+    lam, k = _converter((lam_str, k_str), (float, int),
+                        "Insira valores numéricos válidos para Lambda e k (inteiro).")
+    if lam <= 0 or k < 0:
+        raise ValueError("Lambda deve ser > 0 e k deve ser >= 0.")
+    return ResultadoPoisson(lam, k, float(poisson_pmf(k, lam)))
+
+
+@memoizar()
+def analisar_anova(groups_str):
+    """ANOVA de um fator para grupos separados por ';' (mesmo F e valor-p de scipy.stats.f_oneway)."""
+    groups_data = parse_grupos_cache(groups_str)
+    if len(groups_data) < 2:
+        raise ValueError("ANOVA requer pelo menos dois grupos de dados separados por ';'.")
+    return ResultadoAnova.de_dict(anova(groups_data), origem="")
+
+
+@memoizar()
+def analisar_anova_resumos(resumos_str):
+    """
+    ANOVA a partir de resumos já calculados: para cada grupo, n, média e
+    desvio padrão amostral, separados por vírgula (grupos por ponto e vírgula).
+    """
+    resumos = parse_grupos_cache(resumos_str)
+    if len(resumos) < 2:
+        raise ValueError("ANOVA requer pelo menos dois grupos de dados separados por ';'.")
+    if any(r.size != 3 for r in resumos):
+        raise ValueError("Informe, para cada grupo, n, média e desvio padrão (ex: 30, 10.5, 2.1; 25, 12.0, 1.8).")
+    n, medias, desvios = np.array(resumos).T
+    if np.any(n != np.floor(n)):
+        raise ValueError("O tamanho de cada grupo (n) deve ser um número inteiro.")
+    return ResultadoAnova.de_dict(anova_resumos(n, medias, desvios), origem="resumos")
+
+
+@memoizar(ignorar=("cancelar",), arquivos=("caminho",))
+def analisar_anova_arquivo(caminho, cancelar=None):
+    """
+    ANOVA de um arquivo de texto/CSV em formato longo (uma linha por
+    observação: grupo, valor), lido em blocos.
+    """
+    return ResultadoAnova.de_dict(anova_arquivo(caminho, processos=None, cancelar=cancelar), origem="arquivo")
+
+
+def _em_texto(analise):
+    # calcular_X(...): texto de analisar_X(...) ou a mensagem de erro
+    def calcular(*args, **kwargs):
+        try:
+            return formatar(analise(*args, **kwargs))
+        except Exception as e:
+            return mensagem_de_erro(e)
+
+    calcular.__name__ = calcular.__qualname__ = analise.__name__.replace("analisar_", "calcular_", 1)
+    calcular.__doc__ = f"Texto de `{analise.__name__}` para as interfaces, ou a mensagem de erro."
+    return calcular
+
+
+calcular_estatisticas_descritivas = _em_texto(analisar_estatisticas_descritivas)
+calcular_estatisticas_descritivas_arquivo = _em_texto(analisar_estatisticas_descritivas_arquivo)
+calcular_regressao_linear = _em_texto(analisar_regressao_linear)
+calcular_regressao_multipla_arquivo = _em_texto(analisar_regressao_multipla_arquivo)
+calcular_teorema_bayes = _em_texto(analisar_teorema_bayes)
+calcular_teorema_bayes_pb = _em_texto(analisar_teorema_bayes_pb)
+calcular_distribuicao_binomial = _em_texto(analisar_distribuicao_binomial)
+calcular_distribuicao_poisson = _em_texto(analisar_distribuicao_poisson)
+calcular_anova = _em_texto(analisar_anova)
+calcular_anova_resumos = _em_texto(analisar_anova_resumos)
+calcular_anova_arquivo = _em_texto(analisar_anova_arquivo)
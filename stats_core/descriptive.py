@@ -0,0 +1,136 @@
+"""
+Estatísticas descritivas calculadas em uma única leitura dos dados.
+
+Os dados são percorridos em blocos pequenos o bastante para caber no cache do
+processador; de cada bloco saem n, média, M2 (soma dos quadrados dos desvios),
+mínimo e máximo, que são combinados pela fórmula de Chan et al. Assim o vetor
+é lido da memória uma única vez, em vez de uma vez por np.mean/np.var/np.std.
+"""
+import math
+
+import numpy as np
+
+from stats_core.mode import modas as _modas
+
+# 32768 valores float64 = 256 KiB por bloco
+TAMANHO_BLOCO = 1 << 15
+
+
+class Momentos:
+    """
+    Acumulador combinável de contagem, média, M2, mínimo e máximo.
+
+    Dois acumuladores calculados sobre partes diferentes dos dados podem ser
+    unidos com `combinar`, produzindo o mesmo resultado (a menos de
+    arredondamento) que um único acumulador sobre todos os dados.
+    """
+
+    __slots__ = ("n", "media", "m2", "minimo", "maximo")
+
+    def __init__(self, n=0, media=0.0, m2=0.0, minimo=math.inf, maximo=-math.inf):
+        self.n = n
+        self.media = media
+        self.m2 = m2
+        self.minimo = minimo
+        self.maximo = maximo
+
+    @classmethod
+    def de_bloco(cls, bloco):
+        """Momentos exatos (duas passadas em cache) de um único bloco."""
+        n = bloco.size
+        if n == 0:
+            return cls()
+        media = float(np.add.reduce(bloco)) / n
+        desvios = bloco - media
+        return cls(n, media, float(np.dot(desvios, desvios)),
+                   float(np.min(bloco)), float(np.max(bloco)))
+
+    def atualizar(self, dados, tamanho_bloco=TAMANHO_BLOCO):
+        """Acrescenta os valores de um vetor, bloco a bloco."""
+        dados = np.asarray(dados, dtype=np.float64).ravel()
+        for inicio in range(0, dados.size, tamanho_bloco):
+            self.combinar(Momentos.de_bloco(dados[inicio:inicio + tamanho_bloco]))
+        return self
+
+    def combinar(self, outro):
+        """Une outro acumulador a este (variância paralela de Chan et al.)."""
+        if outro.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.media, self.m2 = outro.n, outro.media, outro.m2
+            self.minimo, self.maximo = outro.minimo, outro.maximo
+            return self
+        n = self.n + outro.n
+        delta = outro.media - self.media
+        self.media += delta * outro.n / n
+        self.m2 += outro.m2 + delta * delta * self.n * outro.n / n
+        self.n = n
+        # np.fmin/np.fmax ignorariam NaN; aqui o NaN deve se propagar como em np.min
+        self.minimo = float(np.minimum(self.minimo, outro.minimo))
+        self.maximo = float(np.maximum(self.maximo, outro.maximo))
+        return self
+
+    @property
+    def soma(self):
+        return self.media * self.n
+
+    @property
+    def variancia(self):
+        """Variância populacional (ddof=0)."""
+        return self.m2 / self.n if self.n else math.nan
+
+    @property
+    def desvio_padrao(self):
+        return math.sqrt(self.variancia) if self.n else math.nan
+
+    @property
+    def amplitude(self):
+        return self.maximo - self.minimo
+
+
+def mediana(dados):
+    """Mediana por seleção parcial (np.partition), sem ordenar o vetor inteiro."""
+    n = dados.size
+    meio = n // 2
+    if n == 0:
+        return math.nan
+    if n % 2:
+        return float(np.partition(dados, meio)[meio])
+    parcial = np.partition(dados, (meio - 1, meio))
+    return (float(parcial[meio - 1]) + float(parcial[meio])) / 2
+
+
+def descrever(dados, moda=True):
+    """
+    Calcula n, média, mediana, moda, mínimo, máximo, amplitude, variância e
+    desvio padrão (populacionais) de um vetor, convertendo-o uma única vez.
+
+    Com `moda=True` o vetor é ordenado uma vez e a mesma cópia ordenada fornece
+    a mediana e a moda; sem a moda a mediana vem de uma seleção parcial.
+    """
+    dados = np.asarray(dados, dtype=np.float64).ravel()
+    momentos = Momentos().atualizar(dados)
+    if dados.size == 0:
+        valor_mediano, lista_modas, frequencia = math.nan, [], 0
+    elif moda:
+        ordenado = np.sort(dados)
+        meio = ordenado.size // 2
+        valor_mediano = (float(ordenado[meio]) if ordenado.size % 2
+                         else (float(ordenado[meio - 1]) + float(ordenado[meio])) / 2)
+        lista_modas, frequencia = _modas(ordenado, ordenado=True)
+    else:
+        valor_mediano = mediana(dados)
+        lista_modas, frequencia = None, None
+    return {
+        "n": momentos.n,
+        "media": momentos.media,
+        # mínimo NaN indica NaN nos dados; a ordenação os jogaria para o fim
+        "mediana": math.nan if math.isnan(momentos.minimo) else valor_mediano,
+        "modas": lista_modas,
+        "frequencia_moda": frequencia,
+        "minimo": momentos.minimo,
+        "maximo": momentos.maximo,
+        "amplitude": momentos.amplitude,
+        "variancia": momentos.variancia,
+        "desvio_padrao": momentos.desvio_padrao,
+    }
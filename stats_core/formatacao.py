@@ -0,0 +1,185 @@
+"""
+Texto dos resultados exibido pelas interfaces.
+
+`formatar(resultado)` escolhe o formatador pelo tipo do resultado
+(stats_core.resultados). Nada aqui é chamado pelos cálculos: quem processa
+muitos resultados e não precisa do texto não paga pela montagem das strings.
+"""
+from stats_core.resultados import (ResultadoAnova, ResultadoBayes, ResultadoBayesDireto, ResultadoBinomial,
+                                   ResultadoDescritivo, ResultadoDescritivoArquivo, ResultadoPoisson,
+                                   ResultadoRegressao, ResultadoRegressaoMultipla)
+
+# Grupos listados no texto da ANOVA de arquivo
+MAX_GRUPOS_LISTADOS = 20
+
+
+def _ic_texto(intervalos, nome):
+    # Intervalos de confiança bootstrap exibidos ao lado de cada campo
+    if intervalos is None:
+        return ""
+    ic = intervalos[nome]
+    return (f"  [IC {intervalos['confianca']:.0%}: percentil {ic['percentil'][0]:.4f} a {ic['percentil'][1]:.4f}; "
+            f"BCa {ic['bca'][0]:.4f} a {ic['bca'][1]:.4f}]")
+
+
+def texto_descritivo(r):
+    # Moda (pode haver múltiplas)
+    if not r.modas:
+        modo_str = "Não há moda (todos os elementos são únicos)"
+    else:
+        modo_str = ", ".join(map(str, r.modas))
+    intervalos = r.intervalos
+    results = (
+        f"Resultados da Análise Descritiva:\n"
+        f"  Número de Dados (n): {r.n}\n"
+        f"  Média: {r.media:.4f}{_ic_texto(intervalos, 'media')}\n"
+        f"  Mediana: {r.mediana:.4f}{_ic_texto(intervalos, 'mediana')}\n"
+        f"  Moda: {modo_str}\n"
+        f"  Amplitude: {r.amplitude:.4f}\n"
+        f"  Variância (Pop.): {r.variancia:.4f}{_ic_texto(intervalos, 'variancia')}\n"
+        f"  Desvio Padrão (Pop.): {r.desvio_padrao:.4f}{_ic_texto(intervalos, 'desvio_padrao')}"
+    )
+    if intervalos is not None:
+        results += f"\n  (Intervalos por bootstrap com {intervalos['reamostras']} reamostras)"
+    elif r.bootstrap:
+        results += "\n  (O bootstrap requer pelo menos dois valores)"
+    return results
+
+
+def texto_descritivo_arquivo(r):
+    # Moda aproximada (sketch de Misra–Gries): a frequência real é >= à estimada
+    if r.modas:
+        modo_str = f"{', '.join(map(str, r.modas))} (aprox., frequência >= {r.frequencia_moda})"
+    elif r.erro_moda:
+        modo_str = "moda não determinada (nenhum valor com frequência > n/(k+1))"
+    else:
+        modo_str = "Não há moda (nenhum valor repetido detectado)"
+    return (
+        f"Resultados da Análise Descritiva (arquivo):\n"
+        f"  Número de Dados (n): {r.n}\n"
+        f"  Média: {r.media:.4f}\n"
+        f"  Mediana (aprox.): {r.mediana:.4f}\n"
+        f"  Percentis (aprox.): P90 = {r.p90:.4f}, P99 = {r.p99:.4f}\n"
+        f"  Erro de posição dos quantis: até {r.erro_rank:.2%}\n"
+        f"  Moda: {modo_str}\n"
+        f"  Amplitude: {r.amplitude:.4f}\n"
+        f"  Variância (Pop.): {r.variancia:.4f}\n"
+        f"  Desvio Padrão (Pop.): {r.desvio_padrao:.4f}"
+    )
+
+
+def texto_regressao(r):
+    return (
+        f"Resultados da Regressão Linear Simples:\n"
+        f"  Equação: Y = {r.intercepto:.4f} + {r.inclinacao:.4f}X\n"
+        f"  Coeficiente Angular (b): {r.inclinacao:.4f}\n"
+        f"  Intercepto (a): {r.intercepto:.4f}\n"
+        f"  Coeficiente de Determinação (R²): {r.r2:.4f}\n"
+        f"  Valor-p: {r.p_valor:.4f}\n"
+        f"  Erro Padrão do Coeficiente: {r.erro_padrao:.4f}"
+    )
+
+
+def texto_regressao_multipla(r):
+    linhas = [
+        f"Resultados da Regressão Linear Múltipla (arquivo):",
+        f"  Variável resposta: {r.nome_y} (n = {r.n})",
+        f"  Intercepto: {r.intercepto:.4f} (erro padrão {r.erro_padrao_intercepto:.4f})",
+    ]
+    for nome, coef, erro, p in zip(r.nomes, r.coeficientes, r.erros_padrao, r.p_valores):
+        linhas.append(f"  {nome}: {coef:.4f} (erro padrão {erro:.4f}, valor-p {p:.4f})")
+    linhas += [
+        f"  Coeficiente de Determinação (R²): {r.r2:.4f}",
+        f"  R² Ajustado: {r.r2_ajustado:.4f}",
+        f"  Estatística F: {r.f:.4f} (valor-p {r.p_valor_f:.4f})",
+    ]
+    return "\n".join(linhas)
+
+
+def texto_bayes(r):
+    return (
+        f"Resultados do Teorema de Bayes:\n"
+        f"  P(A) = {r.pa:.4f}\n"
+        f"  P(B|A) = {r.pb_dado_a:.4f}\n"
+        f"  P(B|não A) = {r.pb_dado_nao_a:.4f}\n"
+        f"  --------------------------\n"
+        f"  P(não A) = 1 - P(A) = {r.p_nao_a:.4f}\n"
+        f"  P(B) = P(B|A)P(A) + P(B|não A)P(não A) = {r.pb:.4f}\n"
+        f"  P(A|B) = (P(B|A) * P(A)) / P(B)\n"
+        f"  P(A|B) = ({r.pb_dado_a:.4f} * {r.pa:.4f}) / {r.pb:.4f}\n"
+        f"  P(A|B) = {r.pa_dado_b:.4f}"
+    )
+
+
+def texto_bayes_direto(r):
+    return (
+        f"Resultados do Teorema de Bayes:\n"
+        f"  P(A|B) = (P(B|A) * P(A)) / P(B)\n"
+        f"  P(A|B) = ({r.pb_dado_a:.4f} * {r.pa:.4f}) / {r.pb:.4f}\n"
+        f"  P(A|B) = {r.pa_dado_b:.4f}"
+    )
+
+
+def texto_binomial(r):
+    return (
+        f"Resultados da Distribuição Binomial:\n"
+        f"  Número de Tentativas (n): {r.n}\n"
+        f"  Probabilidade de Sucesso (p): {r.p:.4f}\n"
+        f"  Número de Sucessos (k): {r.k}\n"
+        f"  P(X = {r.k}) = {r.probabilidade:.6f}"
+    )
+
+
+def texto_poisson(r):
+    return (
+        f"Resultados da Distribuição de Poisson:\n"
+        f"  Taxa Média (λ): {r.lam:.4f}\n"
+        f"  Número de Eventos (k): {r.k}\n"
+        f"  P(X = {r.k}) = {r.probabilidade:.6f}"
+    )
+
+
+_ORIGENS_ANOVA = {"": "", "resumos": " - a partir de resumos", "arquivo": " - arquivo"}
+
+
+def texto_anova(r):
+    texto = (
+        f"Resultados da Análise de Variância (ANOVA){_ORIGENS_ANOVA[r.origem or '']}:\n"
+        f"  Número de Grupos Analisados: {r.grupos}\n"
+        f"  Número Total de Observações: {r.n}\n"
+        f"  Estatística F: {r.f:.4f} (gl = {r.gl_entre}, {r.gl_dentro})\n"
+        f"  Valor-p: {r.p_valor:.4f}\n"
+        f"  Interpretação (regra geral, α=0.05):\n"
+        f"    - Se p-valor < 0.05: Há diferença estatisticamente significativa entre as médias dos grupos.\n"
+        f"    - Se p-valor >= 0.05: Não há diferença estatisticamente significativa entre as médias dos grupos."
+    )
+    if r.origem != "arquivo":
+        return texto
+    linhas = [texto, "  Grupos (n, média, desvio padrão):"]
+    for rotulo, n, media, desvio in list(zip(r.rotulos, r.n_grupos, r.medias, r.desvios))[:MAX_GRUPOS_LISTADOS]:
+        linhas.append(f"    {rotulo}: n = {n}, média = {media:.4f}, dp = {desvio:.4f}")
+    if r.grupos > MAX_GRUPOS_LISTADOS:
+        linhas.append(f"    ... e mais {r.grupos - MAX_GRUPOS_LISTADOS} grupos")
+    return "\n".join(linhas)
+
+
+FORMATADORES = {
+    ResultadoDescritivo: texto_descritivo,
+    ResultadoDescritivoArquivo: texto_descritivo_arquivo,
+    ResultadoRegressao: texto_regressao,
+    ResultadoRegressaoMultipla: texto_regressao_multipla,
+    ResultadoBayes: texto_bayes,
+    ResultadoBayesDireto: texto_bayes_direto,
+    ResultadoBinomial: texto_binomial,
+    ResultadoPoisson: texto_poisson,
+    ResultadoAnova: texto_anova,
+}
+
+
+def formatar(resultado):
+    """Texto de um resultado de stats_core.resultados, como exibido pelas interfaces."""
+    try:
+        formatador = FORMATADORES[type(resultado)]
+    except KeyError:
+        raise TypeError(f"Sem formatador para {type(resultado).__name__}.") from None
+    return formatador(resultado)
@@ -0,0 +1,191 @@
+"""
+Gráfico de dispersão da regressão com artistas persistentes.
+
+GraficoRegressao recebe um Axes do matplotlib já criado (este módulo não
+importa matplotlib) e, a cada atualização, só troca os dados dos artistas
+(set_offsets, set_data), sem limpar o Axes nem recriar legenda e grade. A reta
+ajustada é desenhada pelos dois extremos (ResultadoRegressao.reta).
+
+Acima de `max_pontos`, desenhar cada ponto custa muito mais que o ajuste. Os
+pontos viram então um histograma 2-D (modo "densidade": uma imagem de
+bins × bins, atualizada com set_data) ou uma amostra regular de até
+`max_pontos` pontos (modo "amostra"). Nos dois casos o custo do desenho não
+depende mais de n; o que resta proporcional a n são operações vetorizadas do
+numpy (limites, contagem por bin).
+
+Pontos com x ou y não finito (o parser aceita "nan" e "inf") não são
+desenhados nem entram nos limites dos eixos ou na contagem por bin.
+"""
+import numpy as np
+
+MAX_PONTOS_GRAFICO = 20_000
+BINS_DENSIDADE = 200
+MODOS_GRAFICO = ("densidade", "amostra")
+
+TITULO_DISPERSAO = "Gráfico de Dispersão e Reta de Regressão"
+
+
+def _limites(valores):
+    inicio, fim = float(np.min(valores)), float(np.max(valores))
+    if not fim > inicio:  # todos os valores iguais
+        inicio, fim = inicio - 0.5, fim + 0.5
+    return inicio, fim
+
+
+def pontos_finitos(x, y):
+    """(x, y) sem os pontos em que x ou y é NaN ou infinito (os próprios vetores quando todos são finitos)."""
+    finitos = np.isfinite(x) & np.isfinite(y)
+    if finitos.all():
+        return x, y
+    return x[finitos], y[finitos]
+
+
+def amostrar_pontos(x, y, max_pontos):
+    """Até `max_pontos` pontos igualmente espaçados na ordem dos dados (vistas, sem cópia)."""
+    passo = max(1, -(-len(x) // max_pontos))
+    return x[::passo], y[::passo]
+
+
+def densidade_2d(x, y, bins=BINS_DENSIDADE):
+    """
+    Número de pontos em cada célula de uma grade bins × bins sobre o intervalo
+    dos dados: (contagens[linha de y, coluna de x], (x0, x1, y0, y1)). Usa um
+    único bincount, sem ordenar os dados (np.histogram2d é bem mais lento).
+    Pontos não finitos são ignorados; sem nenhum ponto finito, ValueError.
+    """
+    x, y = pontos_finitos(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    if x.size == 0:
+        raise ValueError("Não há pontos finitos para a densidade.")
+    x0, x1 = _limites(x)
+    y0, y1 = _limites(y)
+    colunas = ((x - x0) * (bins / (x1 - x0))).astype(np.intp)
+    linhas = ((y - y0) * (bins / (y1 - y0))).astype(np.intp)
+    # O valor máximo cai exatamente em `bins`: vai para a última célula
+    np.clip(colunas, 0, bins - 1, out=colunas)
+    np.clip(linhas, 0, bins - 1, out=linhas)
+    linhas *= bins
+    linhas += colunas
+    contagens = np.bincount(linhas, minlength=bins * bins).reshape(bins, bins)
+    return contagens, (x0, x1, y0, y1)
+
+
+class GraficoRegressao:
+    """
+    Pontos e reta de regressão em `axes`, criados uma vez e atualizados por
+    `atualizar`. Quem chama redesenha o canvas (de preferência com draw_idle).
+    """
+
+    def __init__(self, axes, max_pontos=MAX_PONTOS_GRAFICO, modo="densidade", bins=BINS_DENSIDADE):
+        if modo not in MODOS_GRAFICO:
+            raise ValueError(f"Modo de gráfico inválido: {modo!r} (use {' ou '.join(MODOS_GRAFICO)}).")
+        self.axes = axes
+        self.max_pontos = max_pontos
+        self.modo = modo
+        self.bins = bins
+        self.pontos = axes.scatter([], [], label='Dados Originais', zorder=2)
+        self.reta, = axes.plot([], [], color='red', linewidth=2, label='Reta de Regressão', zorder=3)
+        self.densidade = None  # imagem criada na primeira atualização acima de max_pontos
+        self.titulo = axes.set_title(TITULO_DISPERSAO)
+        axes.set_xlabel('Eixo X')
+        axes.set_ylabel('Eixo Y')
+        # Posição fixa: com loc="best" a legenda testa a sobreposição com todos os pontos a cada desenho
+        axes.legend(loc='upper left')
+        axes.grid(True)
+
+    def atualizar(self, x, y, reta_x=(), reta_y=()):
+        """Troca os pontos (x, y) e a reta (dois pontos) do gráfico; pontos não finitos são omitidos."""
+        x, y = pontos_finitos(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+        n = x.size
+        denso = n > self.max_pontos and self.modo == "densidade"
+        if denso:
+            contagens, extensao = densidade_2d(x, y, self.bins)
+            # Células vazias ficam transparentes, com a grade visível por baixo
+            contagens = np.ma.masked_equal(contagens, 0)
+            if self.densidade is None:
+                self.densidade = self.axes.imshow(contagens, origin='lower', extent=extensao, aspect='auto',
+                                                  cmap='Blues', interpolation='nearest', zorder=1)
+            else:
+                self.densidade.set_data(contagens)
+                self.densidade.set_extent(extensao)
+            self.densidade.set_clim(1, max(int(contagens.max()), 1))
+            self.pontos.set_offsets(np.empty((0, 2)))
+            self.titulo.set_text(f"Densidade de {n} Pontos e Reta de Regressão")
+        else:
+            xs, ys = amostrar_pontos(x, y, self.max_pontos) if n > self.max_pontos else (x, y)
+            self.pontos.set_offsets(np.column_stack((xs, ys)))
+            self.titulo.set_text(TITULO_DISPERSAO if xs.size == n else
+                                 f"Amostra de {xs.size} de {n} Pontos e Reta de Regressão")
+        if self.densidade is not None:
+            self.densidade.set_visible(denso)
+        self.reta.set_data(reta_x, reta_y)
+
+        # Limites calculados direto dos dados: relim/autoscale percorreriam os artistas
+        if n:
+            for limites, definir in ((_limites(x), self.axes.set_xlim), (_limites(y), self.axes.set_ylim)):
+                margem = (limites[1] - limites[0]) * 0.05
+                definir(limites[0] - margem, limites[1] + margem)
+
+
+class GraficoAoVivo:
+    """
+    Gráfico da regressão ao vivo com blitting: eixos, grade, legenda e título
+    são desenhados uma vez e guardados como fundo; a cada quadro só os pontos
+    visíveis e a reta são redesenhados por cima (restore_region, draw_artist,
+    blit). Um desenho completo só acontece quando os dados saem dos limites
+    atuais, que então crescem com folga para que isso seja raro.
+    """
+
+    # Folga, em fração do intervalo dos dados, ao ampliar os limites
+    FOLGA = 0.25
+
+    def __init__(self, canvas, axes):
+        self.canvas = canvas
+        self.axes = axes
+        self.pontos = axes.scatter([], [], s=10, label='Últimos Pontos', animated=True, zorder=2)
+        self.reta, = axes.plot([], [], color='red', linewidth=2, label='Reta de Regressão', animated=True,
+                               zorder=3)
+        axes.set_title('Regressão ao Vivo')
+        axes.set_xlabel('Eixo X')
+        axes.set_ylabel('Eixo Y')
+        axes.legend(loc='upper left')
+        axes.grid(True)
+        self.fundo = None
+        self.vista = None  # (x0, x1, y0, y1) exibidos
+        # Qualquer desenho completo (inclusive ao redimensionar a janela) renova o fundo
+        self._conexao = canvas.mpl_connect('draw_event', self._ao_desenhar)
+
+    def encerrar(self):
+        """Para o blitting: o último quadro passa a fazer parte dos desenhos normais."""
+        self.canvas.mpl_disconnect(self._conexao)
+        self.pontos.set_animated(False)
+        self.reta.set_animated(False)
+        self.canvas.draw_idle()
+
+    def _ao_desenhar(self, evento):
+        self.fundo = self.canvas.copy_from_bbox(self.axes.bbox)
+        self._desenhar_artistas()
+
+    def _desenhar_artistas(self):
+        self.axes.draw_artist(self.pontos)
+        self.axes.draw_artist(self.reta)
+
+    def atualizar(self, pontos, reta_x, reta_y, limites):
+        """Desenha um quadro: `pontos` (m × 2) visíveis, a reta e os limites (x0, x1, y0, y1) dos dados."""
+        self.pontos.set_offsets(pontos)
+        self.reta.set_data(reta_x, reta_y)
+        if self.vista is None or not (self.vista[0] <= limites[0] and limites[1] <= self.vista[1]
+                                      and self.vista[2] <= limites[2] and limites[3] <= self.vista[3]):
+            x0, x1 = limites[:2] if limites[1] > limites[0] else (limites[0] - 0.5, limites[1] + 0.5)
+            y0, y1 = limites[2:] if limites[3] > limites[2] else (limites[2] - 0.5, limites[3] + 0.5)
+            folga_x, folga_y = (x1 - x0) * self.FOLGA, (y1 - y0) * self.FOLGA
+            self.vista = (x0 - folga_x, x1 + folga_x, y0 - folga_y, y1 + folga_y)
+            self.axes.set_xlim(self.vista[0], self.vista[1])
+            self.axes.set_ylim(self.vista[2], self.vista[3])
+            self.fundo = None
+        if self.fundo is None:
+            # Desenho completo; _ao_desenhar guarda o novo fundo e desenha os artistas
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.fundo)
+        self._desenhar_artistas()
+        self.canvas.blit(self.axes.bbox)
@@ -0,0 +1,265 @@
+"""
+Execução em lote das análises da calculadora, sem interface gráfica.
+
+Cada trabalho indica a análise (o nome de uma função analisar_* de
+stats_core.calculadora sem o prefixo, por exemplo "anova" ou
+"regressao_linear") e as entradas, nos mesmos formatos aceitos pelos campos
+das interfaces:
+
+    {"id": "t1", "analise": "anova", "entradas": {"groups_str": "1,2,3; 4,5,6"}}
+    {"id": "t2", "analise": "distribuicao_binomial", "entradas": [10, 0.5, 3]}
+
+Em JSONL, `entradas` é um objeto (pelo nome do parâmetro) ou uma lista (na
+ordem dos parâmetros); listas de números e listas de grupos são convertidas no
+texto correspondente. Em CSV, a primeira linha tem as colunas "id"
+(opcional), "analise" e os nomes dos parâmetros; células vazias são omitidas.
+
+Os trabalhos são enviados em lotes a um pool de processos, com um número
+limitado de lotes em andamento, e cada resultado é escrito como uma linha JSON
+assim que fica pronto: na ordem da entrada ou, com `--desordenado`, na ordem
+de conclusão; valores não finitos (NaN, ±infinito) são escritos como null,
+para que parsers de JSON estritos aceitem a saída. Erros são registrados no próprio trabalho (tipo e mensagem da
+exceção, mais o traceback quando não é um erro de entrada) sem interromper o
+lote. Ao final, um resumo com a vazão é escrito na saída de erros; o código
+de saída é 1 se algum trabalho falhou.
+
+Uso: python -m stats_core.lote trabalhos.jsonl [-s resultados.jsonl] [-p 4] [--desordenado] [--texto]
+"""
+import argparse
+import csv
+import inspect
+import json
+import sys
+import time
+import traceback
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from stats_core import calculadora
+from stats_core.parallel import criar_executor, numero_de_processos
+from stats_core.resultados import json_finito
+
+ANALISES = {nome[len("analisar_"):]: getattr(calculadora, nome)
+            for nome in sorted(vars(calculadora)) if nome.startswith("analisar_")}
+
+TAMANHO_LOTE = 64
+# Lotes em andamento por processo: mantém os processos ocupados sem ler a
+# entrada inteira para a memória
+LOTES_POR_PROCESSO = 2
+
+_BOOLEANOS_CSV = {"true": True, "false": False, "verdadeiro": True, "falso": False, "sim": True, "nao": False,
+                  "não": False}
+
+
+def _argumento(valor):
+    # Números e listas viram o texto aceito pelos campos das interfaces
+    if isinstance(valor, list):
+        if valor and all(isinstance(v, list) for v in valor):
+            return "; ".join(", ".join(map(str, grupo)) for grupo in valor)
+        return ", ".join(map(str, valor))
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return str(valor)
+    return valor
+
+
+def executar_trabalho(trabalho, texto=False):
+    """
+    Executa um trabalho e devolve o registro de saída: "indice", "id",
+    "analise", "ok", "segundos" e "resultado" (como_dict do resultado, mais
+    "texto" com `texto=True`) ou "erro" ({"tipo", "mensagem"[, "traceback"]}).
+    """
+    inicio = time.perf_counter()
+    registro = {"indice": trabalho["indice"], "id": trabalho.get("id"), "analise": trabalho.get("analise")}
+    try:
+        if "erro_leitura" in trabalho:
+            raise ValueError(trabalho["erro_leitura"])
+        analise = ANALISES.get(trabalho.get("analise"))
+        if analise is None:
+            raise ValueError(f"Análise desconhecida: {trabalho.get('analise')!r}. "
+                             f"Disponíveis: {', '.join(ANALISES)}.")
+        entradas = trabalho.get("entradas", {})
+        if isinstance(entradas, dict):
+            args, kwargs = (), {nome: _argumento(v) for nome, v in entradas.items()}
+        elif isinstance(entradas, list):
+            args, kwargs = tuple(map(_argumento, entradas)), {}
+        else:
+            raise ValueError("'entradas' deve ser um objeto ou uma lista.")
+        try:
+            inspect.signature(analise).bind(*args, **kwargs)
+        except TypeError as e:
+            raise ValueError(f"Entradas inválidas para {trabalho['analise']}: {e}.") from None
+        resultado = analise(*args, **kwargs)
+        registro["ok"] = True
+        registro["resultado"] = resultado.como_dict()
+        if texto:
+            registro["texto"] = resultado.texto()
+    except Exception as e:
+        registro["ok"] = False
+        registro["erro"] = {"tipo": type(e).__name__, "mensagem": str(e)}
+        # Erros de entrada (ValueError, ParseError, OSError) já dizem o que corrigir
+        if not isinstance(e, (ValueError, OSError)):
+            registro["erro"]["traceback"] = traceback.format_exc()
+    registro["segundos"] = time.perf_counter() - inicio
+    return registro
+
+
+def _executar_lote(trabalhos, texto):
+    return [executar_trabalho(trabalho, texto) for trabalho in trabalhos]
+
+
+def ler_jsonl(arquivo):
+    """Trabalhos de um arquivo JSONL (linhas vazias são ignoradas)."""
+    indice = 0
+    for numero, linha in enumerate(arquivo, 1):
+        if not linha.strip():
+            continue
+        try:
+            trabalho = json.loads(linha)
+            if not isinstance(trabalho, dict):
+                raise ValueError("o registro deve ser um objeto JSON")
+        except ValueError as e:
+            trabalho = {"erro_leitura": f"Linha {numero} inválida: {e}"}
+        trabalho["indice"] = indice
+        indice += 1
+        yield trabalho
+
+
+def ler_csv(arquivo):
+    """Trabalhos de um arquivo CSV com cabeçalho (colunas "id", "analise" e parâmetros)."""
+    for indice, linha in enumerate(csv.DictReader(arquivo)):
+        trabalho = {"indice": indice, "id": linha.pop("id", None) or None, "analise": linha.pop("analise", None)}
+        entradas = {}
+        for nome, valor in linha.items():
+            if nome is None:
+                trabalho["erro_leitura"] = f"Linha {indice + 2}: mais valores que colunas no cabeçalho."
+            elif valor not in (None, ""):
+                entradas[nome] = _BOOLEANOS_CSV.get(valor.strip().lower(), valor)
+        trabalho["entradas"] = entradas
+        yield trabalho
+
+
+def _agrupar(trabalhos, tamanho):
+    lote = []
+    for trabalho in trabalhos:
+        lote.append(trabalho)
+        if len(lote) == tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def executar_lote(trabalhos, saida, processos=None, tamanho_lote=TAMANHO_LOTE, ordenado=True, texto=False):
+    """
+    Executa `trabalhos` (um iterável, lido sob demanda) em lotes de
+    `tamanho_lote` em `processos` processos e escreve em `saida` um registro
+    JSON por linha à medida que os lotes terminam. Retorna o resumo da
+    execução (contagens, tempo total e trabalhos por segundo).
+    """
+    processos = numero_de_processos(processos)
+    limite = LOTES_POR_PROCESSO * processos
+    contagem, erros, tempo_por_analise = Counter(), Counter(), Counter()
+    inicio = time.perf_counter()
+
+    def escrever(registros):
+        for registro in registros:
+            # NaN e infinitos saem como null, como nas respostas de stats_core.servico
+            saida.write(json.dumps(json_finito(registro), ensure_ascii=False, allow_nan=False) + "\n")
+            contagem[registro["analise"]] += 1
+            tempo_por_analise[registro["analise"]] += registro["segundos"]
+            if not registro["ok"]:
+                erros[registro["erro"]["tipo"]] += 1
+        saida.flush()
+
+    def concluir(pendentes, todos=False):
+        # Espera lotes até ficar abaixo do limite de lotes em andamento (ou esvaziar)
+        while pendentes and (todos or len(pendentes) >= limite):
+            if ordenado:
+                escrever(pendentes.popleft().result())
+                continue
+            prontos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                pendentes.remove(futuro)
+                escrever(futuro.result())
+
+    with criar_executor(processos) as executor:
+        pendentes = deque() if ordenado else set()
+        adicionar = pendentes.append if ordenado else pendentes.add
+        for lote in _agrupar(trabalhos, tamanho_lote):
+            adicionar(executor.submit(_executar_lote, lote, texto))
+            concluir(pendentes)
+        concluir(pendentes, todos=True)
+
+    segundos = time.perf_counter() - inicio
+    total = sum(contagem.values())
+    return {
+        "trabalhos": total,
+        "sucesso": total - sum(erros.values()),
+        "erros": dict(erros),
+        "por_analise": dict(contagem),
+        "segundos_por_analise": dict(tempo_por_analise),
+        "segundos": segundos,
+        "trabalhos_por_segundo": total / segundos if segundos > 0 else float("inf"),
+        "processos": processos,
+    }
+
+
+def _texto_resumo(resumo):
+    linhas = [
+        f"{resumo['trabalhos']} trabalhos em {resumo['segundos']:.3f} s com {resumo['processos']} processo(s): "
+        f"{resumo['trabalhos_por_segundo']:.1f} trabalhos/s",
+        f"  sucesso: {resumo['sucesso']}; erros: {sum(resumo['erros'].values())}"
+        + (f" ({', '.join(f'{tipo}: {n}' for tipo, n in resumo['erros'].items())})" if resumo["erros"] else ""),
+    ]
+    for analise, n in sorted(resumo["por_analise"].items(), key=lambda item: str(item[0])):
+        media = resumo["segundos_por_analise"][analise] / n
+        linhas.append(f"  {analise}: {n} trabalhos, {media * 1e3:.3f} ms em média")
+    return "\n".join(linhas)
+
+
+def parametros_da_analise(nome):
+    """Nomes dos parâmetros aceitos em "entradas" pela análise `nome`."""
+    # "regressao" e "cancelar" são usados só pelas interfaces
+    return [p for p in inspect.signature(ANALISES[nome]).parameters if p not in ("regressao", "cancelar")]
+
+
+def _listar_analises():
+    for nome in ANALISES:
+        print(f"{nome}: {', '.join(parametros_da_analise(nome))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m stats_core.lote",
+                                     description="Executa análises da calculadora em lote.")
+    parser.add_argument("entrada", nargs="?", default="-",
+                        help="arquivo JSONL ou CSV de trabalhos ('-' lê da entrada padrão)")
+    parser.add_argument("-s", "--saida", default="-", help="arquivo JSONL de resultados ('-' escreve na saída padrão)")
+    parser.add_argument("-f", "--formato", choices=("jsonl", "csv"),
+                        help="formato da entrada (padrão: pela extensão; JSONL na entrada padrão)")
+    parser.add_argument("-p", "--processos", type=int, help="número de processos (padrão: todos os núcleos)")
+    parser.add_argument("-l", "--tamanho-lote", type=int, default=TAMANHO_LOTE, help="trabalhos por lote")
+    parser.add_argument("--desordenado", action="store_true", help="escreve os resultados na ordem de conclusão")
+    parser.add_argument("--texto", action="store_true", help="inclui o texto formatado de cada resultado")
+    parser.add_argument("--listar", action="store_true", help="lista as análises e seus parâmetros e sai")
+    args = parser.parse_args(argv)
+
+    if args.listar:
+        _listar_analises()
+        return 0
+    formato = args.formato or ("csv" if args.entrada.lower().endswith(".csv") else "jsonl")
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8", newline="")
+    saida = sys.stdout if args.saida == "-" else open(args.saida, "w", encoding="utf-8")
+    try:
+        trabalhos = ler_csv(entrada) if formato == "csv" else ler_jsonl(entrada)
+        resumo = executar_lote(trabalhos, saida, args.processos, args.tamanho_lote, not args.desordenado, args.texto)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
+    print(_texto_resumo(resumo), file=sys.stderr)
+    return 1 if resumo["erros"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Cálculo da moda sobre vetores NumPy.
+
+A moda exata usa o vetor ordenado: as repetições formam sequências
+contíguas, cujos tamanhos saem de uma única comparação vetorizada. Para
+fluxos em que a contagem exata seria cara demais há o sketch de Misra–Gries,
+que mantém no máximo `capacidade` candidatos e pode ser combinado entre
+blocos e processos.
+"""
+import numpy as np
+
+
+def contar_repeticoes(ordenado):
+    """Valores distintos e suas frequências a partir de um vetor já ordenado."""
+    if ordenado.size == 0:
+        return ordenado[:0], np.zeros(0, dtype=np.int64)
+    # NaN != NaN: cada NaN conta como um valor próprio, como no Counter antigo
+    inicios = np.flatnonzero(np.concatenate(([True], ordenado[1:] != ordenado[:-1])))
+    contagens = np.diff(np.append(inicios, ordenado.size))
+    return ordenado[inicios], contagens
+
+
+def modas(dados, ordenado=False):
+    """
+    Retorna (lista de modas em ordem crescente, frequência).
+
+    Se nenhum valor se repete a lista é vazia (conjunto amodal). Passe
+    `ordenado=True` quando `dados` já estiver ordenado para evitar nova ordenação.
+    """
+    dados = np.asarray(dados, dtype=np.float64).ravel()
+    valores, contagens = contar_repeticoes(dados if ordenado else np.sort(dados))
+    if contagens.size == 0:
+        return [], 0
+    maxima = int(contagens.max())
+    if maxima <= 1:
+        return [], 1
+    return valores[contagens == maxima].tolist(), maxima
+
+
+class MisraGries:
+    """
+    Sketch de itens frequentes (Misra–Gries) com no máximo `capacidade` contadores.
+
+    A contagem estimada de cada valor subestima a real em no máximo
+    `erro_maximo` (<= n / (capacidade + 1)). Cada bloco é resumido por
+    ordenação e incorporado de forma vetorizada; dois sketches podem ser
+    unidos com `combinar` (Agarwal et al., "Mergeable Summaries").
+    """
+
+    __slots__ = ("capacidade", "valores", "contagens", "n", "erro_maximo")
+
+    def __init__(self, capacidade=1000):
+        self.capacidade = capacidade
+        self.valores = np.empty(0, dtype=np.float64)
+        self.contagens = np.empty(0, dtype=np.int64)
+        self.n = 0
+        self.erro_maximo = 0
+
+    def atualizar(self, bloco):
+        bloco = np.asarray(bloco, dtype=np.float64).ravel()
+        valores, contagens = contar_repeticoes(np.sort(bloco))
+        self._incorporar(valores, contagens, bloco.size)
+        return self
+
+    def combinar(self, outro):
+        self._incorporar(outro.valores, outro.contagens, outro.n)
+        self.erro_maximo += outro.erro_maximo
+        return self
+
+    def _incorporar(self, valores, contagens, n):
+        todos = np.concatenate((self.valores, valores))
+        pesos = np.concatenate((self.contagens, contagens))
+        ordem = np.argsort(todos, kind="stable")
+        todos, pesos = todos[ordem], pesos[ordem]
+        novos = np.concatenate(([True], todos[1:] != todos[:-1])) if todos.size else np.zeros(0, bool)
+        self.valores = todos[novos]
+        self.contagens = np.bincount(np.cumsum(novos) - 1, weights=pesos,
+                                     minlength=self.valores.size).astype(np.int64)
+        self.n += n
+        if self.valores.size > self.capacidade:
+            # Subtrai o (capacidade+1)-ésimo maior contador de todos e descarta os não positivos
+            corte = np.partition(self.contagens, self.contagens.size - self.capacidade - 1)[
+                self.contagens.size - self.capacidade - 1]
+            self.contagens = self.contagens - corte
+            manter = self.contagens > 0
+            self.valores, self.contagens = self.valores[manter], self.contagens[manter]
+            self.erro_maximo += int(corte)
+
+    def frequentes(self, quantidade=None):
+        """Pares (valores, contagens estimadas) em ordem decrescente de contagem."""
+        ordem = np.argsort(-self.contagens, kind="stable")[:quantidade]
+        return self.valores[ordem], self.contagens[ordem]
+
+    def modas(self):
+        """
+        Modas aproximadas no mesmo formato de `modas()`: (lista, frequência estimada).
+
+        Um contador só indica uma moda se passar de `erro_maximo`; abaixo disso
+        pode ser resto de valores quase únicos, e a lista volta vazia (moda não
+        determinada, se `erro_maximo` > 0).
+        """
+        if self.contagens.size == 0:
+            return [], 0
+        maxima = int(self.contagens.max())
+        if maxima <= 1 or maxima <= self.erro_maximo:
+            return [], maxima
+        return np.sort(self.valores[self.contagens == maxima]).tolist(), maxima
@@ -0,0 +1,159 @@
+"""
+Utilitários de execução em vários processos.
+
+As tarefas são funções de nível de módulo (para poderem ser enviadas aos
+processos filhos) e os resultados parciais são combinados no processo
+principal. concurrent.futures só é importado quando um pool é de fato criado,
+pois sozinho ele dobraria o tempo de importação do pacote (sem contar numpy).
+
+Os laços longos (blocos de um arquivo, lotes de reamostragem) aceitam um
+`cancelar` (threading.Event): quando ele é sinalizado, o laço para no próximo
+bloco com CalculoCancelado, liberando a thread de quem pediu o cálculo.
+"""
+import os
+
+from stats_core.parsing import SEPARADORES
+
+_SEPARADORES_BYTES = frozenset(SEPARADORES.encode("ascii"))
+FIM_DE_LINHA = frozenset(b"\n")
+
+# Intervalo, em segundos, entre verificações de `cancelar` enquanto se espera um pool
+INTERVALO_CANCELAMENTO = 0.1
+
+
+class CalculoCancelado(Exception):
+    """O evento `cancelar` de um cálculo foi sinalizado antes do fim."""
+
+
+def verificar_cancelamento(cancelar):
+    """Lança CalculoCancelado se `cancelar` (threading.Event ou None) foi sinalizado."""
+    if cancelar is not None and cancelar.is_set():
+        raise CalculoCancelado("Cálculo cancelado.")
+
+
+def aguardar(futuro, cancelar=None):
+    """futuro.result(), verificando `cancelar` enquanto espera."""
+    if cancelar is not None:
+        from concurrent.futures import wait
+        while not wait([futuro], timeout=INTERVALO_CANCELAMENTO).done:
+            verificar_cancelamento(cancelar)
+    return futuro.result()
+
+
+def numero_de_processos(processos=None):
+    """Normaliza o número de processos (None ou <= 0 = todos os núcleos)."""
+    if processos is None or processos <= 0:
+        return os.cpu_count() or 1
+    return processos
+
+
+def dividir_arquivo(caminho, partes, inicio=0, separadores=_SEPARADORES_BYTES):
+    """
+    Divide o arquivo em até `partes` intervalos de bytes [inicio, fim).
+
+    Cada fronteira é deslocada para logo depois de um dos bytes em
+    `separadores`, de modo que nenhum número fica dividido entre dois
+    intervalos (com FIM_DE_LINHA, nenhuma linha).
+    """
+    tamanho = os.path.getsize(caminho)
+    if tamanho <= inicio:
+        return []
+    passo = max(1, (tamanho - inicio) // partes)
+    fronteiras = [inicio]
+    with open(caminho, "rb") as arquivo:
+        for i in range(1, partes):
+            posicao = max(inicio + i * passo, fronteiras[-1])
+            arquivo.seek(posicao)
+            while posicao < tamanho:
+                bloco = arquivo.read(4096)
+                if not bloco:
+                    posicao = tamanho
+                    break
+                for j, c in enumerate(bloco):
+                    if c in separadores:
+                        posicao += j + 1
+                        break
+                else:
+                    posicao += len(bloco)
+                    continue
+                break
+            if posicao >= tamanho:
+                break
+            if posicao > fronteiras[-1]:
+                fronteiras.append(posicao)
+    fronteiras.append(tamanho)
+    return list(zip(fronteiras[:-1], fronteiras[1:]))
+
+
+def mapear(func, tarefas, processos=None, cancelar=None):
+    """
+    Executa func(*tarefa) para cada tarefa e devolve os resultados na ordem
+    das tarefas. Com um único processo (ou uma única tarefa) roda no próprio
+    processo, sem o custo de criar o pool. Com `cancelar` sinalizado, para
+    entre tarefas com CalculoCancelado (as que já rodam em um pool terminam
+    em segundo plano).
+    """
+    tarefas = list(tarefas)
+    processos = min(numero_de_processos(processos), len(tarefas))
+    if processos <= 1:
+        resultados = []
+        for tarefa in tarefas:
+            verificar_cancelamento(cancelar)
+            resultados.append(func(*tarefa))
+        return resultados
+    from concurrent.futures import ProcessPoolExecutor
+    pool = ProcessPoolExecutor(max_workers=processos)
+    cancelado = False
+    try:
+        futuros = [pool.submit(func, *tarefa) for tarefa in tarefas]
+        return [aguardar(f, cancelar) for f in futuros]
+    except CalculoCancelado:
+        cancelado = True
+        raise
+    finally:
+        pool.shutdown(wait=not cancelado, cancel_futures=True)
+
+
+class ExecutorLocal:
+    """
+    Executor síncrono com a interface de ProcessPoolExecutor: cada tarefa
+    roda no próprio processo no momento de `submit`. Usado quando há um
+    único processo, para que o código chamador seja o mesmo nos dois casos.
+    """
+
+    def __init__(self, inicializador=None, argumentos=()):
+        if inicializador is not None:
+            inicializador(*argumentos)
+
+    def submit(self, func, *args):
+        from concurrent.futures import Future
+        futuro = Future()
+        try:
+            futuro.set_result(func(*args))
+        except Exception as e:
+            futuro.set_exception(e)
+        return futuro
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False
+
+
+def criar_executor(processos=None, inicializador=None, argumentos=()):
+    """
+    ProcessPoolExecutor com `processos` processos, ou ExecutorLocal com um só.
+    `inicializador(*argumentos)` roda uma vez em cada processo (por exemplo,
+    para guardar em uma variável global dados grandes usados por todas as
+    tarefas, em vez de enviá-los a cada tarefa).
+    """
+    processos = numero_de_processos(processos)
+    if processos <= 1:
+        return ExecutorLocal(inicializador, argumentos)
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=processos, initializer=inicializador, initargs=argumentos)
@@ -0,0 +1,116 @@
+"""
+Conversão de texto em vetores numéricos (float64) em lote.
+
+Em vez de criar um objeto str e um float do Python para cada valor, todos os
+separadores são trocados por espaços de uma só vez (str.translate) e o texto
+inteiro é convertido pelo parser em C do NumPy. Somente quando algum token não
+é reconhecido o texto é percorrido token a token, para localizar o erro (ou
+aceitar formatos que só o float() do Python entende, como "1_000").
+"""
+import re
+import warnings
+
+import numpy as np
+
+SEPARADORES = ",; \t\r\n\f\v"
+
+_TABELA_SEPARADORES = str.maketrans({c: " " for c in SEPARADORES})
+_TOKEN = re.compile(r"[^,;\s]+")
+
+
+class ParseError(ValueError):
+    """
+    Token que não pôde ser convertido em número.
+
+    `indice` é a posição do token na sequência de valores (começando em 0) e
+    `posicao` é o deslocamento, em caracteres, do início do token no texto.
+    """
+
+    def __init__(self, token, indice, posicao):
+        self.token = token
+        self.indice = indice
+        self.posicao = posicao
+        super().__init__(f"Valor inválido '{token}' na posição {posicao} (item {indice + 1}).")
+
+    def __reduce__(self):
+        # Permite que o erro atravesse a fronteira entre processos (pickle)
+        return ParseError, (self.token, self.indice, self.posicao)
+
+
+def parse_numeros(texto):
+    """
+    Converte um texto com números em um np.ndarray float64.
+
+    Vírgulas, ponto e vírgulas, espaços, tabulações e quebras de linha são
+    aceitos como separadores (separadores repetidos são ignorados). Lança
+    ParseError no primeiro token inválido.
+    """
+    if isinstance(texto, bytes):
+        texto = texto.decode("utf-8")
+    normalizado = texto.translate(_TABELA_SEPARADORES)
+    if not normalizado.strip():
+        # np.fromstring devolve [-1.] para textos só com separadores
+        return np.empty(0, dtype=np.float64)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            return np.fromstring(normalizado, dtype=np.float64, sep=" ")
+    except (ValueError, DeprecationWarning):
+        return _parse_token_a_token(texto)
+
+
+def valores_por_linha(texto):
+    """
+    Número de tokens (trechos entre SEPARADORES) em cada linha de `texto`
+    (str ou bytes), calculado de uma vez com o NumPy. As linhas são separadas
+    por "\n"; um "\n" no fim do texto não abre uma linha a mais.
+    """
+    if isinstance(texto, str):
+        texto = texto.encode("utf-8")
+    dados = np.frombuffer(texto, dtype=np.uint8)
+    if dados.size == 0:
+        return np.zeros(0, dtype=np.intp)
+    # Comparações diretas são mais rápidas que uma tabela de consulta por byte:
+    # "\t\n\v\f\r" são os bytes 9 a 13, e os demais separadores são " ", "," e ";"
+    separador = (dados - np.uint8(9)) <= 4
+    separador |= dados == 32
+    separador |= dados == 44
+    separador |= dados == 59
+    inicio_token = ~separador
+    inicio_token[1:] &= separador[:-1]
+    inicios = np.flatnonzero(inicio_token)
+    fins_de_linha = np.flatnonzero(dados == 10)
+    if dados[-1] != 10:
+        fins_de_linha = np.append(fins_de_linha, dados.size)
+    # Tokens antes de cada fim de linha; a diferença é a contagem de cada linha
+    return np.diff(np.searchsorted(inicios, fins_de_linha), prepend=0)
+
+
+def _parse_token_a_token(texto):
+    """Caminho lento: converte com float() e reporta o primeiro token inválido."""
+    valores = []
+    for indice, m in enumerate(_TOKEN.finditer(texto)):
+        try:
+            valores.append(float(m.group()))
+        except ValueError:
+            raise ParseError(m.group(), indice, m.start()) from None
+    return np.array(valores, dtype=np.float64)
+
+
+def parse_grupos(texto, separador=";"):
+    """
+    Converte um texto com grupos separados por `separador` em uma lista de
+    vetores float64. Grupos vazios são descartados; a posição informada em
+    ParseError é relativa ao texto completo.
+    """
+    grupos = []
+    deslocamento = 0
+    for trecho in texto.split(separador):
+        try:
+            dados = parse_numeros(trecho)
+        except ParseError as e:
+            raise ParseError(e.token, e.indice, e.posicao + deslocamento) from None
+        if dados.size:
+            grupos.append(dados)
+        deslocamento += len(trecho) + len(separador)
+    return grupos
@@ -0,0 +1,252 @@
+"""
+Distribuição de Poisson com tabelas pré-calculadas por λ.
+
+Para cada λ consultado é montada (uma vez, com chamadas vetorizadas) uma
+tabela de PMF, CDF e sobrevivência cobrindo praticamente toda a massa da
+distribuição (λ ± 12·√λ); as consultas seguintes, para arrays de k, são
+apenas indexação ou np.searchsorted (inversa da CDF). As tabelas ficam em um cache LRU limitado
+por quantidade e por memória, e os log-fatoriais vêm de uma tabela
+compartilhada entre todos os λ.
+
+A largura da tabela cresce com √λ; acima de LARGURA_MAXIMA_TABELA valores
+(λ da ordem de milhões) montar a tabela custaria mais que responder a
+consulta, e os valores são calculados diretamente com gammaln/pdtr.
+"""
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Tabela compartilhada de log(k!) (crescida sob demanda até este limite)
+LIMITE_LOG_FATORIAL = 1 << 20
+_log_fatorial = np.zeros(1)
+
+# Largura da tabela, em desvios padrão, de cada lado de λ
+_DESVIOS = 12
+
+# Valores de k por tabela (PMF, CDF e sobrevivência: 24 bytes cada)
+LARGURA_MAXIMA_TABELA = 1 << 16
+
+
+def log_fatorial(k):
+    """log(k!) para um array de inteiros não negativos."""
+    global _log_fatorial
+    from scipy.special import gammaln
+    k = np.asarray(k, dtype=np.int64)
+    maior = int(k.max(initial=0))
+    tabela = _log_fatorial  # outra thread pode trocar a tabela global enquanto esta lê
+    if maior < tabela.size:
+        return tabela[k]
+    if maior < LIMITE_LOG_FATORIAL:
+        tamanho = min(LIMITE_LOG_FATORIAL, max(maior + 1, 2 * _log_fatorial.size))
+        _log_fatorial = gammaln(np.arange(tamanho) + 1.0)
+        return _log_fatorial[k]
+    return gammaln(k + 1.0)
+
+
+def _extremos(lam):
+    # Intervalo [k_min, k_max] coberto pela tabela de λ
+    desvio = math.sqrt(lam)
+    return max(0, int(lam - _DESVIOS * desvio - 20)), int(math.ceil(lam + _DESVIOS * desvio + 20))
+
+
+def largura_tabela(lam):
+    """Número de valores de k na tabela de λ."""
+    k_min, k_max = _extremos(lam)
+    return k_max - k_min + 1
+
+
+def _pmf_direta(k, lam):
+    from scipy.special import gammaln, xlogy
+    return np.exp(xlogy(k, lam) - lam - gammaln(k + 1.0))
+
+
+def _ppf_direta(q, lam):
+    # Como scipy.stats.poisson.ppf: arredonda a inversa contínua e corrige em uma unidade
+    from scipy.special import pdtr, pdtrik
+    k = np.ceil(pdtrik(q, lam))
+    anterior = np.maximum(k - 1, 0)
+    return np.where(pdtr(anterior, lam) >= q, anterior, k)
+
+
+class TabelaPoisson:
+    """PMF, CDF (P(X <= k)) e sobrevivência (P(X > k)) de Poisson(λ) para k em [k_min, k_max]."""
+
+    __slots__ = ("lam", "k_min", "pmf", "cdf", "sf")
+
+    def __init__(self, lam):
+        from scipy.special import pdtr, pdtrc
+        self.lam = lam
+        self.k_min, k_max = _extremos(lam)
+        k = np.arange(self.k_min, k_max + 1)
+        if k_max < LIMITE_LOG_FATORIAL:
+            self.pmf = np.exp(k * math.log(lam) - lam - log_fatorial(k))
+        else:
+            # Para λ muito grande k·log(λ) e log(k!) se cancelam e a forma
+            # logarítmica perde precisão; o SciPy usa um algoritmo estável
+            from scipy.stats import poisson
+            self.pmf = poisson.pmf(k, lam)
+        # CDF e sobrevivência pela gama incompleta: somas acumuladas da PMF
+        # perderiam precisão perto de 1 e nas caudas
+        self.cdf = pdtr(k, lam)
+        self.sf = pdtrc(k, lam)
+
+    @property
+    def k_max(self):
+        return self.k_min + self.pmf.size - 1
+
+    @property
+    def memoria(self):
+        return self.pmf.nbytes + self.cdf.nbytes + self.sf.nbytes
+
+
+class CachePoisson:
+    """
+    Cache LRU de TabelaPoisson, limitado a `max_tabelas` tabelas e
+    `max_bytes` bytes. Expõe acertos, falhas, taxa de acerto e memória usada.
+    Seguro para uso a partir de várias threads.
+
+    λ cuja tabela teria mais de `largura_maxima` valores, ou ocuparia mais de
+    `max_bytes`, não ganha tabela: as consultas são calculadas diretamente.
+    """
+
+    def __init__(self, max_tabelas=256, max_bytes=64 << 20, largura_maxima=LARGURA_MAXIMA_TABELA):
+        self.max_tabelas = max_tabelas
+        self.max_bytes = max_bytes
+        self.largura_maxima = largura_maxima
+        self._tabelas = OrderedDict()
+        self._trava = threading.Lock()
+        self.memoria = 0
+        self.acertos = 0
+        self.falhas = 0
+
+    def tabela(self, lam):
+        """TabelaPoisson de λ, ou None se λ é grande demais para ter tabela."""
+        lam = float(lam)
+        if not lam > 0 or math.isinf(lam):
+            raise ValueError("Lambda (λ) deve ser um número finito > 0.")
+        largura = largura_tabela(lam)
+        if largura > self.largura_maxima or 24 * largura > self.max_bytes:
+            return None
+        with self._trava:
+            tabela = self._tabelas.get(lam)
+            if tabela is not None:
+                self.acertos += 1
+                self._tabelas.move_to_end(lam)
+                return tabela
+            self.falhas += 1
+        # Montada fora da trava: outras consultas não esperam por ela
+        tabela = TabelaPoisson(lam)
+        with self._trava:
+            if lam not in self._tabelas:
+                self._tabelas[lam] = tabela
+                self.memoria += tabela.memoria
+            while len(self._tabelas) > self.max_tabelas or self.memoria > self.max_bytes:
+                _, antiga = self._tabelas.popitem(last=False)
+                self.memoria -= antiga.memoria
+        return tabela
+
+    def limpar(self):
+        with self._trava:
+            self._tabelas.clear()
+            self.memoria = 0
+
+    @property
+    def taxa_acerto(self):
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def estatisticas(self):
+        # A tabela de log-fatoriais é compartilhada por todas as tabelas de λ
+        return {
+            "tabelas": len(self._tabelas),
+            "memoria_bytes": self.memoria + _log_fatorial.nbytes,
+            "memoria_log_fatorial_bytes": _log_fatorial.nbytes,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": self.taxa_acerto,
+        }
+
+    def _consultar(self, lam, k, coluna, fora_abaixo, fora_acima, exato):
+        tabela = self.tabela(lam)
+        k = np.asarray(k)
+        if np.issubdtype(k.dtype, np.floating):
+            inteiro = k == np.floor(k)
+            k = np.floor(k)
+        else:
+            inteiro = np.ones(k.shape, dtype=bool)
+        if tabela is None:
+            lam = float(lam)
+            resultado = np.where(k < 0, fora_abaixo, exato(np.where(k < 0, 0, k), lam))
+            return resultado, inteiro
+        indices = k.astype(np.int64) - tabela.k_min
+        dentro = (indices >= 0) & (indices < tabela.pmf.size)
+        resultado = getattr(tabela, coluna)[np.clip(indices, 0, tabela.pmf.size - 1)]
+        resultado = np.where(k < 0, fora_abaixo, resultado)
+        fora = ~dentro & (k >= 0)
+        if fora.any():
+            resultado = np.where(fora, exato(np.where(fora, k, 0), tabela.lam), resultado)
+        return resultado, inteiro
+
+    def pmf(self, lam, k):
+        """P(X = k) para um array de k."""
+        resultado, inteiro = self._consultar(lam, k, "pmf", 0.0, 0.0, _pmf_direta)
+        return np.where(inteiro, resultado, 0.0)[()]
+
+    def cdf(self, lam, k):
+        """P(X <= k) para um array de k."""
+        from scipy.special import pdtr
+        return self._consultar(lam, k, "cdf", 0.0, 1.0, pdtr)[0][()]
+
+    def sf(self, lam, k):
+        """P(X > k) para um array de k (mesma convenção de scipy.stats)."""
+        from scipy.special import pdtrc
+        return self._consultar(lam, k, "sf", 1.0, 0.0, pdtrc)[0][()]
+
+    def cauda(self, lam, k):
+        """P(X >= k) para um array de k."""
+        return self.sf(lam, np.ceil(np.asarray(k, dtype=np.float64)) - 1)
+
+    def ppf(self, lam, q):
+        """Inversa da CDF: menor k com P(X <= k) >= q, para um array de q."""
+        tabela = self.tabela(lam)
+        q = np.asarray(q, dtype=np.float64)
+        if tabela is None:
+            dentro = (q > 0) & (q < 1)
+            k = _ppf_direta(np.where(dentro, q, 0.5), float(lam))
+            k = np.where(q == 0, -1.0, np.where(q == 1, np.inf, k))
+            return np.where((q < 0) | (q > 1) | np.isnan(q), np.nan, k)[()]
+        posicoes = np.searchsorted(tabela.cdf, q, side="left")
+        k = (posicoes + tabela.k_min).astype(np.float64)
+        # q abaixo da primeira entrada da tabela ou acima da última: caso raro, delegado ao SciPy
+        fora = (posicoes >= tabela.cdf.size) | ((posicoes == 0) & (tabela.k_min > 0))
+        if fora.any():
+            from scipy.stats import poisson
+            k = np.where(fora, poisson.ppf(q, tabela.lam), k)
+        # Mesmas convenções de scipy.stats.poisson.ppf nos extremos
+        k = np.where(q == 0, -1.0, np.where(q == 1, np.inf, k))
+        return np.where((q < 0) | (q > 1) | np.isnan(q), np.nan, k)[()]
+
+
+cache_poisson = CachePoisson()
+
+
+def poisson_pmf(k, lam):
+    """P(X = k) para X ~ Poisson(λ), usando o cache global de tabelas."""
+    return cache_poisson.pmf(lam, k)
+
+
+def poisson_cdf(k, lam):
+    """P(X <= k) para X ~ Poisson(λ), usando o cache global de tabelas."""
+    return cache_poisson.cdf(lam, k)
+
+
+def poisson_sf(k, lam):
+    """P(X > k) para X ~ Poisson(λ), usando o cache global de tabelas."""
+    return cache_poisson.sf(lam, k)
+
+
+def poisson_ppf(q, lam):
+    """Inversa da CDF de Poisson(λ), usando o cache global de tabelas."""
+    return cache_poisson.ppf(lam, q)
@@ -0,0 +1,29 @@
+"""
+Importação antecipada, em segundo plano, das dependências pesadas.
+
+O pacote importa SciPy apenas dentro das funções que o usam, para que abrir
+uma interface não espere por ele. Depois de mostrar a janela, a interface
+chama `precarregar`, e os módulos são importados em uma thread enquanto o
+usuário digita; se um cálculo chegar antes, a trava de importação do Python
+faz com que ele apenas aguarde a importação em andamento.
+"""
+import importlib
+import threading
+
+MODULOS_PESADOS = ("scipy.special",)
+
+
+def _importar(modulos):
+    for nome in modulos:
+        try:
+            importlib.import_module(nome)
+        except Exception:
+            # O erro reaparece, com a mensagem correta, no primeiro uso
+            pass
+
+
+def precarregar(modulos=MODULOS_PESADOS):
+    """Importa `modulos` em uma thread daemon e devolve a thread."""
+    thread = threading.Thread(target=_importar, args=(tuple(modulos),), name="precarga", daemon=True)
+    thread.start()
+    return thread
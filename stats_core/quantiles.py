@@ -0,0 +1,121 @@
+"""
+Quantis aproximados em memória limitada (sketch KLL).
+
+O sketch KLL (Karnin, Lang e Liberty, 2016) guarda os valores em níveis; um
+item no nível h representa 2**h valores originais. Quando um nível enche, ele
+é ordenado e metade dos itens (os de posição par ou ímpar, escolhida ao acaso)
+sobe para o nível seguinte. Com `k` itens no nível mais alto o erro de posição
+(rank) normalizado fica em torno de 2.3 / k**0.97, independentemente de n, e
+dois sketches podem ser combinados entre blocos e processos.
+"""
+import math
+
+import numpy as np
+
+K_PADRAO = 200
+_FATOR_CAPACIDADE = 2 / 3
+
+
+class KLL:
+    """Sketch de quantis combinável com parâmetro de precisão `k`."""
+
+    __slots__ = ("k", "n", "niveis", "_rng")
+
+    def __init__(self, k=K_PADRAO, semente=None):
+        self.k = k
+        self.n = 0
+        self.niveis = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(semente)
+
+    def _capacidade(self, nivel):
+        profundidade = len(self.niveis) - 1 - nivel
+        return max(2, int(math.ceil(self.k * _FATOR_CAPACIDADE ** profundidade)))
+
+    def atualizar(self, bloco):
+        bloco = np.asarray(bloco, dtype=np.float64).ravel()
+        # NaN não tem posição definida na ordenação e é descartado
+        bloco = bloco[~np.isnan(bloco)]
+        self.niveis[0] = np.concatenate((self.niveis[0], bloco))
+        self.n += bloco.size
+        self._compactar()
+        return self
+
+    def combinar(self, outro):
+        while len(self.niveis) < len(outro.niveis):
+            self.niveis.append(np.empty(0, dtype=np.float64))
+        for h, itens in enumerate(outro.niveis):
+            self.niveis[h] = np.concatenate((self.niveis[h], itens))
+        self.n += outro.n
+        self._compactar()
+        return self
+
+    def _compactar(self):
+        h = 0
+        while h < len(self.niveis):
+            itens = self.niveis[h]
+            if itens.size > self._capacidade(h):
+                if h + 1 == len(self.niveis):
+                    self.niveis.append(np.empty(0, dtype=np.float64))
+                itens = np.sort(itens)
+                # Com tamanho ímpar um item fica no nível atual
+                sobra = itens[:itens.size % 2]
+                pares = itens[itens.size % 2:]
+                promovidos = pares[self._rng.integers(2)::2]
+                self.niveis[h] = sobra
+                self.niveis[h + 1] = np.concatenate((self.niveis[h + 1], promovidos))
+                # A capacidade dos níveis inferiores muda quando um nível é criado
+                h = 0
+                continue
+            h += 1
+
+    def _itens_ponderados(self):
+        valores = np.concatenate(self.niveis)
+        pesos = np.concatenate([np.full(itens.size, 1 << h, dtype=np.int64)
+                                for h, itens in enumerate(self.niveis)])
+        ordem = np.argsort(valores, kind="stable")
+        return valores[ordem], np.cumsum(pesos[ordem])
+
+    def quantis(self, qs):
+        """Valores aproximados dos quantis `qs` (entre 0 e 1)."""
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        valores, acumulado = self._itens_ponderados()
+        posicoes = np.searchsorted(acumulado, qs * acumulado[-1], side="left")
+        return valores[np.minimum(posicoes, valores.size - 1)]
+
+    def quantil(self, q):
+        return float(self.quantis([q])[0])
+
+    def rank(self, valores):
+        """Fração aproximada dos dados <= cada valor."""
+        itens, acumulado = self._itens_ponderados()
+        if itens.size == 0:
+            return np.full(np.shape(valores), np.nan)
+        posicoes = np.searchsorted(itens, valores, side="right")
+        contagem = np.where(posicoes > 0, acumulado[np.maximum(posicoes - 1, 0)], 0)
+        return contagem / acumulado[-1]
+
+    @property
+    def erro_rank(self):
+        """
+        Erro de rank normalizado esperado (aproximação empírica publicada
+        pelo projeto Apache DataSketches para o KLL, confiança de 99%).
+        """
+        return 2.296 / self.k ** 0.9723
+
+    @property
+    def tamanho(self):
+        """Número de itens retidos pelo sketch."""
+        return sum(itens.size for itens in self.niveis)
+
+
+def erro_rank_observado(sketch, dados, qs=(0.5, 0.9, 0.99)):
+    """
+    Maior diferença entre o quantil pedido e o rank real do valor devolvido
+    pelo sketch. Exige os dados completos; útil para verificação e benchmarks.
+    """
+    ordenado = np.sort(np.asarray(dados, dtype=np.float64))
+    estimados = sketch.quantis(qs)
+    ranks = np.searchsorted(ordenado, estimados, side="right") / ordenado.size
+    return float(np.max(np.abs(ranks - np.asarray(qs))))
@@ -0,0 +1,463 @@
+"""
+Regressão linear simples incremental.
+
+AcumuladorRegressao guarda as estatísticas suficientes da regressão (n,
+médias de x e y e os co-momentos centrados Sxx, Syy e Sxy, equivalentes a
+Σx, Σy, Σx², Σy² e Σxy, mas sem o cancelamento numérico das somas brutas).
+Pontos podem ser adicionados, removidos e acumuladores combinados; inclinação,
+intercepto, R², valor-p e erros padrão saem em tempo constante, com os mesmos
+valores de scipy.stats.linregress.
+
+AcumuladorMultiplo generaliza a ideia para p preditores: guarda o vetor de
+médias e a matriz (p + 1) × (p + 1) de co-momentos centrados de [X, y], o
+equivalente centrado de XᵀX e Xᵀy. A memória é proporcional a p², não ao
+número de linhas, e o sistema é resolvido uma única vez no final;
+`regressao_arquivo` acumula um arquivo com uma observação por linha, em
+blocos e opcionalmente em vários processos.
+"""
+import math
+import os
+import re
+
+import numpy as np
+
+from stats_core.parallel import FIM_DE_LINHA, dividir_arquivo, mapear, numero_de_processos, verificar_cancelamento
+from stats_core.parsing import ParseError
+from stats_core.streaming import (LIMIAR_PARALELO_BYTES, TAMANHO_BLOCO_BYTES, contar_colunas,
+                                  detectar_cabecalho, ler_linhas)
+
+# Acima deste número de condição (da matriz de correlação dos preditores) os
+# preditores são tratados como colineares
+LIMITE_CONDICAO = 1e12
+
+
+class AcumuladorRegressao:
+    """Estatísticas suficientes combináveis de uma regressão de y em x."""
+
+    __slots__ = ("n", "media_x", "media_y", "sxx", "syy", "sxy")
+
+    def __init__(self, n=0, media_x=0.0, media_y=0.0, sxx=0.0, syy=0.0, sxy=0.0):
+        self.n = n
+        self.media_x = media_x
+        self.media_y = media_y
+        self.sxx = sxx
+        self.syy = syy
+        self.sxy = sxy
+
+    @classmethod
+    def de_dados(cls, x, y):
+        """Acumulador exato (duas passadas) de um lote de pontos."""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if x.size != y.size:
+            raise ValueError("X e Y devem ter o mesmo tamanho.")
+        if x.size == 0:
+            return cls()
+        media_x, media_y = float(x.mean()), float(y.mean())
+        dx, dy = x - media_x, y - media_y
+        return cls(x.size, media_x, media_y, float(dx @ dx), float(dy @ dy), float(dx @ dy))
+
+    def copia(self):
+        return AcumuladorRegressao(self.n, self.media_x, self.media_y, self.sxx, self.syy, self.sxy)
+
+    def adicionar(self, x, y):
+        """Adiciona um ponto (escalares) ou um lote de pontos (arrays)."""
+        if np.ndim(x) == 0 and np.ndim(y) == 0:
+            # Atualização de Welford para um único ponto
+            x, y = float(x), float(y)
+            self.n += 1
+            dx = x - self.media_x
+            dy = y - self.media_y
+            self.media_x += dx / self.n
+            self.media_y += dy / self.n
+            self.sxx += dx * (x - self.media_x)
+            self.syy += dy * (y - self.media_y)
+            self.sxy += dx * (y - self.media_y)
+            return self
+        return self.combinar(AcumuladorRegressao.de_dados(x, y))
+
+    def combinar(self, outro):
+        """Une outro acumulador a este (fórmula de Chan et al. para co-momentos)."""
+        if outro.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.media_x, self.media_y = outro.n, outro.media_x, outro.media_y
+            self.sxx, self.syy, self.sxy = outro.sxx, outro.syy, outro.sxy
+            return self
+        n = self.n + outro.n
+        dx = outro.media_x - self.media_x
+        dy = outro.media_y - self.media_y
+        fator = self.n * outro.n / n
+        self.sxx += outro.sxx + dx * dx * fator
+        self.syy += outro.syy + dy * dy * fator
+        self.sxy += outro.sxy + dx * dy * fator
+        self.media_x += dx * outro.n / n
+        self.media_y += dy * outro.n / n
+        self.n = n
+        return self
+
+    def remover(self, x, y):
+        """Remove um ponto (escalares) ou um lote de pontos (arrays) já adicionados."""
+        if np.ndim(x) == 0 and np.ndim(y) == 0 and self.n > 1:
+            # Welford ao contrário
+            x, y = float(x), float(y)
+            n_resto = self.n - 1
+            media_x = (self.n * self.media_x - x) / n_resto
+            media_y = (self.n * self.media_y - y) / n_resto
+            self.sxx = max(self.sxx - (x - media_x) * (x - self.media_x), 0.0)
+            self.syy = max(self.syy - (y - media_y) * (y - self.media_y), 0.0)
+            self.sxy -= (x - media_x) * (y - self.media_y)
+            self.media_x, self.media_y, self.n = media_x, media_y, n_resto
+            return self
+        parte = AcumuladorRegressao.de_dados(np.atleast_1d(x), np.atleast_1d(y))
+        if parte.n == 0:
+            return self
+        if parte.n > self.n:
+            raise ValueError("Não é possível remover mais pontos do que foram adicionados.")
+        if parte.n == self.n:
+            self.__init__()
+            return self
+        # Inverso da combinação: self = resto + parte
+        n_resto = self.n - parte.n
+        media_x = (self.n * self.media_x - parte.n * parte.media_x) / n_resto
+        media_y = (self.n * self.media_y - parte.n * parte.media_y) / n_resto
+        dx = parte.media_x - media_x
+        dy = parte.media_y - media_y
+        fator = n_resto * parte.n / self.n
+        self.sxx = max(self.sxx - parte.sxx - dx * dx * fator, 0.0)
+        self.syy = max(self.syy - parte.syy - dy * dy * fator, 0.0)
+        self.sxy -= parte.sxy + dx * dy * fator
+        self.media_x, self.media_y, self.n = media_x, media_y, n_resto
+        return self
+
+    def resultado(self):
+        """
+        Inclinação, intercepto, r, R², valor-p (bicaudal, H0: inclinação = 0) e
+        erros padrão da inclinação e do intercepto, como em scipy.stats.linregress.
+        """
+        from scipy.special import stdtr
+        if self.n < 2:
+            raise ValueError("A regressão requer pelo menos dois pontos.")
+        if self.sxx == 0:
+            raise ValueError("Não é possível calcular a regressão: todos os valores de X são iguais.")
+        n = self.n
+        inclinacao = self.sxy / self.sxx
+        intercepto = self.media_y - inclinacao * self.media_x
+        # Com Y constante r é indefinido (NaN), como no linregress atual
+        if self.syy == 0:
+            r = math.nan
+        else:
+            r = max(-1.0, min(1.0, self.sxy / math.sqrt(self.sxx * self.syy)))
+        gl = n - 2
+        if n == 2:
+            p_valor = 0.0 if self.syy != 0 else 1.0
+            erro_padrao = 0.0
+        else:
+            if math.isnan(r) or abs(r) < 1:
+                t = r * math.sqrt(gl / ((1.0 - r) * (1.0 + r)))
+            else:
+                t = math.copysign(math.inf, r)
+            p_valor = float(2 * stdtr(gl, -abs(t)))
+            erro_padrao = math.sqrt((1 - r * r) * self.syy / self.sxx / gl)
+        erro_padrao_intercepto = erro_padrao * math.sqrt(self.sxx / n + self.media_x ** 2)
+        return {
+            "n": n,
+            "inclinacao": inclinacao,
+            "intercepto": intercepto,
+            "r": r,
+            "r2": r * r,
+            "p_valor": p_valor,
+            "erro_padrao": erro_padrao,
+            "erro_padrao_intercepto": erro_padrao_intercepto,
+        }
+
+
+# Séries processadas por vez em regressao_lote (limita as cópias temporárias)
+SERIES_POR_BLOCO = 4096
+
+
+def regressao_lote(x, y, series_por_bloco=SERIES_POR_BLOCO):
+    """
+    Regressão de cada linha de `y` (shape (séries, amostras)) contra o mesmo
+    vetor `x`, com poucas reduções vetorizadas em vez de um linregress por
+    série. Retorna as chaves de AcumuladorRegressao.resultado, cada uma com um
+    array de tamanho "séries" (exceto "n").
+    """
+    from scipy.special import stdtr
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64)
+    if y.ndim == 1:
+        y = y[np.newaxis, :]
+    if y.ndim != 2 or y.shape[1] != x.size:
+        raise ValueError("Y deve ter shape (séries, amostras), com tantas amostras quanto X.")
+    n = x.size
+    if n < 2:
+        raise ValueError("A regressão requer pelo menos dois pontos.")
+    media_x = x.mean()
+    dx = x - media_x
+    sxx = float(dx @ dx)
+    if sxx == 0:
+        raise ValueError("Não é possível calcular a regressão: todos os valores de X são iguais.")
+
+    # Σ dx = 0, logo Sxy = Σ dx·y dispensa centrar y; Syy é calculado em
+    # blocos de séries para não alocar uma cópia centrada da matriz inteira
+    media_y = y.mean(axis=1)
+    sxy = y @ dx
+    syy = np.empty(y.shape[0])
+    for inicio in range(0, y.shape[0], series_por_bloco):
+        centrado = y[inicio:inicio + series_por_bloco] - media_y[inicio:inicio + series_por_bloco, np.newaxis]
+        syy[inicio:inicio + series_por_bloco] = np.einsum("ij,ij->i", centrado, centrado)
+
+    inclinacao = sxy / sxx
+    intercepto = media_y - inclinacao * media_x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+        r[syy == 0] = np.nan
+        gl = n - 2
+        if n == 2:
+            p_valor = np.where(syy != 0, 0.0, 1.0)
+            erro_padrao = np.zeros_like(r)
+        else:
+            t = r * np.sqrt(gl / ((1.0 - r) * (1.0 + r)))
+            p_valor = 2 * stdtr(gl, -np.abs(t))
+            erro_padrao = np.sqrt((1 - r * r) * syy / sxx / gl)
+    return {
+        "n": n,
+        "inclinacao": inclinacao,
+        "intercepto": intercepto,
+        "r": r,
+        "r2": r * r,
+        "p_valor": p_valor,
+        "erro_padrao": erro_padrao,
+        "erro_padrao_intercepto": erro_padrao * math.sqrt(sxx / n + media_x ** 2),
+    }
+
+
+class RegressaoIncremental:
+    """
+    Mantém um AcumuladorRegressao sincronizado com as listas X e Y de uma
+    interface. A cada chamada de `sincronizar` só o trecho que mudou desde a
+    chamada anterior (entre o maior prefixo e o maior sufixo em comum) é
+    removido e adicionado: editar, inserir ou apagar valores em qualquer
+    posição custa O(pontos alterados) em atualizações do acumulador, além de
+    uma comparação vetorizada das listas. Como remoções acumulam erro de
+    arredondamento, o acumulador é recalculado do zero depois de
+    `limite_remocoes` × n remoções.
+    """
+
+    __slots__ = ("acumulador", "x", "y", "_remocoes", "limite_remocoes")
+
+    def __init__(self, limite_remocoes=4):
+        self.acumulador = AcumuladorRegressao()
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self._remocoes = 0
+        self.limite_remocoes = limite_remocoes
+
+    def sincronizar(self, x, y):
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if x.size != y.size:
+            raise ValueError("X e Y devem ter o mesmo tamanho.")
+        comum = min(x.size, self.x.size)
+        diferentes = np.flatnonzero((x[:comum] != self.x[:comum]) | (y[:comum] != self.y[:comum]))
+        inicio = int(diferentes[0]) if diferentes.size else comum
+        # Sufixo em comum, sem sobrepor o prefixo: x[fim_novo:] == self.x[fim_antigo:]
+        resto = comum - inicio
+        a, b = slice(x.size - resto, None), slice(self.x.size - resto, None)
+        diferentes = np.flatnonzero((x[a] != self.x[b]) | (y[a] != self.y[b]))
+        sufixo = resto - int(diferentes[-1]) - 1 if diferentes.size else resto
+        fim_novo, fim_antigo = x.size - sufixo, self.x.size - sufixo
+
+        removidos = fim_antigo - inicio
+        self._remocoes += removidos
+        if removidos and self._remocoes > self.limite_remocoes * max(x.size, 1):
+            self.acumulador = AcumuladorRegressao.de_dados(x, y)
+            self._remocoes = 0
+        else:
+            if removidos:
+                self.acumulador.remover(self.x[inicio:fim_antigo], self.y[inicio:fim_antigo])
+            self.acumulador.adicionar(x[inicio:fim_novo], y[inicio:fim_novo])
+        self.x, self.y = x.copy(), y.copy()
+        return self.acumulador
+
+    def resultado(self):
+        return self.acumulador.resultado()
+
+
+class AcumuladorMultiplo:
+    """
+    Estatísticas suficientes combináveis de uma regressão linear múltipla.
+    Cada linha acumulada é [x_1, ..., x_p, y], com a resposta na última coluna.
+    """
+
+    __slots__ = ("n", "media", "comomentos")
+
+    def __init__(self, colunas):
+        self.n = 0
+        self.media = np.zeros(colunas)
+        self.comomentos = np.zeros((colunas, colunas))
+
+    @property
+    def preditores(self):
+        return self.media.size - 1
+
+    def atualizar(self, bloco):
+        """Acumula uma matriz (linhas, p + 1) de observações."""
+        bloco = np.asarray(bloco, dtype=np.float64)
+        if bloco.ndim != 2 or bloco.shape[1] != self.media.size:
+            raise ValueError(f"Cada observação deve ter {self.media.size} valores.")
+        if bloco.shape[0] == 0:
+            return self
+        parte = AcumuladorMultiplo(self.media.size)
+        parte.n = bloco.shape[0]
+        parte.media = bloco.mean(axis=0)
+        centrado = bloco - parte.media
+        parte.comomentos = centrado.T @ centrado
+        return self.combinar(parte)
+
+    def combinar(self, outro):
+        """Une outro acumulador a este (fórmula de Chan et al. em forma matricial)."""
+        if outro.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.media, self.comomentos = outro.n, outro.media.copy(), outro.comomentos.copy()
+            return self
+        n = self.n + outro.n
+        delta = outro.media - self.media
+        self.comomentos = self.comomentos + outro.comomentos + np.outer(delta, delta) * (self.n * outro.n / n)
+        self.media = self.media + delta * (outro.n / n)
+        self.n = n
+        return self
+
+    def resultado(self):
+        """
+        Coeficientes por mínimos quadrados com erros padrão, estatísticas t e
+        valores-p (bicaudais), R², R² ajustado e o teste F global. Com um único
+        preditor os valores coincidem com os de scipy.stats.linregress.
+        """
+        from scipy.special import fdtrc, stdtr
+        p = self.preditores
+        gl = self.n - p - 1
+        if gl < 1:
+            raise ValueError(f"A regressão com {p} preditor(es) requer pelo menos {p + 2} observações.")
+        sxx = self.comomentos[:p, :p]
+        sxy = self.comomentos[:p, p]
+        syy = self.comomentos[p, p]
+        # Resolve pela matriz de correlação dos preditores, bem condicionada
+        # mesmo quando as escalas das colunas diferem muito
+        escala = np.sqrt(np.diag(sxx))
+        if np.any(escala == 0):
+            raise ValueError("Não é possível calcular a regressão: há um preditor constante.")
+        correlacao = sxx / np.outer(escala, escala)
+        if np.linalg.cond(correlacao) > LIMITE_CONDICAO:
+            raise ValueError("Não é possível calcular a regressão: os preditores são colineares.")
+        inversa = np.linalg.inv(correlacao) / np.outer(escala, escala)
+        coeficientes = inversa @ sxy
+        intercepto = self.media[p] - self.media[:p] @ coeficientes
+
+        sq_residuos = max(syy - coeficientes @ sxy, 0.0)
+        variancia = sq_residuos / gl
+        covariancia = variancia * inversa
+        erros = np.sqrt(np.diag(covariancia))
+        erro_intercepto = math.sqrt(variancia / self.n + self.media[:p] @ covariancia @ self.media[:p])
+        r2 = 1 - sq_residuos / syy if syy > 0 else math.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = coeficientes / erros
+            f = np.float64(syy - sq_residuos) / p / variancia if syy > 0 else math.nan
+        return {
+            "n": self.n,
+            "coeficientes": coeficientes,
+            "intercepto": float(intercepto),
+            "erros_padrao": erros,
+            "erro_padrao_intercepto": erro_intercepto,
+            "t": t,
+            "p_valores": 2 * stdtr(gl, -np.abs(t)),
+            "r2": r2,
+            "r2_ajustado": 1 - (1 - r2) * (self.n - 1) / gl,
+            "f": float(f),
+            "p_valor_f": float(fdtrc(p, gl, f)),
+            "gl_residuos": gl,
+        }
+
+
+def regressao_multipla(x, y):
+    """Regressão de y em x (shape (n, p), ou (n,) para um único preditor)."""
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, np.newaxis]
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if x.shape[0] != y.size:
+        raise ValueError("X e Y devem ter o mesmo número de observações.")
+    return AcumuladorMultiplo(x.shape[1] + 1).atualizar(np.column_stack((x, y))).resultado()
+
+
+def _nomes_das_colunas(caminho, colunas):
+    with open(caminho, "rb") as arquivo:
+        cabecalho = arquivo.readline().decode("utf-8", errors="replace").strip()
+    delimitador = "," if "," in cabecalho else ";" if ";" in cabecalho else None
+    nomes = [nome.strip().strip('"') for nome in
+             (cabecalho.split(delimitador) if delimitador else re.split(r"\s+", cabecalho))]
+    return nomes if len(nomes) == colunas else None
+
+
+def _acumular_intervalo(caminho, inicio, fim, tamanho_bloco, colunas, ordem, cancelar=None):
+    acumulador = AcumuladorMultiplo(colunas)
+    try:
+        for bloco in ler_linhas(caminho, colunas, tamanho_bloco, inicio=inicio, fim=fim):
+            verificar_cancelamento(cancelar)
+            acumulador.atualizar(bloco[:, ordem])
+    except (ParseError, ValueError) as e:
+        # Devolvido, e não lançado, como em streaming._resumir_intervalo_ou_erro
+        return e
+    return acumulador
+
+
+def regressao_arquivo(caminho, coluna_y=-1, tamanho_bloco=TAMANHO_BLOCO_BYTES, pular_linhas=None, processos=1,
+                      cancelar=None):
+    """
+    Regressão múltipla de um arquivo com uma observação por linha, lido em
+    blocos: a coluna `coluna_y` é a resposta e as demais são os preditores.
+
+    Retorna as chaves de AcumuladorMultiplo.resultado, mais "nomes" (dos
+    preditores) e "nome_y", tirados do cabeçalho quando ele existe.
+    `pular_linhas`, `processos` e `cancelar` seguem `descrever_arquivo`.
+    """
+    if pular_linhas is None:
+        pular_linhas = detectar_cabecalho(caminho)
+    colunas = contar_colunas(caminho, pular_linhas)
+    if colunas < 2:
+        raise ValueError("O arquivo deve ter pelo menos duas colunas (preditor e resposta).")
+    coluna_y %= colunas
+    ordem = [c for c in range(colunas) if c != coluna_y] + [coluna_y]
+
+    if processos is None:
+        processos = 1 if os.path.getsize(caminho) < LIMIAR_PARALELO_BYTES else numero_de_processos()
+    with open(caminho, "rb") as arquivo:
+        for _ in range(pular_linhas):
+            arquivo.readline()
+        inicio = arquivo.tell()
+    if processos == 1:
+        # No próprio processo o evento vai até o laço de blocos (entre processos, mapear o verifica)
+        parciais = [_acumular_intervalo(caminho, inicio, None, tamanho_bloco, colunas, ordem, cancelar)]
+    else:
+        intervalos = dividir_arquivo(caminho, 4 * processos, inicio, separadores=FIM_DE_LINHA)
+        parciais = mapear(_acumular_intervalo,
+                          [(caminho, a, b, tamanho_bloco, colunas, ordem) for a, b in intervalos], processos,
+                          cancelar)
+    acumulador = AcumuladorMultiplo(colunas)
+    for parcial in parciais:
+        if isinstance(parcial, ParseError):
+            raise ParseError(parcial.token, parcial.indice + acumulador.n * colunas, parcial.posicao)
+        if isinstance(parcial, Exception):
+            raise parcial
+        acumulador.combinar(parcial)
+
+    resultado = acumulador.resultado()
+    nomes = _nomes_das_colunas(caminho, colunas) if pular_linhas else None
+    if nomes is None:
+        nomes = [f"X{c + 1}" for c in range(colunas)]
+        nomes[coluna_y] = "Y"
+    resultado["nomes"] = [nomes[c] for c in ordem[:-1]]
+    resultado["nome_y"] = nomes[coluna_y]
+    return resultado
@@ -0,0 +1,322 @@
+"""
+Reamostragem vetorizada: testes de permutação para ANOVA e regressão e
+intervalos de confiança bootstrap para as estatísticas descritivas.
+
+As permutações são geradas em lotes: cada lote é uma matriz (B, N) com B
+embaralhamentos independentes dos dados (Generator.permuted ao longo do eixo
+1), e a estatística dos B embaralhamentos sai de poucas reduções do NumPy.
+Os lotes são distribuídos entre processos; cada lote tem seu próprio fluxo
+aleatório, derivado de um SeedSequence, de modo que o resultado depende só da
+semente e não do número de processos. Com `precisao` e/ou `alfa` o teste para
+assim que o intervalo de confiança (Clopper–Pearson) do valor-p fica estreito
+o bastante ou deixa de conter `alfa`.
+
+O bootstrap segue o mesmo esquema: cada lote é uma matriz (B, n) de índices
+sorteados com reposição, com B limitado para que o lote caiba em
+`memoria_lote` bytes, e média, mediana, variância e desvio padrão das B
+reamostras são calculados de uma vez. Os intervalos são o percentil e o BCa
+(com correção de viés e aceleração estimada por jackknife).
+
+Os dados de cada teste (o "estado": valores, estatística observada etc.) são
+passados explicitamente às funções de lote. Em um pool de processos o estado
+vai uma vez para cada processo, pelo inicializador, e as tarefas levam só a
+semente e o tamanho do lote; no próprio processo nada é global, e testes
+simultâneos em threads diferentes não interferem entre si.
+"""
+import functools
+from collections import deque
+
+import numpy as np
+
+from stats_core.parallel import (CalculoCancelado, ExecutorLocal, aguardar, criar_executor, numero_de_processos,
+                                 verificar_cancelamento)
+
+PERMUTACOES_PADRAO = 10_000
+
+# Permutações por lote e memória máxima de cada matriz de permutações
+PERMUTACOES_POR_LOTE = 1_000
+MEMORIA_LOTE = 32 << 20
+
+# Reamostras padrão do bootstrap e estatísticas calculadas (chaves de `descrever`)
+REAMOSTRAS_PADRAO = 2_000
+ESTATISTICAS_BOOTSTRAP = ("media", "mediana", "variancia", "desvio_padrao")
+
+# Abaixo deste número de valores sorteados (reamostras × n) o bootstrap
+# automático roda em um único processo
+LIMIAR_PARALELO_BOOTSTRAP = 50_000_000
+
+# Tolerância relativa para empates entre a estatística observada e as permutadas
+_TOLERANCIA_EMPATE = 1e-10
+
+# Estado de cada processo de um pool, preenchido por _guardar_estado
+_ESTADO = {}
+
+
+def _f_anova(valores, inicios, tamanhos, sq_total):
+    # F de cada linha de `valores` (dados centrados na média geral, grupos contíguos)
+    somas = np.add.reduceat(valores, inicios, axis=-1)
+    sq_entre = (somas * somas / tamanhos).sum(axis=-1)
+    k, n = tamanhos.size, valores.shape[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (sq_entre / (k - 1)) / ((sq_total - sq_entre) / (n - k))
+
+
+def _estatistica(estado, valores):
+    if estado["tipo"] == "anova":
+        return _f_anova(valores, estado["inicios"], estado["tamanhos"], estado["sq_total"])
+    # Regressão: |Σ dx·y| é proporcional a |inclinação| e a |r|
+    return np.abs(valores @ estado["dx"])
+
+
+def _guardar_estado(estado):
+    # Inicializador de cada processo do pool: os dados ficam no processo e
+    # cada tarefa recebe apenas a semente e o tamanho do lote
+    _ESTADO.clear()
+    _ESTADO.update(estado)
+
+
+def _no_processo(lote, semente, tamanho):
+    return lote(_ESTADO, semente, tamanho)
+
+
+def _criar_executor(processos, lote, estado):
+    # (executor, tarefa): tarefa(semente, tamanho) roda `lote` com `estado`
+    if numero_de_processos(processos) <= 1:
+        return ExecutorLocal(), functools.partial(lote, estado)
+    return criar_executor(processos, _guardar_estado, (estado,)), functools.partial(_no_processo, lote)
+
+
+def _lote(estado, semente, tamanho):
+    rng = np.random.default_rng(semente)
+    valores = estado["valores"]
+    permutados = rng.permuted(np.broadcast_to(valores, (tamanho, valores.size)), axis=1)
+    observado = estado["observado"]
+    return int(np.count_nonzero(_estatistica(estado, permutados) >= observado * (1 - _TOLERANCIA_EMPATE)))
+
+
+def intervalo_p_valor(extremos, permutacoes, confianca=0.99):
+    """Intervalo de Clopper–Pearson para a proporção extremos / permutacoes."""
+    from scipy.special import betaincinv
+    a = (1 - confianca) / 2
+    inferior = betaincinv(extremos, permutacoes - extremos + 1, a) if extremos > 0 else 0.0
+    superior = betaincinv(extremos + 1, permutacoes - extremos, 1 - a) if extremos < permutacoes else 1.0
+    return float(inferior), float(superior)
+
+
+def _executar(tipo, valores, extras, permutacoes, semente, processos, precisao, alfa, confianca, cancelar):
+    tamanho_lote = max(1, min(PERMUTACOES_POR_LOTE, MEMORIA_LOTE // (16 * valores.size)))
+    tamanhos = [min(tamanho_lote, permutacoes - i) for i in range(0, permutacoes, tamanho_lote)]
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    processos = numero_de_processos(processos)
+
+    estado = dict(extras, tipo=tipo, valores=valores)
+    estado["observado"] = float(_estatistica(estado, valores))
+
+    extremos = feitas = 0
+    parou_cedo = False
+    executor, tarefa = _criar_executor(processos, _lote, estado)
+    cancelado = False
+    try:
+        em_andamento = deque()
+        proximo = 0
+        while proximo < len(tamanhos) or em_andamento:
+            verificar_cancelamento(cancelar)
+            # Até dois lotes por processo em andamento; os resultados são
+            # consumidos na ordem dos lotes, o que torna a parada determinística
+            while proximo < len(tamanhos) and len(em_andamento) < (1 if processos == 1 else 2 * processos):
+                em_andamento.append((executor.submit(tarefa, sementes[proximo], tamanhos[proximo]),
+                                     tamanhos[proximo]))
+                proximo += 1
+            futuro, tamanho = em_andamento.popleft()
+            extremos += aguardar(futuro, cancelar)
+            feitas += tamanho
+            if feitas < permutacoes and (precisao is not None or alfa is not None):
+                inferior, superior = intervalo_p_valor(extremos, feitas, confianca)
+                if ((precisao is not None and (superior - inferior) / 2 <= precisao)
+                        or (alfa is not None and (superior < alfa or inferior > alfa))):
+                    parou_cedo = True
+                    break
+    except CalculoCancelado:
+        cancelado = True
+        raise
+    finally:
+        # Cancelado, os lotes que já rodam em outros processos terminam em segundo plano
+        executor.shutdown(wait=not cancelado, cancel_futures=True)
+
+    return {
+        "p_valor": (extremos + 1) / (feitas + 1),
+        "ic_p_valor": intervalo_p_valor(extremos, feitas, confianca),
+        "permutacoes": feitas,
+        "extremos": extremos,
+        "parou_cedo": parou_cedo,
+    }
+
+
+def permutacao_anova(grupos, permutacoes=PERMUTACOES_PADRAO, semente=None, processos=1,
+                     precisao=None, alfa=None, confianca=0.99, cancelar=None):
+    """
+    Teste de permutação da ANOVA de um fator: os rótulos de grupo são
+    embaralhados e o valor-p é a fração de estatísticas F permutadas >= à
+    observada, (extremos + 1) / (permutações + 1).
+
+    Retorna "f" (observado), "p_valor", "ic_p_valor" (intervalo de confiança
+    `confianca` do valor-p de Monte Carlo), "permutacoes", "extremos" e
+    "parou_cedo". Com `precisao` o teste para quando a meia-largura do
+    intervalo fica <= `precisao`; com `alfa`, quando o intervalo não contém
+    `alfa` (a decisão ao nível `alfa` já não muda). Com `cancelar`
+    (threading.Event) sinalizado, para no próximo lote com CalculoCancelado.
+    """
+    grupos = [np.asarray(g, dtype=np.float64).ravel() for g in grupos]
+    grupos = [g for g in grupos if g.size]
+    if len(grupos) < 2:
+        raise ValueError("ANOVA requer pelo menos dois grupos.")
+    valores = np.concatenate(grupos)
+    if valores.size <= len(grupos):
+        raise ValueError("ANOVA requer mais observações do que grupos.")
+    valores = valores - valores.mean()
+    tamanhos = np.array([g.size for g in grupos], dtype=np.float64)
+    extras = {
+        "inicios": np.concatenate(([0], np.cumsum(tamanhos[:-1]))).astype(np.intp),
+        "tamanhos": tamanhos,
+        "sq_total": float(valores @ valores),
+    }
+    observado = _f_anova(valores, extras["inicios"], tamanhos, extras["sq_total"])
+    resultado = _executar("anova", valores, extras, permutacoes, semente, processos, precisao, alfa, confianca,
+                          cancelar)
+    return {"f": float(observado), **resultado}
+
+
+def permutacao_regressao(x, y, permutacoes=PERMUTACOES_PADRAO, semente=None, processos=1,
+                         precisao=None, alfa=None, confianca=0.99, cancelar=None):
+    """
+    Teste de permutação bicaudal da inclinação de uma regressão linear
+    simples (H0: y não depende de x): os valores de y são embaralhados em
+    relação a x. Retorna "inclinacao" e "r" observados e as mesmas chaves de
+    `permutacao_anova`.
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if x.size != y.size or x.size < 3:
+        raise ValueError("X e Y devem ter o mesmo tamanho e pelo menos três pontos.")
+    dx = x - x.mean()
+    sxx = float(dx @ dx)
+    if sxx == 0:
+        raise ValueError("Não é possível calcular a regressão: todos os valores de X são iguais.")
+    valores = y - y.mean()
+    syy = float(valores @ valores)
+    sxy = float(valores @ dx)
+    resultado = _executar("regressao", valores, {"dx": dx}, permutacoes, semente, processos,
+                          precisao, alfa, confianca, cancelar)
+    r = sxy / np.sqrt(sxx * syy) if syy > 0 else np.nan
+    return {"inclinacao": sxy / sxx, "r": float(r), **resultado}
+
+
+def _estatisticas_bootstrap(amostras):
+    # (B, n) -> (B, len(ESTATISTICAS_BOOTSTRAP)), na ordem de ESTATISTICAS_BOOTSTRAP
+    variancia = amostras.var(axis=-1)
+    return np.stack((amostras.mean(axis=-1), np.median(amostras, axis=-1),
+                     variancia, np.sqrt(variancia)), axis=-1)
+
+
+def _jackknife(dados):
+    # Estatísticas de cada amostra com um valor removido, em O(n) por estatística
+    n = dados.size
+    media = dados.mean()
+    desvios = dados - media
+    m2 = desvios @ desvios
+    medias = (n * media - dados) / (n - 1)
+    variancias = np.maximum(m2 - desvios * desvios * n / (n - 1), 0.0) / (n - 1)
+
+    # Sem o i-ésimo valor ordenado, a posição j do restante é ordenado[j] se
+    # j < i e ordenado[j + 1] caso contrário
+    ordenado = np.sort(dados)
+    i = np.arange(n)
+    m = n - 1
+
+    def posicao(j):
+        return np.where(j < i, ordenado[j], ordenado[min(j + 1, n - 1)])
+
+    if m % 2:
+        medianas = posicao(m // 2)
+    else:
+        medianas = (posicao(m // 2 - 1) + posicao(m // 2)) / 2
+    return np.stack((medias, medianas, variancias, np.sqrt(variancias)), axis=-1)
+
+
+def _lote_bootstrap(estado, semente, tamanho):
+    rng = np.random.default_rng(semente)
+    dados = estado["valores"]
+    indices = rng.integers(0, dados.size, size=(tamanho, dados.size))
+    return _estatisticas_bootstrap(dados[indices])
+
+
+def _intervalo_bca(replicas, estimativa, jackknife, alfa):
+    # Correção de viés pela fração de réplicas abaixo da estimativa (empates contam metade)
+    from scipy.special import ndtr, ndtri
+    fracao = (np.count_nonzero(replicas < estimativa)
+              + 0.5 * np.count_nonzero(replicas == estimativa)) / replicas.size
+    if not 0 < fracao < 1:
+        return (np.nan, np.nan)
+    z0 = ndtri(fracao)
+    desvios = jackknife.mean() - jackknife
+    soma_quadrados = desvios @ desvios
+    aceleracao = (desvios ** 3).sum() / (6 * soma_quadrados ** 1.5) if soma_quadrados > 0 else 0.0
+    z = ndtri(np.array([alfa / 2, 1 - alfa / 2]))
+    niveis = ndtr(z0 + (z0 + z) / (1 - aceleracao * (z0 + z)))
+    return tuple(np.quantile(replicas, niveis).tolist())
+
+
+def bootstrap_descritivo(dados, reamostras=REAMOSTRAS_PADRAO, confianca=0.95, semente=None, processos=1,
+                         memoria_lote=MEMORIA_LOTE, cancelar=None):
+    """
+    Intervalos de confiança bootstrap para média, mediana, variância e desvio
+    padrão (populacionais, como em `descrever`).
+
+    Retorna {"reamostras", "confianca"} e, para cada nome em
+    ESTATISTICAS_BOOTSTRAP, um dicionário com "estimativa", "erro_padrao"
+    (desvio padrão das réplicas), "percentil" e "bca" (pares (inferior,
+    superior)). Cada lote de reamostras ocupa no máximo cerca de
+    `memoria_lote` bytes; o resultado depende só da `semente`, não do número
+    de processos. `processos=None` usa todos os núcleos apenas quando
+    reamostras × n passa de LIMIAR_PARALELO_BOOTSTRAP. Com `cancelar`
+    (threading.Event) sinalizado, para no próximo lote com CalculoCancelado.
+    """
+    dados = np.asarray(dados, dtype=np.float64).ravel()
+    if dados.size < 2:
+        raise ValueError("O bootstrap requer pelo menos dois valores.")
+    if np.isnan(dados).any():
+        raise ValueError("Os dados não podem conter NaN.")
+    # Índices int64, valores reamostrados e a cópia usada pela mediana: ~24 bytes por item
+    tamanho_lote = max(1, min(reamostras, memoria_lote // (24 * dados.size)))
+    tamanhos = [min(tamanho_lote, reamostras - i) for i in range(0, reamostras, tamanho_lote)]
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    if processos is None:
+        processos = 1 if reamostras * dados.size < LIMIAR_PARALELO_BOOTSTRAP else numero_de_processos()
+
+    executor, tarefa = _criar_executor(processos, _lote_bootstrap, {"tipo": "bootstrap", "valores": dados})
+    cancelado = False
+    try:
+        futuros = []
+        for semente_lote, tamanho in zip(sementes, tamanhos):
+            # No próprio processo cada lote roda já no submit
+            verificar_cancelamento(cancelar)
+            futuros.append(executor.submit(tarefa, semente_lote, tamanho))
+        replicas = np.concatenate([aguardar(f, cancelar) for f in futuros])
+    except CalculoCancelado:
+        cancelado = True
+        raise
+    finally:
+        executor.shutdown(wait=not cancelado, cancel_futures=True)
+
+    estimativas = _estatisticas_bootstrap(dados)
+    jackknife = _jackknife(dados)
+    alfa = 1 - confianca
+    resultado = {"reamostras": reamostras, "confianca": confianca}
+    for j, nome in enumerate(ESTATISTICAS_BOOTSTRAP):
+        resultado[nome] = {
+            "estimativa": float(estimativas[j]),
+            "erro_padrao": float(replicas[:, j].std(ddof=1)) if reamostras > 1 else np.nan,
+            "percentil": tuple(np.quantile(replicas[:, j], [alfa / 2, 1 - alfa / 2]).tolist()),
+            "bca": _intervalo_bca(replicas[:, j], estimativas[j], jackknife[:, j], alfa),
+        }
+    return resultado
@@ -0,0 +1,194 @@
+"""
+Tipos de resultado das análises da calculadora.
+
+Cada resultado guarda apenas os números (e, quando faz sentido, referências
+aos vetores de entrada) em `__slots__`, sem montar texto: a formatação para as
+interfaces fica em stats_core.formatacao e só é feita quando pedida
+(`resultado.texto()`). Para uso em lote, `como_dict` e `para_json` convertem o
+resultado em tipos simples do Python, e os objetos podem ser enviados entre
+processos com pickle (vetores numpy vão como dados binários, sem cópia em
+texto).
+"""
+import json
+import math
+
+import numpy as np
+
+
+def _simples(valor):
+    # Converte numpy e tuplas em tipos aceitos por json.dumps
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, dict):
+        return {chave: _simples(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_simples(v) for v in valor]
+    return valor
+
+
+def json_finito(objeto):
+    """
+    `objeto` com NaN e infinitos trocados por None, para json.dumps com
+    allow_nan=False: NaN/Infinity não fazem parte do JSON e parsers estritos
+    os rejeitam. Usado pelos registros do lote e pelas respostas do serviço.
+    """
+    if isinstance(objeto, float):
+        return objeto if math.isfinite(objeto) else None
+    if isinstance(objeto, dict):
+        return {chave: json_finito(valor) for chave, valor in objeto.items()}
+    if isinstance(objeto, (list, tuple)):
+        return [json_finito(valor) for valor in objeto]
+    return objeto
+
+
+class Resultado:
+    """
+    Base dos resultados. As subclasses declaram os campos em `__slots__`;
+    `auxiliares` lista os campos que não são resultados (por exemplo, os
+    vetores de entrada guardados para o gráfico) e ficam fora de `como_dict`.
+    """
+
+    __slots__ = ()
+    tipo = ""
+    auxiliares = ()
+    _campos = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._campos = cls.__base__._campos + tuple(cls.__dict__.get("__slots__", ()))
+
+    def __init__(self, *args, **kwargs):
+        campos = self.campos()
+        if len(args) > len(campos):
+            raise TypeError(f"{type(self).__name__} recebe no máximo {len(campos)} argumentos.")
+        valores = dict(zip(campos, args))
+        for nome, valor in kwargs.items():
+            if nome not in campos or nome in valores:
+                raise TypeError(f"Campo inválido ou repetido para {type(self).__name__}: {nome!r}.")
+            valores[nome] = valor
+        for nome in campos:
+            setattr(self, nome, valores.get(nome))
+
+    @classmethod
+    def campos(cls):
+        """Nomes dos campos, na ordem de declaração (incluindo os das classes base)."""
+        return cls._campos
+
+    @classmethod
+    def de_dict(cls, dicionario, **extras):
+        """Constrói o resultado a partir de um dicionário com (pelo menos) os seus campos."""
+        valores = {nome: dicionario[nome] for nome in cls.campos() if nome in dicionario}
+        valores.update(extras)
+        return cls(**valores)
+
+    def como_dict(self):
+        """Campos do resultado (menos os auxiliares) em tipos simples, com a chave "tipo"."""
+        dicionario = {"tipo": self.tipo}
+        for nome in self.campos():
+            if nome not in self.auxiliares:
+                dicionario[nome] = _simples(getattr(self, nome))
+        return dicionario
+
+    def para_json(self, **opcoes):
+        """`como_dict` em JSON (NaN e infinito saem como NaN/Infinity, como em json.dumps)."""
+        return json.dumps(self.como_dict(), ensure_ascii=False, **opcoes)
+
+    def texto(self):
+        """Texto exibido pelas interfaces (montado apenas quando pedido)."""
+        from stats_core.formatacao import formatar
+        return formatar(self)
+
+    def __repr__(self):
+        partes = []
+        for nome in self.campos():
+            valor = getattr(self, nome)
+            partes.append(f"{nome}=<array {valor.shape}>" if isinstance(valor, np.ndarray) else f"{nome}={valor!r}")
+        return f"{type(self).__name__}({', '.join(partes)})"
+
+
+class ResultadoDescritivo(Resultado):
+    """
+    Estatísticas descritivas de um conjunto de dados (variância e desvio
+    populacionais). `intervalos` é o resultado de bootstrap_descritivo, ou None
+    se o bootstrap não foi pedido (`bootstrap` False) ou não foi possível.
+    """
+
+    __slots__ = ("n", "media", "mediana", "modas", "frequencia_moda", "minimo", "maximo", "amplitude",
+                 "variancia", "desvio_padrao", "bootstrap", "intervalos")
+    tipo = "descritiva"
+
+
+class ResultadoDescritivoArquivo(Resultado):
+    """Estatísticas descritivas de um arquivo lido em blocos (mediana, percentis e moda aproximados)."""
+
+    __slots__ = ("n", "media", "mediana", "p90", "p99", "erro_rank", "modas", "frequencia_moda", "erro_moda",
+                 "minimo", "maximo", "amplitude", "variancia", "desvio_padrao")
+    tipo = "descritiva_arquivo"
+
+
+class ResultadoRegressao(Resultado):
+    """
+    Regressão linear simples. `x` e `y` são os vetores de entrada (sem cópia),
+    usados apenas para o gráfico.
+    """
+
+    __slots__ = ("n", "inclinacao", "intercepto", "r", "r2", "p_valor", "erro_padrao", "erro_padrao_intercepto",
+                 "x", "y")
+    tipo = "regressao"
+    auxiliares = ("x", "y")
+
+    def reta(self):
+        """Extremos da reta ajustada no intervalo de x: (xs, ys), dois pontos cada."""
+        if self.x is None or len(self.x) == 0:
+            return np.empty(0), np.empty(0)
+        xs = np.array([np.min(self.x), np.max(self.x)], dtype=np.float64)
+        return xs, self.intercepto + self.inclinacao * xs
+
+
+class ResultadoRegressaoMultipla(Resultado):
+    """Regressão linear múltipla; `coeficientes`, `erros_padrao`, `t` e `p_valores` seguem `nomes`."""
+
+    __slots__ = ("n", "nomes", "nome_y", "coeficientes", "intercepto", "erros_padrao", "erro_padrao_intercepto",
+                 "t", "p_valores", "r2", "r2_ajustado", "f", "p_valor_f", "gl_residuos")
+    tipo = "regressao_multipla"
+
+
+class ResultadoBayes(Resultado):
+    """P(A|B) com P(B) obtido pela Lei da Probabilidade Total."""
+
+    __slots__ = ("pa", "pb_dado_a", "pb_dado_nao_a", "p_nao_a", "pb", "pa_dado_b")
+    tipo = "bayes"
+
+
+class ResultadoBayesDireto(Resultado):
+    """P(A|B) com P(B) informado diretamente."""
+
+    __slots__ = ("pa", "pb_dado_a", "pb", "pa_dado_b")
+    tipo = "bayes_pb"
+
+
+class ResultadoBinomial(Resultado):
+    """P(X = k) para X ~ Binomial(n, p)."""
+
+    __slots__ = ("n", "p", "k", "probabilidade")
+    tipo = "binomial"
+
+
+class ResultadoPoisson(Resultado):
+    """P(X = k) para X ~ Poisson(lam)."""
+
+    __slots__ = ("lam", "k", "probabilidade")
+    tipo = "poisson"
+
+
+class ResultadoAnova(Resultado):
+    """
+    Tabela da ANOVA de um fator (chaves de AcumuladorAnova.resultado).
+    `origem` é "" (grupos digitados), "resumos" ou "arquivo".
+    """
+
+    __slots__ = ("grupos", "n", "f", "p_valor", "gl_entre", "gl_dentro", "sq_entre", "sq_dentro", "qm_entre",
+                 "qm_dentro", "rotulos", "n_grupos", "medias", "desvios", "origem")
+    tipo = "anova"
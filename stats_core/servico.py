@@ -0,0 +1,285 @@
+"""
+Serviço HTTP/JSON local com as análises da calculadora.
+
+Permite que outras ferramentas usem as análises sem abrir uma interface. O
+servidor usa asyncio e só a biblioteca padrão. Cada requisição é executada
+como um trabalho de stats_core.lote e a resposta é o mesmo registro JSON
+escrito pelo lote:
+
+    POST /analisar/anova          {"entradas": {"groups_str": "1,2,3; 4,5,6"}, "texto": false}
+    POST /analisar                {"analise": "distribuicao_poisson", "entradas": [3, 2]}
+    GET  /analises                análises disponíveis e seus parâmetros
+    GET  /saude                   estado do servidor (trabalhos em andamento, atendidos, rejeitados)
+
+As análises leves (Bayes, binomial e Poisson: poucas operações com números
+isolados) são respondidas no próprio laço de eventos, desde que as entradas
+sejam pequenas; uma Poisson cujo λ exige montar uma tabela grande vai para o
+pool, como as demais análises, para não bloquear as outras conexões. O número de trabalhos
+aceitos no pool é limitado (`FILA_POR_PROCESSO` por processo): com o pool
+cheio, a resposta é 503 com "Retry-After", em vez de enfileirar sem limite.
+
+Valores não finitos (NaN, ±infinito) são enviados como null, já que o JSON
+não os representa.
+
+Respostas: 200 (análise concluída), 400 (entrada inválida, com a mensagem em
+"erro"), 404, 405, 411, 413, 500 (erro inesperado, detalhado no log do
+servidor) e 503 (servidor ocupado).
+
+Uso: python -m stats_core.servico [--host 127.0.0.1] [--porta 8765] [-p 4] [--fila 4]
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from http import HTTPStatus
+
+from stats_core.lote import ANALISES, executar_trabalho, parametros_da_analise
+from stats_core.parallel import numero_de_processos
+from stats_core.poisson import cache_poisson, largura_tabela
+from stats_core.precarga import precarregar
+from stats_core.resultados import json_finito
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8765
+
+# Análises com custo desprezível: rodar no laço de eventos sai mais barato que
+# enviar o trabalho a outro processo
+ANALISES_LEVES = frozenset({"teorema_bayes", "teorema_bayes_pb", "distribuicao_binomial", "distribuicao_poisson"})
+# Entradas de uma análise leve maiores que isso (em caracteres) vão para o pool
+TAMANHO_MAXIMO_LEVE = 64
+# Maior tabela de Poisson (valores de k) montada no laço: alguns milissegundos
+LARGURA_POISSON_LEVE = 4096
+
+# Trabalhos aceitos no pool por processo (em execução + aguardando)
+FILA_POR_PROCESSO = 4
+
+MAX_CABECALHO = 64 * 1024
+MAX_CORPO = 16 * 1024 * 1024
+# Conexões keep-alive sem requisição por mais que isso são fechadas
+TEMPO_OCIOSO = 30.0
+
+
+def _leve(trabalho):
+    # Se o trabalho custa tão pouco que pode rodar no próprio laço de eventos
+    nome = trabalho.get("analise")
+    if nome not in ANALISES_LEVES:
+        return False
+    entradas = trabalho.get("entradas", {})
+    if isinstance(entradas, dict):
+        # Pelo nome ou pela posição, como em executar_trabalho
+        entradas = [entradas.get(p) for p in parametros_da_analise(nome)] + list(entradas.values())
+    elif not isinstance(entradas, list):
+        return True  # entrada inválida: erro imediato
+    if any(len(str(valor)) > TAMANHO_MAXIMO_LEVE for valor in entradas):
+        return False
+    if nome != "distribuicao_poisson":
+        return True
+    try:
+        lam = float(entradas[0])
+    except (TypeError, ValueError, IndexError):
+        return True
+    if not (lam > 0 and math.isfinite(lam)):
+        return True
+    # Acima da largura máxima não há tabela: os valores são calculados diretamente
+    largura = largura_tabela(lam)
+    return largura <= LARGURA_POISSON_LEVE or largura > cache_poisson.largura_maxima
+
+
+class ErroHTTP(Exception):
+    """Erro que vira uma resposta HTTP com {"erro": mensagem}."""
+
+    def __init__(self, status, mensagem, cabecalhos=None):
+        super().__init__(mensagem)
+        self.status = status
+        self.cabecalhos = cabecalhos or {}
+
+
+class Servico:
+    """
+    Estado do servidor: o pool de processos e os contadores de trabalhos.
+    `tratar_conexao` é o callback de asyncio.start_server.
+    """
+
+    def __init__(self, processos=None, fila_por_processo=FILA_POR_PROCESSO):
+        from concurrent.futures import ProcessPoolExecutor
+        self.processos = numero_de_processos(processos)
+        self.limite = max(1, fila_por_processo * self.processos)
+        # Mesmo com um processo o trabalho vai para um pool (e não para o
+        # ExecutorLocal de stats_core.parallel), para não bloquear o laço
+        self.executor = ProcessPoolExecutor(max_workers=self.processos, initializer=precarregar)
+        self.em_andamento = 0
+        self.atendidos = 0
+        self.rejeitados = 0
+        self.inicio = time.monotonic()
+
+    def fechar(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def saude(self):
+        return {
+            "ok": True,
+            "processos": self.processos,
+            "em_andamento": self.em_andamento,
+            "limite": self.limite,
+            "atendidos": self.atendidos,
+            "rejeitados": self.rejeitados,
+            "segundos_no_ar": time.monotonic() - self.inicio,
+        }
+
+    async def analisar(self, trabalho, texto):
+        """Registro de executar_trabalho para `trabalho`, no laço ou no pool."""
+        if _leve(trabalho) or trabalho.get("analise") not in ANALISES:
+            return executar_trabalho(trabalho, texto)
+        if self.em_andamento >= self.limite:
+            self.rejeitados += 1
+            raise ErroHTTP(HTTPStatus.SERVICE_UNAVAILABLE,
+                           f"Servidor ocupado ({self.em_andamento} trabalhos em andamento). Tente novamente.",
+                           {"Retry-After": "1"})
+        self.em_andamento += 1
+        try:
+            laco = asyncio.get_running_loop()
+            return await laco.run_in_executor(self.executor, executar_trabalho, trabalho, texto)
+        finally:
+            self.em_andamento -= 1
+
+    async def responder(self, metodo, caminho, corpo):
+        """(status, objeto JSON) da requisição."""
+        caminho = caminho.split("?", 1)[0].rstrip("/") or "/"
+        if caminho == "/saude":
+            self._exigir_metodo(metodo, "GET")
+            return HTTPStatus.OK, self.saude()
+        if caminho == "/analises":
+            self._exigir_metodo(metodo, "GET")
+            return HTTPStatus.OK, {nome: parametros_da_analise(nome) for nome in ANALISES}
+        if caminho != "/analisar" and not caminho.startswith("/analisar/"):
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, f"Caminho desconhecido: {caminho}")
+        self._exigir_metodo(metodo, "POST")
+
+        try:
+            pedido = json.loads(corpo or b"{}")
+        except ValueError as e:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"Corpo JSON inválido: {e}") from None
+        if not isinstance(pedido, dict):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "O corpo deve ser um objeto JSON.")
+        analise = caminho[len("/analisar/"):] if caminho != "/analisar" else pedido.get("analise")
+        trabalho = {"indice": 0, "id": pedido.get("id"), "analise": analise, "entradas": pedido.get("entradas", {})}
+        registro = await self.analisar(trabalho, bool(pedido.get("texto")))
+        self.atendidos += 1
+        if registro["ok"]:
+            return HTTPStatus.OK, registro
+        rastro = registro["erro"].pop("traceback", None)
+        if rastro is None:
+            return HTTPStatus.BAD_REQUEST, registro
+        print(f"Erro inesperado em {analise}:\n{rastro}", file=sys.stderr)
+        return HTTPStatus.INTERNAL_SERVER_ERROR, registro
+
+    @staticmethod
+    def _exigir_metodo(metodo, esperado):
+        if metodo != esperado:
+            raise ErroHTTP(HTTPStatus.METHOD_NOT_ALLOWED, f"Use {esperado}.", {"Allow": esperado})
+
+    async def tratar_conexao(self, leitor, escritor):
+        try:
+            while True:
+                try:
+                    bruto = await asyncio.wait_for(leitor.readuntil(b"\r\n\r\n"), TEMPO_OCIOSO)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                        ConnectionError):
+                    break
+                manter = await self._tratar_requisicao(bruto, leitor, escritor)
+                await escritor.drain()
+                if not manter:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def _tratar_requisicao(self, bruto, leitor, escritor):
+        # Devolve se a conexão deve continuar aberta (keep-alive)
+        try:
+            linha, *linhas_cabecalho = bruto.decode("latin-1").split("\r\n")
+            metodo, caminho, versao = linha.split(" ")
+            cabecalhos = {}
+            for linha_cabecalho in filter(None, linhas_cabecalho):
+                nome, _, valor = linha_cabecalho.partition(":")
+                cabecalhos[nome.strip().lower()] = valor.strip()
+        except ValueError:
+            _escrever_resposta(escritor, HTTPStatus.BAD_REQUEST, {"erro": "Requisição HTTP inválida."}, False)
+            return False
+        conexao = cabecalhos.get("connection", "").lower()
+        manter = conexao == "keep-alive" if versao == "HTTP/1.0" else conexao != "close"
+
+        try:
+            if "transfer-encoding" in cabecalhos:
+                manter = False
+                raise ErroHTTP(HTTPStatus.LENGTH_REQUIRED, "Envie o corpo com Content-Length.")
+            try:
+                tamanho = int(cabecalhos.get("content-length", 0))
+            except ValueError:
+                manter = False
+                raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Content-Length inválido.") from None
+            if tamanho > MAX_CORPO:
+                manter = False
+                raise ErroHTTP(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Corpo maior que {MAX_CORPO} bytes.")
+            corpo = await leitor.readexactly(tamanho) if tamanho else b""
+            status, objeto = await self.responder(metodo, caminho, corpo)
+            cabecalhos_resposta = {}
+        except ErroHTTP as e:
+            status, objeto, cabecalhos_resposta = e.status, {"erro": str(e)}, e.cabecalhos
+        except Exception as e:
+            # Por exemplo, BrokenProcessPool: a conexão continua, o erro vai para o log
+            print(f"Erro inesperado: {e!r}", file=sys.stderr)
+            status, objeto, cabecalhos_resposta = HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": f"Ocorreu um erro: {e}"}, {}
+        _escrever_resposta(escritor, status, objeto, manter, cabecalhos_resposta)
+        return manter
+
+
+def _escrever_resposta(escritor, status, objeto, manter, cabecalhos=None):
+    corpo = json.dumps(json_finito(objeto), ensure_ascii=False, allow_nan=False).encode("utf-8")
+    linhas = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        "Content-Type: application/json; charset=utf-8",
+        f"Content-Length: {len(corpo)}",
+        f"Connection: {'keep-alive' if manter else 'close'}",
+    ]
+    linhas += [f"{nome}: {valor}" for nome, valor in (cabecalhos or {}).items()]
+    escritor.write(("\r\n".join(linhas) + "\r\n\r\n").encode("latin-1") + corpo)
+
+
+async def servir(host=HOST_PADRAO, porta=PORTA_PADRAO, processos=None, fila_por_processo=FILA_POR_PROCESSO):
+    """Inicia o serviço e atende até ser cancelado (Ctrl+C)."""
+    # SciPy é importado aqui em segundo plano para a primeira análise leve não
+    # bloquear o laço esperando por ele (no pool, o inicializador faz o mesmo)
+    precarregar()
+    servico = Servico(processos, fila_por_processo)
+    servidor = await asyncio.start_server(servico.tratar_conexao, host, porta, limit=MAX_CABECALHO)
+    host_real, porta_real = servidor.sockets[0].getsockname()[:2]
+    print(f"Servindo em http://{host_real}:{porta_real} com {servico.processos} processo(s)", flush=True)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servico.fechar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m stats_core.servico",
+                                     description="Serviço HTTP/JSON local com as análises da calculadora.")
+    parser.add_argument("--host", default=HOST_PADRAO, help=f"endereço (padrão: {HOST_PADRAO})")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO, help=f"porta (padrão: {PORTA_PADRAO}; 0 = livre)")
+    parser.add_argument("-p", "--processos", type=int, help="processos do pool (padrão: todos os núcleos)")
+    parser.add_argument("--fila", type=int, default=FILA_POR_PROCESSO,
+                        help="trabalhos aceitos por processo antes de responder 503")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.host, args.porta, args.processos, args.fila))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Leitura de arquivos de texto/CSV em blocos, com memória limitada pelo tamanho
+do bloco e não pelo tamanho do arquivo.
+
+Arquivos grandes podem ainda ser divididos em intervalos de bytes processados
+em paralelo; os acumuladores parciais são combinados pela fórmula de Chan et al.
+"""
+import os
+
+import numpy as np
+
+from stats_core.descriptive import Momentos
+from stats_core.mode import MisraGries
+from stats_core.quantiles import K_PADRAO, KLL
+from stats_core.parallel import dividir_arquivo, mapear, numero_de_processos, verificar_cancelamento
+from stats_core.parsing import ParseError, SEPARADORES, parse_numeros, valores_por_linha
+
+# 8 MiB de texto por bloco
+TAMANHO_BLOCO_BYTES = 8 << 20
+
+# Abaixo deste tamanho o custo de criar processos supera o ganho
+LIMIAR_PARALELO_BYTES = 64 << 20
+
+# Contadores mantidos pelo sketch de moda aproximada
+CAPACIDADE_MODA = 1000
+
+_SEPARADORES_BYTES = SEPARADORES.encode("ascii")
+
+
+class ResumoFluxo:
+    """
+    Acumuladores combináveis de um fluxo de dados: Momentos e, opcionalmente,
+    o sketch de Misra–Gries (moda aproximada) e o sketch KLL (quantis).
+    """
+
+    __slots__ = ("momentos", "moda", "quantis")
+
+    def __init__(self, capacidade_moda=CAPACIDADE_MODA, k_quantis=K_PADRAO, semente=None):
+        self.momentos = Momentos()
+        self.moda = MisraGries(capacidade_moda) if capacidade_moda else None
+        self.quantis = KLL(k_quantis, semente) if k_quantis else None
+
+    def atualizar(self, bloco):
+        self.momentos.atualizar(bloco)
+        if self.moda is not None:
+            self.moda.atualizar(bloco)
+        if self.quantis is not None:
+            self.quantis.atualizar(bloco)
+        return self
+
+    def combinar(self, outro):
+        self.momentos.combinar(outro.momentos)
+        if self.moda is not None and outro.moda is not None:
+            self.moda.combinar(outro.moda)
+        if self.quantis is not None and outro.quantis is not None:
+            self.quantis.combinar(outro.quantis)
+        return self
+
+
+def _ultimo_separador(dados):
+    return max(dados.rfind(bytes((c,))) for c in _SEPARADORES_BYTES)
+
+
+def detectar_cabecalho(caminho):
+    """Retorna 1 se o primeiro token do arquivo não é um número (cabeçalho CSV), senão 0."""
+    with open(caminho, "rb") as arquivo:
+        inicio = arquivo.read(4096).decode("utf-8", errors="replace")
+    tokens = inicio.split("\n", 1)[0].replace(",", " ").replace(";", " ").split()
+    if not tokens:
+        return 0
+    try:
+        float(tokens[0])
+        return 0
+    except ValueError:
+        return 1
+
+
+def _fim_do_cabecalho(caminho, pular_linhas):
+    with open(caminho, "rb") as arquivo:
+        for _ in range(pular_linhas):
+            arquivo.readline()
+        return arquivo.tell()
+
+
+def ler_trechos(caminho, tamanho_bloco=TAMANHO_BLOCO_BYTES, pular_linhas=0, inicio=0, fim=None,
+                ultimo_corte=_ultimo_separador):
+    """
+    Gera pares (texto, deslocamento) com trechos do arquivo, sem convertê-los.
+
+    Cada trecho termina logo depois da posição devolvida por
+    `ultimo_corte(dados)` (por padrão o último separador; com
+    `lambda dados: dados.rfind(b"\n")`, o último fim de linha), e o que vem
+    depois passa para o trecho seguinte. `deslocamento` é a posição do trecho
+    no arquivo, para localizar erros. `pular_linhas`, `inicio` e `fim` seguem
+    `ler_blocos`.
+    """
+    with open(caminho, "rb") as arquivo:
+        arquivo.seek(inicio)
+        deslocamento = inicio
+        for _ in range(pular_linhas):
+            deslocamento += len(arquivo.readline().decode("utf-8"))
+        restante = None if fim is None else fim - arquivo.tell()
+        resto = b""
+        while True:
+            tamanho = tamanho_bloco if restante is None else min(tamanho_bloco, restante)
+            lido = arquivo.read(tamanho) if tamanho > 0 else b""
+            if not lido:
+                break
+            if restante is not None:
+                restante -= len(lido)
+            dados = resto + lido
+            corte = ultimo_corte(dados)
+            if corte < 0:
+                resto = dados
+                continue
+            texto, resto = dados[:corte + 1].decode("utf-8"), dados[corte + 1:]
+            yield texto, deslocamento
+            deslocamento += len(texto)
+        if resto:
+            yield resto.decode("utf-8"), deslocamento
+
+
+def ler_blocos(caminho, tamanho_bloco=TAMANHO_BLOCO_BYTES, pular_linhas=0, inicio=0, fim=None):
+    """
+    Gera vetores float64 com os números de um arquivo, um bloco por vez.
+
+    Cada bloco termina em um separador, de modo que nenhum número é cortado
+    ao meio. `pular_linhas` descarta linhas de cabeçalho e `inicio`/`fim`
+    restringem a leitura a um intervalo de bytes. A posição informada em
+    ParseError é relativa ao arquivo inteiro (em bytes quando `inicio` > 0).
+    """
+    n_valores = 0
+    for texto, deslocamento in ler_trechos(caminho, tamanho_bloco, pular_linhas, inicio, fim,
+                                           _ultimo_separador):
+        bloco = _parse_bloco(texto, n_valores, deslocamento)
+        n_valores += bloco.size
+        yield bloco
+
+
+def contar_colunas(caminho, pular_linhas=0):
+    """Número de valores na primeira linha de dados (não vazia) do arquivo."""
+    with open(caminho, "rb") as arquivo:
+        for _ in range(pular_linhas):
+            arquivo.readline()
+        for linha in arquivo:
+            valores = parse_numeros(linha.decode("utf-8"))
+            if valores.size:
+                return valores.size
+    return 0
+
+
+def ler_linhas(caminho, colunas, tamanho_bloco=TAMANHO_BLOCO_BYTES, pular_linhas=0, inicio=0, fim=None):
+    """
+    Como `ler_blocos`, mas para arquivos com uma observação por linha: gera
+    matrizes float64 de shape (linhas, colunas), com blocos cortados em fins
+    de linha. Linhas vazias são ignoradas; uma linha com outro número de
+    valores gera ValueError.
+    """
+    n_valores = 0
+    for texto, deslocamento in ler_trechos(caminho, tamanho_bloco, pular_linhas, inicio, fim,
+                                           lambda dados: dados.rfind(b"\n")):
+        bloco = _parse_bloco(texto, n_valores, deslocamento)
+        n_valores += bloco.size
+        # Conferido linha a linha: só o total poderia fechar com linhas irregulares ("1 2 3 4" e "5 6")
+        por_linha = valores_por_linha(texto)
+        irregulares = np.flatnonzero((por_linha != 0) & (por_linha != colunas))
+        if irregulares.size:
+            linha = texto.split("\n")[irregulares[0]]
+            raise ValueError(f"A linha '{linha.strip()[:60]}' tem {por_linha[irregulares[0]]} valores; "
+                             f"esperados {colunas}.")
+        yield bloco.reshape(-1, colunas)
+
+
+def _parse_bloco(texto, n_valores, deslocamento):
+    try:
+        return parse_numeros(texto)
+    except ParseError as e:
+        raise ParseError(e.token, e.indice + n_valores, e.posicao + deslocamento) from None
+
+
+def _resumir_intervalo(caminho, inicio, fim, tamanho_bloco, capacidade_moda, k_quantis, cancelar=None):
+    # A semente derivada do início do intervalo torna o resultado reprodutível
+    resumo = ResumoFluxo(capacidade_moda, k_quantis, semente=inicio)
+    for bloco in ler_blocos(caminho, tamanho_bloco, inicio=inicio, fim=fim):
+        verificar_cancelamento(cancelar)
+        resumo.atualizar(bloco)
+    return resumo
+
+
+def _resumir_intervalo_ou_erro(*args):
+    # O erro é devolvido (e não lançado) para que o processo principal possa
+    # corrigir o índice do item com a contagem dos intervalos anteriores.
+    try:
+        return _resumir_intervalo(*args)
+    except ParseError as e:
+        return e
+
+
+def resumir_arquivo(caminho, tamanho_bloco=TAMANHO_BLOCO_BYTES, pular_linhas=0, processos=1,
+                    capacidade_moda=CAPACIDADE_MODA, k_quantis=K_PADRAO, cancelar=None):
+    """
+    Acumula um ResumoFluxo de um arquivo. Com `processos` > 1 o arquivo é
+    dividido em intervalos de bytes lidos em processos separados;
+    `processos=None` usa todos os núcleos apenas para arquivos grandes.
+    `capacidade_moda=None` e `k_quantis=None` desligam os sketches. Com
+    `cancelar` (threading.Event) sinalizado, a leitura para com
+    CalculoCancelado.
+    """
+    if processos is None:
+        processos = 1 if os.path.getsize(caminho) < LIMIAR_PARALELO_BYTES else numero_de_processos()
+    inicio = _fim_do_cabecalho(caminho, pular_linhas)
+    if processos == 1:
+        return _resumir_intervalo(caminho, inicio, None, tamanho_bloco, capacidade_moda, k_quantis, cancelar)
+    # Mais intervalos que processos equilibra a carga entre os núcleos
+    intervalos = dividir_arquivo(caminho, 4 * processos, inicio)
+    parciais = mapear(_resumir_intervalo_ou_erro,
+                      [(caminho, a, b, tamanho_bloco, capacidade_moda, k_quantis) for a, b in intervalos],
+                      processos, cancelar)
+    resumo = ResumoFluxo(capacidade_moda, k_quantis, semente=0)
+    for parcial in parciais:
+        if isinstance(parcial, ParseError):
+            raise ParseError(parcial.token, parcial.indice + resumo.momentos.n, parcial.posicao)
+        resumo.combinar(parcial)
+    return resumo
+
+
+def descrever_arquivo(caminho, tamanho_bloco=TAMANHO_BLOCO_BYTES, pular_linhas=None, processos=1,
+                      capacidade_moda=CAPACIDADE_MODA, k_quantis=K_PADRAO, cancelar=None):
+    """
+    Estatísticas descritivas de um arquivo lido em blocos.
+
+    Retorna as mesmas chaves de `descrever`, mais "p90", "p99", "erro_rank" e
+    "erro_moda". Mediana e percentis vêm do sketch KLL, com erro de rank
+    normalizado de até "erro_rank" (None com `k_quantis=None`); a moda é a do
+    sketch de Misra–Gries, cuja frequência pode estar subestimada em até
+    "erro_moda" ocorrências. Com `pular_linhas=None` uma linha de cabeçalho é
+    detectada automaticamente; `processos` e `cancelar` seguem `resumir_arquivo`.
+    """
+    if pular_linhas is None:
+        pular_linhas = detectar_cabecalho(caminho)
+    resumo = resumir_arquivo(caminho, tamanho_bloco, pular_linhas, processos, capacidade_moda, k_quantis,
+                             cancelar)
+    momentos = resumo.momentos
+    lista_modas, frequencia = resumo.moda.modas() if resumo.moda is not None else (None, None)
+    if resumo.quantis is not None:
+        mediana, p90, p99 = resumo.quantis.quantis([0.5, 0.9, 0.99]).tolist()
+        erro_rank = resumo.quantis.erro_rank
+    else:
+        mediana = p90 = p99 = erro_rank = None
+    return {
+        "n": momentos.n,
+        "media": momentos.media,
+        "mediana": mediana,
+        "p90": p90,
+        "p99": p99,
+        "erro_rank": erro_rank,
+        "modas": lista_modas,
+        "frequencia_moda": frequencia,
+        "erro_moda": resumo.moda.erro_maximo if resumo.moda is not None else None,
+        "minimo": momentos.minimo,
+        "maximo": momentos.maximo,
+        "amplitude": momentos.amplitude,
+        "variancia": momentos.variancia,
+        "desvio_padrao": momentos.desvio_padrao,
+    }
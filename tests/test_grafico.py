@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import pytest
+
+from stats_core.grafico import GraficoRegressao, amostrar_pontos, densidade_2d, pontos_finitos
+
+
+def test_pontos_finitos_remove_nan_e_infinito():
+    x = np.array([1.0, np.nan, 3.0, 4.0, np.inf])
+    y = np.array([1.0, 2.0, -np.inf, 4.0, 5.0])
+    xf, yf = pontos_finitos(x, y)
+    assert xf.tolist() == [1.0, 4.0] and yf.tolist() == [1.0, 4.0]
+    # Sem pontos não finitos, os próprios vetores (sem cópia)
+    assert pontos_finitos(xf, yf)[0] is xf
+
+
+def test_densidade_2d_ignora_pontos_nao_finitos():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(size=1_000), rng.uniform(size=1_000)
+    x[:10], y[10:20] = np.nan, np.inf
+    contagens, extensao = densidade_2d(x, y, bins=20)
+    assert contagens.sum() == 980
+    assert all(math.isfinite(v) for v in extensao)
+    esperado, _, _ = np.histogram2d(y[20:], x[20:], bins=20, range=[extensao[2:], extensao[:2]])
+    assert np.array_equal(contagens, esperado)
+    with pytest.raises(ValueError):
+        densidade_2d(np.array([np.nan]), np.array([1.0]))
+
+
+def test_amostrar_pontos_limita_quantidade():
+    x = np.arange(100.0)
+    xs, ys = amostrar_pontos(x, x, 30)
+    assert xs.size <= 30 and xs[0] == 0
+
+
+class _Artista:
+    def __init__(self, *args, **kwargs):
+        self.chamadas = []
+
+    def __getattr__(self, nome):
+        return lambda *args, **kwargs: self.chamadas.append((nome, args))
+
+    def __iter__(self):
+        return iter([self])
+
+
+class _Eixos(_Artista):
+    # Imita o Axes do matplotlib: set_xlim/set_ylim recusam limites não finitos
+    def scatter(self, *args, **kwargs):
+        return _Artista()
+
+    plot = imshow = set_title = scatter
+
+    def set_xlim(self, inicio, fim):
+        if not (math.isfinite(inicio) and math.isfinite(fim)):
+            raise ValueError("Axis limits cannot be NaN or Inf")
+        self.chamadas.append(("set_xlim", (inicio, fim)))
+
+    set_ylim = set_xlim
+
+
+@pytest.mark.parametrize("modo", ["densidade", "amostra"])
+def test_grafico_regressao_com_nan_e_inf(modo):
+    eixos = _Eixos()
+    grafico = GraficoRegressao(eixos, max_pontos=10, modo=modo, bins=5)
+    x = np.concatenate((np.arange(50.0), [np.nan, np.inf]))
+    y = np.concatenate((np.arange(50.0), [1.0, 2.0]))
+    grafico.atualizar(x, y)
+    limites = [args for nome, args in eixos.chamadas if nome == "set_xlim"]
+    assert limites and limites[-1][0] < 0 < 49 < limites[-1][1]
+
+    # Sem nenhum ponto finito os limites ficam como estavam
+    eixos.chamadas.clear()
+    grafico.atualizar(np.array([np.nan]), np.array([np.inf]))
+    assert not [nome for nome, _ in eixos.chamadas if nome in ("set_xlim", "set_ylim")]
@@ -0,0 +1,22 @@
+import io
+import json
+
+from stats_core.lote import executar_lote, ler_jsonl
+
+
+def _rejeitar(constante):
+    raise ValueError(f"Valor fora do JSON: {constante}")
+
+
+def test_lote_escreve_nao_finitos_como_null():
+    # Y constante dá r = NaN; grupos constantes dão F = NaN
+    entrada = io.StringIO(
+        '{"id": "reg", "analise": "regressao_linear", "entradas": {"x_str": "1,2,3,4", "y_str": "5,5,5,5"}}\n'
+        '{"id": "anova", "analise": "anova", "entradas": {"groups_str": "1,1,1; 1,1,1"}}\n')
+    saida = io.StringIO()
+    executar_lote(ler_jsonl(entrada), saida, processos=1)
+
+    registros = [json.loads(linha, parse_constant=_rejeitar) for linha in saida.getvalue().splitlines()]
+    assert [r["ok"] for r in registros] == [True, True]
+    assert registros[0]["resultado"]["r"] is None
+    assert registros[1]["resultado"]["f"] is None
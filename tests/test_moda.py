@@ -0,0 +1,31 @@
+import numpy as np
+
+from stats_core import MisraGries, descrever_arquivo
+from stats_core.formatacao import texto_descritivo_arquivo
+from stats_core.resultados import ResultadoDescritivoArquivo
+
+
+def test_misra_gries_nao_informa_resto_como_moda(tmp_path):
+    # Valores todos distintos: os contadores que sobram são resto, não moda
+    dados = np.arange(10_000, dtype=np.float64)
+    sketch = MisraGries(capacidade=10)
+    for bloco in np.array_split(dados, 10):
+        sketch.atualizar(bloco)
+    assert sketch.erro_maximo > 0
+    assert sketch.modas()[0] == []
+
+    caminho = tmp_path / "distintos.txt"
+    caminho.write_text("\n".join(map(str, dados.tolist())))
+    resultado = ResultadoDescritivoArquivo.de_dict(descrever_arquivo(caminho, capacidade_moda=10))
+    assert "moda não determinada" in texto_descritivo_arquivo(resultado)
+
+
+def test_misra_gries_encontra_moda_frequente():
+    dados = np.concatenate((np.arange(5_000, dtype=np.float64), np.full(5_000, 7.5)))
+    np.random.default_rng(0).shuffle(dados)
+    sketch = MisraGries(capacidade=10)
+    for bloco in np.array_split(dados, 10):
+        sketch.atualizar(bloco)
+    modas, frequencia = sketch.modas()
+    assert modas == [7.5]
+    assert frequencia > sketch.erro_maximo